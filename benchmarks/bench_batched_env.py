@@ -0,0 +1,66 @@
+"""Benchmarks environment steps per second: DummyVecEnv against BatchedFullQuestEnv.
+
+Both step N password FullQuest games with random actions; the reference wraps
+N single-game FullQuestEnvs in SB3's DummyVecEnv. Episodes are cut after
+--max-steps steps in both, so resets are part of the measurement.
+
+Usage:
+    python benchmarks/bench_batched_env.py [--envs 1 8 64 256] [--steps 200] [--shaping]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+from gymnasium.wrappers import TimeLimit
+from stable_baselines3.common.vec_env import DummyVecEnv, VecEnv
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from rl.environments.batched_full_quest_env import BatchedFullQuestEnv
+from rl.environments.full_quest_env_pass import FullQuestEnv
+
+
+def _steps_per_second(env: VecEnv, steps: int, seed: int) -> float:
+    rng = np.random.default_rng(seed)
+    actions = rng.integers(0, env.action_space.n, (steps, env.num_envs))
+    env.seed(seed)
+    env.reset()
+    start = time.perf_counter()
+    for step_actions in actions:
+        env.step(step_actions)
+    return steps * env.num_envs / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--envs", type=int, nargs="+", default=[1, 8, 64, 256])
+    parser.add_argument("--steps", type=int, default=200, help="Steps per env.")
+    parser.add_argument("--shaping", action="store_true")
+    parser.add_argument("--max-steps", type=int, default=100, help="Episode step limit.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.getLogger("rl").setLevel(logging.WARNING)
+
+    print(f"{'envs':>6}{'dummy steps/s':>16}{'batched steps/s':>18}{'speed-up':>10}")
+    for count in args.envs:
+        reference = DummyVecEnv(
+            [
+                lambda: TimeLimit(
+                    FullQuestEnv(reward_shaping=args.shaping), args.max_steps
+                )
+            ]
+            * count
+        )
+        dummy = _steps_per_second(reference, args.steps, args.seed)
+        batched_env = BatchedFullQuestEnv(
+            count, reward_shaping=args.shaping, max_episode_steps=args.max_steps
+        )
+        batched = _steps_per_second(batched_env, args.steps, args.seed)
+        print(f"{count:>6}{dummy:>16.0f}{batched:>18.0f}{batched / dummy:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Benchmarks the egocentric observation against the grid one as maps grow.
+
+For each map size the script resets the password FullQuestEnv with the "dict"
+and the "egocentric" encodings, random-walks the player and reports the time
+to build one observation, the observation size in bytes, and the reset time.
+The egocentric observation has the same shape on every map size.
+
+Usage:
+    python benchmarks/bench_egocentric_obs.py [--sizes 7 31 63 127] [--steps 20000]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from rl.environments.full_quest_env_pass import FullQuestEnv
+
+
+def _obs_bytes(observation: dict) -> int:
+    return sum(np.asarray(value).nbytes for value in observation.values())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[7, 31, 63, 127])
+    parser.add_argument("--steps", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.getLogger("rl").setLevel(logging.WARNING)
+
+    print(f"{'size':>6}{'encoding':>12}{'µs/step':>10}{'obs bytes':>11}{'reset ms':>10}")
+    for size in args.sizes:
+        for encoding in ("dict", "egocentric"):
+            env = FullQuestEnv(obs_encoding=encoding, map_size=(size, size))
+            start = time.perf_counter()
+            env.reset(seed=args.seed)
+            reset = time.perf_counter() - start
+
+            rng = np.random.default_rng(args.seed)
+            moves = ((0, -1), (0, 1), (-1, 0), (1, 0))
+            pos, elapsed = env.game.player_pos, 0.0
+            for move in rng.integers(0, 4, args.steps).tolist():
+                x, y = pos[0] + moves[move][0], pos[1] + moves[move][1]
+                if env.game.is_walkable(x, y):
+                    pos = (x, y)
+                env.game.player_pos = pos
+                start = time.perf_counter()
+                observation = env._get_obs()
+                elapsed += time.perf_counter() - start
+            assert env.observation_space.contains(observation)
+            print(
+                f"{size:>6}{encoding:>12}{elapsed / args.steps * 1e6:>10.2f}"
+                f"{_obs_bytes(observation):>11}{reset * 1e3:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
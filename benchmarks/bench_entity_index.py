@@ -0,0 +1,81 @@
+"""Benchmarks NPC adjacency queries: linear scans against the entity index.
+
+Usage:
+    python benchmarks/bench_entity_index.py [--counts 2 100 1000 10000] [--queries 10000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from game.actors.entity_index import EntityIndex
+from game.actors.entity_store import EntityStore
+from game.actors.npc import NPC
+
+
+def _linear_adjacent(npcs: list[NPC], pos: tuple[int, int]) -> list[NPC]:
+    """The scan InteractionHandler used before the index existed."""
+    return [
+        npc
+        for npc in npcs
+        if abs(pos[0] - npc.pos[0]) + abs(pos[1] - npc.pos[1]) <= 1
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--counts", type=int, nargs="+", default=[2, 10, 100, 1000, 5000, 20000]
+    )
+    parser.add_argument("--queries", type=int, default=10000)
+    parser.add_argument("--size", type=int, default=512, help="Map side length.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    queries = [tuple(q) for q in rng.integers(0, args.size, (args.queries, 2)).tolist()]
+
+    print(f"{'npcs':>8}{'scan µs':>12}{'index µs':>12}{'move µs':>12}{'speed-up':>10}")
+    for count in args.counts:
+        cells = rng.integers(0, args.size, (count, 2)).tolist()
+        store = EntityStore()
+        npcs = [store.add(f"npc{i}", tuple(c), (0, 0, 0), "N", "") for i, c in enumerate(cells)]
+        index = EntityIndex()
+        for npc in npcs:
+            index.add(npc, npc.pos)
+
+        # Keep the scan to a bounded number of queries for large counts.
+        scan_queries = queries[: max(100, args.queries * 10 // max(count, 10))]
+        start = time.perf_counter()
+        for pos in scan_queries:
+            _linear_adjacent(npcs, pos)
+        scan = (time.perf_counter() - start) / len(scan_queries)
+
+        start = time.perf_counter()
+        for pos in queries:
+            index.adjacent(pos)
+        lookup = (time.perf_counter() - start) / len(queries)
+
+        for pos in scan_queries:
+            assert set(map(id, index.adjacent(pos))) == set(
+                map(id, _linear_adjacent(npcs, pos))
+            )
+
+        start = time.perf_counter()
+        for npc, pos in zip(npcs * (len(queries) // count + 1), queries):
+            npc.pos = pos
+            index.move(npc, pos)
+        move = (time.perf_counter() - start) / len(queries)
+
+        print(
+            f"{count:>8}{scan * 1e6:>12.2f}{lookup * 1e6:>12.2f}"
+            f"{move * 1e6:>12.2f}{scan / lookup:>9.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
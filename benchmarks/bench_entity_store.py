@@ -0,0 +1,96 @@
+"""Benchmarks bulk NPC passes: per-object loops against the struct-of-arrays store.
+
+Usage:
+    python benchmarks/bench_entity_store.py [--counts 2 100 1000 10000]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from game.actors.entity_store import EntityStore
+
+
+class _PlainNPC:
+    """The previous NPC layout: one object with its own fields and history list."""
+
+    def __init__(self, name, pos, color, label, background):
+        self.name = name
+        self.pos = pos
+        self.color = color
+        self.label = label
+        self.background = background
+        self.chat_history = []
+
+
+def _best(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[2, 100, 1000, 10000])
+    parser.add_argument("--size", type=int, default=256, help="Map side length.")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    view = (100, 100, 115, 111)  # A 15x11 viewport
+    print(
+        f"{'npcs':>7}{'cull loop µs':>14}{'cull soa µs':>13}"
+        f"{'obs loop µs':>13}{'obs soa µs':>12}{'plain KiB':>11}{'store KiB':>11}"
+    )
+    for count in args.counts:
+        cells = [tuple(c) for c in rng.integers(0, args.size, (count, 2)).tolist()]
+        types = rng.integers(0, 2, count).tolist()
+
+        tracemalloc.start()
+        plain = [_PlainNPC(f"npc{i}", c, (0, 0, 0), "N", "") for i, c in enumerate(cells)]
+        plain_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        store = EntityStore()
+        for i, (c, t) in enumerate(zip(cells, types)):
+            store.add(f"npc{i}", c, (0, 0, 0), "N", "", type_id=t)
+        store_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        x0, y0, x1, y1 = view
+        cull_loop = _best(
+            lambda: [n for n in plain if x0 <= n.pos[0] < x1 and y0 <= n.pos[1] < y1],
+            args.repeats,
+        )
+        cull_soa = _best(lambda: store.in_rect(x0, y0, x1, y1), args.repeats)
+
+        obs = np.zeros((args.size, args.size, 2), dtype=np.uint8)
+
+        def obs_loop():
+            for n, t in zip(plain, types):
+                obs[n.pos[1], n.pos[0], t] = 1
+
+        def obs_soa():
+            pos = store.positions
+            obs[pos[:, 1], pos[:, 0], store.type_ids] = 1
+
+        print(
+            f"{count:>7}{cull_loop * 1e6:>14.1f}{cull_soa * 1e6:>13.1f}"
+            f"{_best(obs_loop, args.repeats) * 1e6:>13.1f}"
+            f"{_best(obs_soa, args.repeats) * 1e6:>12.1f}"
+            f"{plain_bytes / 1024:>11.1f}{store_bytes / 1024:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Measures the start-up cost of a headless RL worker: import time and RSS.
+
+Each module is imported in a fresh interpreter, which then builds one env (if
+the module defines FullQuestEnv) and steps it, like a training worker does.
+The script reports the import time, whether pygame was loaded, and the peak
+resident set size of the worker.
+
+Usage:
+    python benchmarks/bench_env_import.py [--modules rl.environments.full_quest_env_pass] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+_WORKER = """
+import json, resource, sys, time
+sys.path.append({root!r})
+start = time.perf_counter()
+module = __import__({module!r}, fromlist=["_"])
+imported = time.perf_counter() - start
+if hasattr(module, "FullQuestEnv"):
+    env = module.FullQuestEnv()
+    env.reset(seed=0)
+    for action in range(100):
+        env.step(action % 5)
+print(json.dumps({{
+    "import_s": imported,
+    "pygame": "pygame" in sys.modules,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}}))
+"""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--modules",
+        nargs="+",
+        default=[
+            "game.games.game",
+            "rl.environments.full_quest_env",
+            "rl.environments.full_quest_env_pass",
+        ],
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'module':<40}{'import ms':>11}{'RSS MB':>9}{'pygame':>8}")
+    for module in args.modules:
+        runs = []
+        for _ in range(args.repeat):
+            output = subprocess.run(
+                [sys.executable, "-c", _WORKER.format(root=ROOT, module=module)],
+                capture_output=True,
+                text=True,
+                check=True,
+                env={**os.environ, "SDL_VIDEODRIVER": "dummy"},
+            ).stdout
+            runs.append(json.loads(output.strip().splitlines()[-1]))
+        import_ms = sorted(run["import_s"] for run in runs)[len(runs) // 2] * 1000
+        rss = sorted(run["rss_mb"] for run in runs)[len(runs) // 2]
+        print(f"{module:<40}{import_ms:>11.1f}{rss:>9.1f}{str(runs[0]['pygame']):>8}")
+
+
+if __name__ == "__main__":
+    main()
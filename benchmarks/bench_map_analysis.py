@@ -0,0 +1,68 @@
+"""Benchmarks batch map analysis: labeling, reachability, corridor stats and routes.
+
+Usage:
+    python benchmarks/bench_map_analysis.py [--sizes 7 32 128] [--maps 4096]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from game.maps.analysis import analyze_maps, difficulty_buckets, label_components_batch
+from game.maps.generators import generate
+from game.maps.layout import OBJECT_COUNT, QUEST_ROUTE, sample_empty_cells
+
+
+def _make_batch(
+    generator: str, size: int, count: int, distinct: int, seed: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Generates `distinct` maps and tiles them up to `count` with new placements."""
+    rng = np.random.default_rng(seed)
+    maps = [generate(generator, size, size, seed=rng) for _ in range(distinct)]
+    tiles = np.stack([maps[i % distinct] for i in range(count)])
+    positions = np.stack([sample_empty_cells(t, OBJECT_COUNT, rng) for t in tiles])
+    return tiles, positions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[7, 15, 32, 64, 128])
+    parser.add_argument("--maps", type=int, default=4096, help="Maps per batch.")
+    parser.add_argument("--generator", default="backtracker")
+    parser.add_argument("--buckets", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(
+        f"{'size':>9}{'maps':>7}{'label maps/s':>14}{'full maps/s':>13}"
+        f"{'dead ends':>11}{'junctions':>11}  buckets"
+    )
+    for size in args.sizes:
+        # Keep the number of cells per batch roughly constant for large maps.
+        count = max(16, min(args.maps, args.maps * 49 // (size * size) * 8))
+        tiles, positions = _make_batch(args.generator, size, count, 64, args.seed)
+
+        start = time.perf_counter()
+        label_components_batch(tiles == 0)
+        labeling = time.perf_counter() - start
+
+        start = time.perf_counter()
+        analysis = analyze_maps(tiles, positions, QUEST_ROUTE)
+        full = time.perf_counter() - start
+
+        buckets = difficulty_buckets(
+            np.where(analysis.objects_reachable, analysis.route_length, -1), args.buckets
+        )
+        print(
+            f"{f'{size}x{size}':>9}{count:>7}{count / labeling:>14.0f}{count / full:>13.0f}"
+            f"{analysis.dead_ends.mean():>11.1f}{analysis.junctions.mean():>11.1f}"
+            f"  {np.bincount(buckets[buckets >= 0], minlength=args.buckets).tolist()}"
+        )
+
+
+if __name__ == "__main__":
+    main()
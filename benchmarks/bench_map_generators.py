@@ -0,0 +1,43 @@
+"""Benchmarks the map generators from 7x7 up to 2048x2048.
+
+Usage:
+    python benchmarks/bench_map_generators.py [--sizes 7 64 512 2048] [--repeats 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from game.maps.analysis import is_connected
+from game.maps.generators import GENERATORS, generate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[7, 32, 128, 512, 1024, 2048]
+    )
+    parser.add_argument("--generators", nargs="+", default=list(GENERATORS))
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'generator':<12}{'size':>11}{'best ms':>12}{'floor %':>10}  connected")
+    for name in args.generators:
+        for size in args.sizes:
+            best = float("inf")
+            for repeat in range(args.repeats):
+                start = time.perf_counter()
+                grid = generate(name, size, size, seed=args.seed + repeat)
+                best = min(best, time.perf_counter() - start)
+            floor = grid == 0
+            print(
+                f"{name:<12}{f'{size}x{size}':>11}{best * 1000:>12.2f}"
+                f"{floor.mean() * 100:>10.1f}  {is_connected(floor)}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmarks the observation encodings: rollout memory and learner step time.
+
+For each encoding of the password FullQuestEnv ("dict" with MultiInputPolicy,
+"flat" with MlpPolicy, "packed" with MlpPolicy and PackedGridExtractor) the
+script builds PPO with the training hyperparameters, collects one rollout,
+and reports the policy input size, the rollout buffer's observation memory,
+the feature preprocessing time for one minibatch, and the time of one
+gradient step of PPO.train.
+
+Usage:
+    python benchmarks/bench_obs_encoding.py [--n-envs 8] [--repeat 3]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import torch
+from stable_baselines3 import PPO
+from stable_baselines3.common.vec_env import DummyVecEnv
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from rl.environments.full_quest_env_pass import FullQuestEnv
+from rl.environments.observation_builder import OBS_ENCODINGS
+from rl.policies.feature_extractors import PackedGridExtractor
+
+_POLICIES = {
+    "dict": ("MultiInputPolicy", {}),
+    "flat": ("MlpPolicy", {}),
+    "packed": ("MlpPolicy", {"features_extractor_class": PackedGridExtractor}),
+}
+
+
+def _buffer_bytes(observations) -> int:
+    if isinstance(observations, dict):
+        return sum(array.nbytes for array in observations.values())
+    return observations.nbytes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-envs", type=int, default=8)
+    parser.add_argument("--n-steps", type=int, default=512)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--repeat", type=int, default=3, help="PPO.train calls to time.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.getLogger("rl").setLevel(logging.WARNING)
+    torch.set_num_threads(1)
+
+    print(
+        f"{'encoding':<10}{'features':>10}{'buffer MiB':>12}"
+        f"{'preprocess µs':>15}{'grad step ms':>14}"
+    )
+    for encoding in OBS_ENCODINGS:
+        policy, policy_kwargs = _POLICIES[encoding]
+        env = DummyVecEnv(
+            [lambda: FullQuestEnv(obs_encoding=encoding)] * args.n_envs
+        )
+        model = PPO(
+            policy,
+            env,
+            n_steps=args.n_steps,
+            batch_size=args.batch_size,
+            n_epochs=1,
+            policy_kwargs=policy_kwargs,
+            seed=args.seed,
+        )
+        model.learn(total_timesteps=args.n_steps * args.n_envs)
+
+        batch = next(model.rollout_buffer.get(args.batch_size))
+        features = model.policy.extract_features(batch.observations)
+        start = time.perf_counter()
+        for _ in range(200):
+            model.policy.extract_features(batch.observations)
+        preprocess = (time.perf_counter() - start) / 200
+
+        steps = args.n_steps * args.n_envs // args.batch_size
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            model.train()
+            timings.append((time.perf_counter() - start) / steps)
+        env.close()
+
+        print(
+            f"{encoding:<10}{features.shape[1]:>10}"
+            f"{_buffer_bytes(model.rollout_buffer.observations) / 2**20:>12.2f}"
+            f"{preprocess * 1e6:>15.1f}{np.median(timings) * 1e3:>14.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Benchmarks building one FullQuestEnv observation per step.
+
+Compares the previous _get_obs, which allocated and rewrote the whole grid
+every step, with the ObservationBuilder returning copies and returning
+read-only views. The player random-walks, and every observation is checked
+against the previous implementation.
+
+Usage:
+    python benchmarks/bench_observation_builder.py [--steps 100000] [--seed 0]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from configs import config
+from game.actors.npc import NPCRole
+from rl.environments.full_quest_env_pass import FullQuestEnv
+
+
+def _legacy_obs(env: FullQuestEnv) -> dict:
+    """FullQuestEnv._get_obs before the ObservationBuilder."""
+    game = env.game
+    grid_obs = np.zeros((config.GRID_HEIGHT, config.GRID_WIDTH, 6), dtype=np.uint8)
+    grid_obs[:, :, 0] = game.tiles
+    px, py = game.player_pos
+    grid_obs[py, px, 1] = 1
+    npc_pos = game.npcs.positions
+    roles = game.npcs.type_ids
+    quest = roles <= NPCRole.PASSWORD_EXPERT
+    grid_obs[npc_pos[quest, 1], npc_pos[quest, 0], 2 + roles[quest]] = 1
+    tx, ty = game.treasure_pos
+    grid_obs[ty, tx, 4] = 1
+    ex, ey = game.exit_pos
+    grid_obs[ey, ex, 5] = 1
+    return {
+        "grid": grid_obs,
+        "has_location_info": int(game.knows_location),
+        "visited_treasure_first": int(env.visited_treasure_first),
+        "has_password_info": int(game.knows_password),
+        "treasure_opened": int(game.treasure_opened),
+        "password_input_mode": int(env.password_input_mode),
+        "treasure_password": int(game.password) if game.knows_password else 0,
+        "entered_password": int(env.entered_password) if env.entered_password else 0,
+    }
+
+
+def _walk(env: FullQuestEnv, steps: int, seed: int) -> list[tuple[int, int]]:
+    """Returns a random walk of player positions on the env's current map."""
+    rng = np.random.default_rng(seed)
+    positions, pos = [], env.game.player_pos
+    moves = ((0, -1), (0, 1), (-1, 0), (1, 0))
+    for move in rng.integers(0, 4, steps).tolist():
+        x, y = pos[0] + moves[move][0], pos[1] + moves[move][1]
+        if env.game.is_walkable(x, y):
+            pos = (x, y)
+        positions.append(pos)
+    return positions
+
+
+def _time(env: FullQuestEnv, build, positions: list[tuple[int, int]]) -> float:
+    start = time.perf_counter()
+    for pos in positions:
+        env.game.player_pos = pos
+        build()
+    return (time.perf_counter() - start) / len(positions)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    copies, views = FullQuestEnv(), FullQuestEnv(obs_views=True)
+    for env in (copies, views):
+        env.reset(seed=args.seed)
+    positions = _walk(copies, args.steps, args.seed)
+
+    for env in (copies, views):
+        for pos in positions[:1000]:
+            env.game.player_pos = pos
+            expected, actual = _legacy_obs(env), env._get_obs()
+            assert all(np.array_equal(expected[k], actual[k]) for k in expected)
+    assert not views._get_obs()["grid"].flags.writeable
+
+    legacy = _time(copies, lambda: _legacy_obs(copies), positions)
+    print(f"{'implementation':<22}{'µs/step':>10}{'speed-up':>10}")
+    print(f"{'previous _get_obs':<22}{legacy * 1e6:>10.2f}{1:>9.1f}x")
+    for name, env in (("builder (copies)", copies), ("builder (views)", views)):
+        elapsed = _time(env, env._get_obs, positions)
+        print(f"{name:<22}{elapsed * 1e6:>10.2f}{legacy / elapsed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
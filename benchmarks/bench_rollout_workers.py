@@ -0,0 +1,71 @@
+"""Measures the wall-clock speed-up of training with more environment workers.
+
+For each worker count the training environment of rl/train_full_quest.py is
+built and timed twice: stepping it with random actions (environment
+throughput only), and running PPO with the training hyperparameters for a
+fixed number of rollouts (collection plus gradient updates).
+
+Usage:
+    python benchmarks/bench_rollout_workers.py [--workers 1 2 4 8] [--vec-env subproc] [--start-method forkserver] [--pin-cpus]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from rl.train_full_quest import VEC_ENVS, available_cpus, build_model, make_training_env
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--vec-env", choices=VEC_ENVS, default="subproc")
+    parser.add_argument("--start-method", choices=("fork", "forkserver", "spawn"), default=None)
+    parser.add_argument("--pin-cpus", action="store_true")
+    parser.add_argument("--env-steps", type=int, default=2000, help="Random steps per worker.")
+    parser.add_argument("--rollouts", type=int, default=2, help="PPO rollouts to time.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.getLogger("rl").setLevel(logging.WARNING)
+
+    print(f"{len(available_cpus())} CPUs available, {args.vec_env} workers")
+    print(f"{'workers':>8}{'env steps/s':>14}{'speed-up':>10}{'train steps/s':>16}{'speed-up':>10}")
+    base = None
+    for count in args.workers:
+        env = make_training_env(
+            count,
+            vec_env=args.vec_env,
+            start_method=args.start_method,
+            seed=args.seed,
+            pin_cpus=args.pin_cpus,
+        )
+        actions = np.random.default_rng(args.seed).integers(
+            0, env.action_space.n, (args.env_steps, count)
+        )
+        env.reset()
+        start = time.perf_counter()
+        for step_actions in actions:
+            env.step(step_actions)
+        env_rate = args.env_steps * count / (time.perf_counter() - start)
+
+        model = build_model(env, seed=args.seed, log_dir=None, verbose=0)
+        timesteps = args.rollouts * model.n_steps * count
+        start = time.perf_counter()
+        model.learn(total_timesteps=timesteps)
+        train_rate = timesteps / (time.perf_counter() - start)
+        env.close()
+
+        base = base or (env_rate, train_rate)
+        print(
+            f"{count:>8}{env_rate:>14.0f}{env_rate / base[0]:>9.2f}x"
+            f"{train_rate:>16.0f}{train_rate / base[1]:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmarks observation transport: pickling SubprocVecEnv against SharedMemoryVecEnv.
+
+Both run N password FullQuestEnvs in worker processes and are stepped with the
+same random actions from the same seed. The script checks that they return
+identical observations, rewards (as float32, like DummyVecEnv) and dones,
+then reports steps per second.
+
+Usage:
+    python benchmarks/bench_shared_memory_vec_env.py [--envs 1 4 8] [--steps 2000] [--start-method forkserver]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+from gymnasium.wrappers import TimeLimit
+from stable_baselines3.common.vec_env import SubprocVecEnv, VecEnv
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from rl.environments.full_quest_env_pass import FullQuestEnv
+from rl.environments.shared_memory_vec_env import SharedMemoryVecEnv
+
+
+def _make_env() -> TimeLimit:
+    logging.getLogger("rl").setLevel(logging.WARNING)
+    return TimeLimit(FullQuestEnv(), max_episode_steps=100)
+
+
+def _run(env: VecEnv, actions: np.ndarray, seed: int, record: bool) -> tuple[float, list]:
+    """Steps an env through `actions`; returns steps/s and, if asked, the outputs."""
+    env.seed(seed)
+    env.reset()
+    outputs = []
+    start = time.perf_counter()
+    for step_actions in actions:
+        obs, rewards, dones, infos = env.step(step_actions)
+        if record:
+            outputs.append(({k: v.copy() for k, v in obs.items()}, rewards, dones))
+    return actions.size / (time.perf_counter() - start), outputs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--envs", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--steps", type=int, default=2000, help="Steps per env.")
+    parser.add_argument("--start-method", choices=("fork", "forkserver", "spawn"), default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'envs':>6}{'pickle steps/s':>16}{'shared steps/s':>16}{'speed-up':>10}{'identical':>11}")
+    for count in args.envs:
+        actions = np.random.default_rng(args.seed).integers(0, 15, (args.steps, count))
+        rates, outputs = [], []
+        for env_cls in (SubprocVecEnv, SharedMemoryVecEnv):
+            env = env_cls([_make_env] * count, start_method=args.start_method)
+            _run(env, actions[:200], args.seed, record=False)  # Warm up
+            rate, _ = _run(env, actions, args.seed, record=False)
+            _, recorded = _run(env, actions[:500], args.seed, record=True)
+            env.close()
+            rates.append(rate)
+            outputs.append(recorded)
+
+        identical = all(
+            all(np.array_equal(a[0][k], b[0][k]) for k in a[0])
+            and np.array_equal(a[1].astype(np.float32), b[1])
+            and np.array_equal(a[2], b[2])
+            for a, b in zip(*outputs)
+        )
+        print(
+            f"{count:>6}{rates[0]:>16.0f}{rates[1]:>16.0f}"
+            f"{rates[1] / rates[0]:>9.2f}x{str(identical):>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
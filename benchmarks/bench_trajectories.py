@@ -0,0 +1,101 @@
+"""Benchmarks the trajectory format: file size, search and replay speed.
+
+The script records episodes of the trained agent with rl.evaluation, saves
+them with rl.trajectories and reports bytes per episode and per step. It
+then tiles them into a file of --total episodes to time opening it and
+selecting episodes by outcome, and replays a sample to time verification
+alone and verification plus headless rendering.
+
+Usage:
+    python benchmarks/bench_trajectories.py [--episodes 2000] [--total 1000000] [--model rl/ppo_full_quest.zip]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from stable_baselines3 import PPO
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from rl.environments.full_quest_env_pass import FullQuestEnv
+from rl.evaluation import evaluate, make_eval_env, save_recording
+from rl.trajectories import Trajectories, replay, save_trajectories
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="rl/ppo_full_quest.zip")
+    parser.add_argument("--episodes", type=int, default=2000, help="Episodes to record.")
+    parser.add_argument("--total", type=int, default=1000000, help="Episodes in the tiled file.")
+    parser.add_argument("--replays", type=int, default=200, help="Episodes to replay.")
+    parser.add_argument("--max-steps", type=int, default=256)
+    args = parser.parse_args()
+    logging.getLogger("rl").setLevel(logging.WARNING)
+
+    model = PPO.load(args.model, device="cpu")
+    env = make_eval_env(min(256, args.episodes), max_episode_steps=args.max_steps)
+    result = evaluate(model, env, args.episodes, record="all")
+    env.close()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "recorded.npz")
+        save_recording(path, result)
+        size, steps = os.path.getsize(path), int(result.steps.sum())
+        print(
+            f"Recorded {args.episodes} episodes, {steps} steps: {size / 1024:.1f} KiB, "
+            f"{size / args.episodes:.1f} B/episode, {size / steps:.2f} B/step"
+        )
+
+        recorded = Trajectories(path)
+        order = np.arange(args.total) % len(recorded)
+        episodes = [recorded[i] for i in range(len(recorded))]
+        tiled = os.path.join(directory, "tiled.npz")
+        start = time.perf_counter()
+        save_trajectories(
+            tiled,
+            np.arange(args.total),
+            recorded.column("success")[order],
+            [episodes[i].actions for i in order.tolist()],
+            [episodes[i].rewards for i in order.tolist()],
+            [episodes[i].checksums for i in order.tolist()],
+        )
+        saved = time.perf_counter() - start
+        print(
+            f"Tiled {args.total} episodes: {os.path.getsize(tiled) / 2**20:.1f} MiB, "
+            f"saved in {saved:.1f} s"
+        )
+
+        start = time.perf_counter()
+        trajectories = Trajectories(tiled)
+        failures = trajectories.select(success=False, min_length=100)
+        selected = time.perf_counter() - start
+        start = time.perf_counter()
+        trajectories[int(failures[-1]) if len(failures) else -1]
+        first_read = time.perf_counter() - start
+        print(
+            f"Open + select failures: {selected * 1e3:.1f} ms ({len(failures)} matches); "
+            f"first episode read (decompresses the step columns): {first_read * 1e3:.1f} ms"
+        )
+
+        sample = [recorded[i] for i in range(min(args.replays, len(recorded)))]
+        for render in (False, True):
+            env = FullQuestEnv(render_mode="rgb_array" if render else None)
+            count = 0
+            start = time.perf_counter()
+            for trajectory in sample:
+                for _ in replay(env, trajectory, recorded.checksum_interval):
+                    if render:
+                        env.render()
+                    count += 1
+            elapsed = time.perf_counter() - start
+            env.close()
+            label = "Replay + render" if render else "Replay (verify only)"
+            print(f"{label}: {count / elapsed:.0f} steps/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Checks that BatchedFullQuestEnv matches the single-game FullQuestEnv.
+
+N password FullQuestEnvs in SB3's DummyVecEnv and one BatchedFullQuestEnv of
+size N are seeded alike and fed the same actions. Every observation, reward,
+done flag and terminal observation must be identical. Actions mix random
+moves with a greedy quest-solving policy, so episodes also terminate and
+auto-reset instead of only timing out.
+
+Usage:
+    python benchmarks/check_batched_env_parity.py [--envs 8] [--steps 5000] [--shaping] [--max-steps 200]
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+import numpy as np
+from gymnasium.wrappers import TimeLimit
+from stable_baselines3.common.vec_env import DummyVecEnv
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from game.maps.layout import EXIT, LOCATION_NPC, PASSWORD_NPC, PLAYER, TREASURE
+from rl.environments.batched_full_quest_env import _MOVES, BatchedFullQuestEnv
+from rl.environments.full_quest_env_pass import FullQuestEnv
+
+
+def _greedy_actions(env: BatchedFullQuestEnv, rng: np.random.Generator, epsilon: float) -> np.ndarray:
+    """Steps each game toward its next quest object, with random actions mixed in."""
+    actions = rng.integers(0, env.action_space.n, env.num_envs)
+    for i in range(env.num_envs):
+        if rng.random() < epsilon:
+            continue
+        if env.password_input_mode[i]:
+            actions[i] = 5 + env.passwords[i]
+            continue
+        if not env.knows_location[i]:
+            target = LOCATION_NPC
+        elif not env.visited_treasure_first[i]:
+            target = TREASURE
+        elif not env.knows_password[i]:
+            target = PASSWORD_NPC
+        elif not env.treasure_opened[i]:
+            target = TREASURE
+        else:
+            target = EXIT
+        player, goal = env.positions[i, PLAYER], env.positions[i, target]
+        offset = np.abs(player - goal).sum()
+        if target != EXIT and offset <= 1:
+            actions[i] = 4
+            continue
+        # Move to any floor neighbour that gets closer as the crow flies, or
+        # to a random floor neighbour when walls are in the way.
+        options = []
+        for action in range(4):
+            x, y = player + _MOVES[action]
+            if 0 <= y < env.tiles.shape[1] and 0 <= x < env.tiles.shape[2] and env.tiles[i, y, x] == 0:
+                options.append((np.abs(np.array([x, y]) - goal).sum() < offset, action))
+        closer = [a for better, a in options if better]
+        if closer:
+            actions[i] = rng.choice(closer)
+        elif options:
+            actions[i] = rng.choice([a for _, a in options])
+    return actions
+
+
+def _compare(name: str, expected, actual) -> list[str]:
+    if isinstance(expected, dict):
+        return [m for key in expected for m in _compare(f"{name}[{key}]", expected[key], actual[key])]
+    expected, actual = np.asarray(expected), np.asarray(actual)
+    if expected.shape != actual.shape or not np.array_equal(expected, actual):
+        return [name]
+    return []
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--envs", type=int, default=8)
+    parser.add_argument("--steps", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--epsilon", type=float, default=0.3, help="Share of random actions.")
+    parser.add_argument("--shaping", action="store_true")
+    parser.add_argument("--max-steps", type=int, default=None, help="Episode step limit.")
+    args = parser.parse_args()
+    logging.getLogger("rl").setLevel(logging.WARNING)
+
+    def make_env():
+        env = FullQuestEnv(reward_shaping=args.shaping)
+        if args.max_steps is not None:
+            env = TimeLimit(env, args.max_steps)
+        return env
+
+    reference = DummyVecEnv([make_env] * args.envs)
+    batched = BatchedFullQuestEnv(
+        args.envs, reward_shaping=args.shaping, max_episode_steps=args.max_steps
+    )
+    reference.seed(args.seed)
+    batched.seed(args.seed)
+    mismatches = _compare("reset", reference.reset(), batched.reset())
+
+    rng = np.random.default_rng(args.seed)
+    episodes = 0
+    for step in range(args.steps):
+        actions = _greedy_actions(batched, rng, args.epsilon)
+        expected = reference.step(actions)
+        actual = batched.step(actions)
+        errors = _compare("obs", expected[0], actual[0])
+        errors += _compare("reward", expected[1], actual[1])
+        errors += _compare("done", expected[2], actual[2])
+        for i in np.flatnonzero(expected[2]):
+            errors += _compare(
+                f"terminal_obs{i}",
+                expected[3][i]["terminal_observation"],
+                actual[3][i]["terminal_observation"],
+            )
+            errors += _compare(
+                f"truncated{i}",
+                expected[3][i]["TimeLimit.truncated"],
+                actual[3][i]["TimeLimit.truncated"],
+            )
+        episodes += int(expected[2].sum())
+        if errors:
+            print(f"Step {step}: {', '.join(errors)} differ")
+        mismatches += errors
+
+    print(
+        f"{args.envs} envs, {args.steps} steps, {episodes} episodes finished, "
+        f"{len(mismatches)} mismatches"
+    )
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
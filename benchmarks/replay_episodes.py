@@ -0,0 +1,86 @@
+"""Replays seeded episodes and checks they are identical bit for bit.
+
+Each episode is defined by an environment seed and an action seed. The script
+records a digest of every observation and reward, replays the same episodes on
+fresh environments (interleaved across two instances, so any shared global
+state would show up), and reports mismatches and steps per second.
+
+Usage:
+    python benchmarks/replay_episodes.py [--env pass] [--episodes 200] [--seed 0]
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from rl.environments import full_quest_env, full_quest_env_pass
+
+ENVS = {
+    "full": full_quest_env.FullQuestEnv,
+    "pass": full_quest_env_pass.FullQuestEnv,
+}
+
+
+def _digest_obs(digest, obs: dict) -> None:
+    for key in sorted(obs):
+        digest.update(np.ascontiguousarray(obs[key]).tobytes())
+
+
+def run_episode(env, seed: int, action_seed: int) -> tuple[str, int]:
+    """Plays one episode with random actions and returns its digest and length."""
+    actions = np.random.default_rng(action_seed)
+    digest = hashlib.blake2b(digest_size=16)
+    obs, _ = env.reset(seed=seed)
+    _digest_obs(digest, obs)
+    steps = 0
+    while True:
+        action = int(actions.integers(env.action_space.n))
+        obs, reward, terminated, truncated, _ = env.step(action)
+        digest.update(np.float64(reward).tobytes())
+        _digest_obs(digest, obs)
+        steps += 1
+        if terminated or truncated:
+            return digest.hexdigest(), steps
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--env", choices=sorted(ENVS), default="pass")
+    parser.add_argument("--episodes", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    env_cls = ENVS[args.env]
+    seeds = np.random.SeedSequence(args.seed).generate_state(2 * args.episodes)
+    episodes = [(int(seeds[2 * i]), int(seeds[2 * i + 1])) for i in range(args.episodes)]
+
+    env = env_cls()
+    start = time.perf_counter()
+    recorded = [run_episode(env, seed, action_seed) for seed, action_seed in episodes]
+    elapsed = time.perf_counter() - start
+    env.close()
+    total_steps = sum(steps for _, steps in recorded)
+
+    envs = [env_cls(), env_cls()]
+    mismatches = 0
+    for i, (seed, action_seed) in enumerate(episodes):
+        if run_episode(envs[i % 2], seed, action_seed) != recorded[i]:
+            mismatches += 1
+            print(f"Episode {i} (seed={seed}, action_seed={action_seed}) diverged")
+    for replay_env in envs:
+        replay_env.close()
+
+    print(
+        f"{args.episodes} episodes, {total_steps} steps, "
+        f"{total_steps / elapsed:.0f} steps/s, {mismatches} mismatches"
+    )
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
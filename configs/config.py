@@ -5,11 +5,37 @@ GRID_WIDTH: int = 7  # Maze width
 GRID_HEIGHT: int = 7  # Maze height
 GRID_SIZE: int = 120  # Default pixel size of each cell (can be scaled up)
 WALL_DENSITY: float = 0  # Wall density (higher value means narrower paths)
+# Map generator: "drunkard", "backtracker", "prim", "kruskal" or "cave"
+MAP_GENERATOR: str = "drunkard"
+# Minimum path distance between any two placed objects (0 disables the check)
+MIN_OBJECT_SPREAD: int = 0
+# Directory of a pre-generated map pool (see rl/build_map_pool.py); None generates maps on reset
+MAP_POOL_PATH: str | None = None
+# "fixed" plays on one GRID_WIDTH x GRID_HEIGHT map; "chunked" plays on an unbounded
+# world generated chunk by chunk around the player, with the quest in chunk (0, 0)
+WORLD_MODE: str = "fixed"
+WORLD_SEED: int | None = None  # Seed of the chunked world; None picks a new one on every reset
+CHUNK_SIZE: int = 32  # Chunk side length in cells (even)
+CHUNK_GENERATOR: str = "backtracker"  # Maze generator used for chunks: "backtracker", "prim" or "kruskal"
+CHUNK_LOAD_RADIUS: int = 1  # Chunks this many chunks around the player are generated
+CHUNK_EVICT_RADIUS: int = 2  # Chunks farther away than this are evicted to the cache
+CHUNK_CACHE_DIR: str | None = None  # Cache for evicted chunks; None uses a temporary directory
+
+# Visible area in cells; the camera scrolls over maps larger than this
+VIEWPORT_WIDTH: int = 15 if WORLD_MODE == "chunked" else min(GRID_WIDTH, 15)
+VIEWPORT_HEIGHT: int = 11 if WORLD_MODE == "chunked" else min(GRID_HEIGHT, 11)
 
 INFO_PANEL_HEIGHT: int = 180  # Height of the bottom info panel
-SCREEN_WIDTH: int = GRID_WIDTH * GRID_SIZE
-SCREEN_HEIGHT: int = GRID_HEIGHT * GRID_SIZE + INFO_PANEL_HEIGHT
+SCREEN_WIDTH: int = VIEWPORT_WIDTH * GRID_SIZE
+SCREEN_HEIGHT: int = VIEWPORT_HEIGHT * GRID_SIZE + INFO_PANEL_HEIGHT
 FPS: int = 30
+RGB_ARRAY_TILE_SIZE: int = 16  # Pixel size of each cell in headless rgb_array frames
+RESIZE_DEBOUNCE_MS: int = 150  # Wait this long after the last resize event before rescaling
+
+# --- Frame Profiler Settings ---
+PROFILER_ENABLED: bool = False  # Start with frame timing on (toggle in game with F3)
+PROFILER_WINDOW: int = 120  # Number of recent frames shown in the overlay graph
+PROFILER_CSV_PATH: str | None = None  # Write per-frame phase timings here if set
 
 # --- Color Definitions ---
 Color = tuple[int, int, int]
@@ -23,8 +49,6 @@ PATH_COLOR: Color = (20, 20, 40)
 EXIT_COLOR: Color = (255, 200, 0)
 TREASURE_COLOR: Color = (255, 180, 50)
 TREASURE_OPEN_COLOR: Color = (150, 220, 255)
-NPC_LOC_COLOR: Color = (200, 0, 200)
-NPC_PW_COLOR: Color = (0, 200, 200)
 LABEL_TEXT_COLOR: Color = (255, 255, 255)
 UI_BG_COLOR: Color = (10, 10, 30)
 UI_BORDER_COLOR: Color = (150, 150, 200)
@@ -33,10 +57,10 @@ UI_BORDER_COLOR: Color = (150, 150, 200)
 # --- AI/LLM Settings ---
 # LLM_MODEL_NAME: str = "LGAI-EXAONE/EXAONE-4.0-1.2B"
 LLM_MODEL_NAME: str = "LGAI-EXAONE/EXAONE-4.0-32B-AWQ"
+CHAT_HISTORY_LIMIT: int = 6  # Messages kept per NPC; older exchanges are dropped in pairs
 
 # --- Prompt File Paths ---
-NPC_LOC_PROMPT_PATH: str = "llm/prompts/npc_location.md"
-NPC_PW_PROMPT_PATH: str = "llm/prompts/npc_password.md"
+NPC_ROSTER_PATH: str = "game/actors/roster.json"  # NPC manifest: names, roles, sprites and prompt templates
 
 
 # --- Font Settings ---
@@ -45,3 +69,14 @@ BASE_FONT_INFO_SIZE: int = 6
 BASE_FONT_LABEL_SIZE: int = 11
 
 MAX_STEPS_PER_EPISODE: int = 200  # Maximum steps per episode
+
+# --- RL Reward Shaping (used when an env is created with reward_shaping=True) ---
+SHAPING_SCALE: float = 1.0  # Potential is -SHAPING_SCALE * distance / map area
+SHAPING_GAMMA: float = 0.99  # Should match the learner's discount factor
+
+# --- RL Egocentric Observations (used when an env is created with obs_encoding="egocentric") ---
+EGO_VIEW_RADIUS: int = 5  # The local crop covers (2r+1) x (2r+1) cells centred on the player
+EGO_SUMMARY_SIZE: int = 4  # The global summary pools the whole map into this many cells per side
+
+# --- RL Trajectories (episodes recorded by rl/run_full_quest.py --record) ---
+TRAJECTORY_CHECKSUM_INTERVAL: int = 32  # Store a state checksum every this many steps to verify replays (0: none)
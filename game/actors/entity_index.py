@@ -0,0 +1,101 @@
+from collections.abc import Hashable
+
+# The cell itself first, then its four neighbours, matching Game.is_adjacent.
+_ADJACENT_OFFSETS: tuple[tuple[int, int], ...] = (
+    (0, 0),
+    (0, -1),
+    (0, 1),
+    (-1, 0),
+    (1, 0),
+)
+
+
+class EntityIndex:
+    """A spatial hash from grid cells to the entities standing on them.
+
+    Answers "what occupies this cell" and "who is adjacent to this cell" in
+    constant time, independent of the number of entities. Entities must be
+    moved through ``move`` so the index stays up to date.
+    """
+
+    def __init__(self) -> None:
+        """Initializes an empty EntityIndex."""
+        self._cells: dict[tuple[int, int], list[Hashable]] = {}
+        self._positions: dict[Hashable, tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, entity: Hashable) -> bool:
+        return entity in self._positions
+
+    def clear(self) -> None:
+        """Removes every entity."""
+        self._cells.clear()
+        self._positions.clear()
+
+    def add(self, entity: Hashable, pos: tuple[int, int]) -> None:
+        """Adds an entity at a cell.
+
+        Args:
+            entity (Hashable): The entity to add.
+            pos (tuple[int, int]): The (x, y) cell it stands on.
+        """
+        if entity in self._positions:
+            raise ValueError(f"{entity!r} is already in the index.")
+        self._positions[entity] = pos
+        self._cells.setdefault(pos, []).append(entity)
+
+    def remove(self, entity: Hashable) -> None:
+        """Removes an entity from the index.
+
+        Args:
+            entity (Hashable): The entity to remove.
+        """
+        pos = self._positions.pop(entity)
+        occupants = self._cells[pos]
+        occupants.remove(entity)
+        if not occupants:
+            del self._cells[pos]
+
+    def move(self, entity: Hashable, pos: tuple[int, int]) -> None:
+        """Moves an entity to another cell.
+
+        Args:
+            entity (Hashable): The entity to move.
+            pos (tuple[int, int]): The (x, y) cell it moves to.
+        """
+        self.remove(entity)
+        self.add(entity, pos)
+
+    def position(self, entity: Hashable) -> tuple[int, int]:
+        """Returns the cell an entity stands on."""
+        return self._positions[entity]
+
+    def at(self, pos: tuple[int, int]) -> list[Hashable]:
+        """Returns the entities standing on a cell.
+
+        Args:
+            pos (tuple[int, int]): The (x, y) cell.
+
+        Returns:
+            list[Hashable]: The occupants, in the order they arrived.
+        """
+        return list(self._cells.get(pos, ()))
+
+    def adjacent(self, pos: tuple[int, int]) -> list[Hashable]:
+        """Returns the entities on a cell or on one of its four neighbours.
+
+        Args:
+            pos (tuple[int, int]): The (x, y) cell.
+
+        Returns:
+            list[Hashable]: The entities, those on the cell itself first.
+        """
+        x, y = pos
+        found: list[Hashable] = []
+        for dx, dy in _ADJACENT_OFFSETS:
+            occupants = self._cells.get((x + dx, y + dy))
+            if occupants:
+                found.extend(occupants)
+        return found
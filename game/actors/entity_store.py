@@ -0,0 +1,230 @@
+from collections import deque
+from collections.abc import Iterable, Iterator
+
+import numpy as np
+
+from configs import config
+from game.actors.npc import NPC
+from game.actors.roster import load_prompt_template
+
+# Bits of EntityStore.flags.
+FLAG_MET: int = 1 << 0  # The player has interacted with the NPC.
+
+
+class EntityStore:
+    """A struct-of-arrays store for NPCs.
+
+    Positions, type IDs and state flags live in NumPy arrays so passes over
+    the whole population (culling, adjacency, observations) are single
+    vectorized operations. Text fields stay in plain lists, personas are
+    formatted from their prompt templates the first time they are needed, and
+    chat histories are bounded ring buffers created only for NPCs the player
+    talks to.
+    Iterating or indexing the store yields cached NPC views, so it can be used
+    wherever a list of NPCs was expected.
+
+    Positions are mirrored as tuples so per-NPC reads (NPC.pos) stay as cheap
+    as an attribute lookup; move NPCs through NPC.pos or ``move``.
+
+    Attributes:
+        positions (np.ndarray): The (N, 2) int32 (x, y) positions, read-only.
+        type_ids (np.ndarray): The (N,) int16 NPC types.
+        flags (np.ndarray): The (N,) uint8 state flags.
+        names (list[str]): The NPC names.
+        colors (list[tuple[int, int, int]]): The NPC colors.
+        labels (list[str]): The NPC labels.
+        sprites (list[str]): The NPC sprite names.
+    """
+
+    def __init__(self, capacity: int = 16) -> None:
+        """Initializes an empty EntityStore.
+
+        Args:
+            capacity (int): The number of NPCs to allocate room for; the
+                arrays grow by doubling when it is exceeded.
+        """
+        self._positions: np.ndarray = np.zeros((capacity, 2), dtype=np.int32)
+        self._type_ids: np.ndarray = np.zeros(capacity, dtype=np.int16)
+        self._flags: np.ndarray = np.zeros(capacity, dtype=np.uint8)
+        self._count: int = 0
+        self._pos_tuples: list[tuple[int, int]] = []
+        self.names: list[str] = []
+        self.colors: list[tuple[int, int, int]] = []
+        self.labels: list[str] = []
+        self.sprites: list[str] = []
+        # Persona templates and their arguments; _backgrounds holds the
+        # formatted text once it has been asked for.
+        self._prompts: list[str | None] = []
+        self._prompt_args: list[tuple] = []
+        self._backgrounds: list[str | None] = []
+        self._chat_histories: dict[int, deque] = {}
+        self._views: list[NPC] = []
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[NPC]:
+        return iter(self._views)
+
+    def __getitem__(self, index: int) -> NPC:
+        return self._views[index]
+
+    @property
+    def positions(self) -> np.ndarray:
+        """The (N, 2) positions of the stored NPCs (a read-only view)."""
+        view = self._positions[: self._count]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def type_ids(self) -> np.ndarray:
+        """The (N,) type IDs of the stored NPCs."""
+        return self._type_ids[: self._count]
+
+    @property
+    def flags(self) -> np.ndarray:
+        """The (N,) state flags of the stored NPCs."""
+        return self._flags[: self._count]
+
+    def clear(self) -> None:
+        """Removes every NPC, keeping the allocated arrays."""
+        self._count = 0
+        self._pos_tuples.clear()
+        self.names.clear()
+        self.colors.clear()
+        self.labels.clear()
+        self.sprites.clear()
+        self._prompts.clear()
+        self._prompt_args.clear()
+        self._backgrounds.clear()
+        self._chat_histories.clear()
+        self._views.clear()
+
+    def add(
+        self,
+        name: str,
+        pos: tuple[int, int],
+        color: tuple[int, int, int],
+        label: str,
+        background: str | None = None,
+        type_id: int = 0,
+        sprite: str = "",
+        prompt: str | None = None,
+        prompt_args: tuple = (),
+    ) -> NPC:
+        """Adds an NPC.
+
+        Args:
+            name (str): The name of the NPC.
+            pos (tuple[int, int]): The grid position of the NPC.
+            color (tuple[int, int, int]): The color of the NPC.
+            label (str): The label for the NPC.
+            background (str | None): The background and personality of the
+                NPC. If None, it is formatted from `prompt` on first use.
+            type_id (int): The NPC's role.
+            sprite (str): The name of the NPC's sprite.
+            prompt (str | None): Path of the persona prompt template.
+            prompt_args (tuple): Positional arguments for the template.
+
+        Returns:
+            NPC: A view of the new NPC.
+        """
+        index = self._count
+        if index == len(self._positions):
+            self._grow(2 * max(1, index))
+        self._positions[index] = pos
+        self._pos_tuples.append((int(pos[0]), int(pos[1])))
+        self._type_ids[index] = type_id
+        self._flags[index] = 0
+        self.names.append(name)
+        self.colors.append(color)
+        self.labels.append(label)
+        self.sprites.append(sprite)
+        self._prompts.append(prompt)
+        self._prompt_args.append(prompt_args)
+        self._backgrounds.append(background)
+        self._count += 1
+        view = NPC(self, index)
+        self._views.append(view)
+        return view
+
+    def _grow(self, capacity: int) -> None:
+        """Reallocates the arrays with room for `capacity` NPCs."""
+        for name in ("_positions", "_type_ids", "_flags"):
+            old = getattr(self, name)
+            new = np.zeros((capacity, *old.shape[1:]), dtype=old.dtype)
+            new[: len(old)] = old
+            setattr(self, name, new)
+
+    def position(self, index: int) -> tuple[int, int]:
+        """Returns an NPC's (x, y) position."""
+        return self._pos_tuples[index]
+
+    def move(self, index: int, pos: tuple[int, int]) -> None:
+        """Moves an NPC to an (x, y) cell."""
+        self._positions[index] = pos
+        self._pos_tuples[index] = (int(pos[0]), int(pos[1]))
+
+    def background(self, index: int) -> str:
+        """Returns an NPC's persona, formatting its template on first use."""
+        background = self._backgrounds[index]
+        if background is None:
+            prompt = self._prompts[index]
+            template = load_prompt_template(prompt) if prompt else ""
+            background = template.format(*self._prompt_args[index])
+            self._backgrounds[index] = background
+        return background
+
+    def chat_history(self, index: int) -> deque:
+        """Returns an NPC's chat history, creating its ring buffer on first use.
+
+        The buffer has room for config.CHAT_HISTORY_LIMIT messages plus one
+        more exchange; InteractionHandler trims it back in user/assistant
+        pairs after each reply, so prompts always hold whole exchanges.
+        """
+        history = self._chat_histories.get(index)
+        if history is None:
+            history = deque(maxlen=config.CHAT_HISTORY_LIMIT + 2)
+            self._chat_histories[index] = history
+        return history
+
+    def set_chat_history(self, index: int, messages: Iterable[dict[str, str]]) -> None:
+        """Replaces an NPC's chat history; an empty one frees the buffer."""
+        messages = list(messages)
+        if messages:
+            self._chat_histories[index] = deque(
+                messages, maxlen=config.CHAT_HISTORY_LIMIT + 2
+            )
+        else:
+            self._chat_histories.pop(index, None)
+
+    def in_rect(self, x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+        """Returns the indices of the NPCs inside a rectangle, end-exclusive.
+
+        Args:
+            x0 (int): The left column.
+            y0 (int): The top row.
+            x1 (int): The right column, exclusive.
+            y1 (int): The bottom row, exclusive.
+
+        Returns:
+            np.ndarray: The indices, in insertion order.
+        """
+        positions = self._positions[: self._count]
+        x, y = positions[:, 0], positions[:, 1]
+        return np.flatnonzero((x >= x0) & (x < x1) & (y >= y0) & (y < y1))
+
+    def within(self, pos: tuple[int, int], distance: int = 1) -> np.ndarray:
+        """Returns the indices of the NPCs within a Manhattan distance of a cell.
+
+        With the default distance of 1 this matches Game.is_adjacent.
+
+        Args:
+            pos (tuple[int, int]): The (x, y) cell.
+            distance (int): The largest distance included.
+
+        Returns:
+            np.ndarray: The indices, in insertion order.
+        """
+        offsets = np.abs(self._positions[: self._count] - np.asarray(pos, dtype=np.int32))
+        return np.flatnonzero(offsets.sum(axis=1) <= distance)
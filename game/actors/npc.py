@@ -1,34 +1,103 @@
+from collections import deque
+from enum import IntEnum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from game.actors.entity_store import EntityStore
+
+
+class NPCRole(IntEnum):
+    """What an NPC does in the quest; stored in EntityStore.type_ids."""
+
+    LOCATION_INFORMANT = 0  # Knows where the treasure is
+    PASSWORD_EXPERT = 1  # Knows the treasure chest password
+    VILLAGER = 2  # Has nothing to do with the quest
+
+
 class NPC:
-    """Represents a non-player character (NPC) in the game.
+    """A lightweight view of one non-player character (NPC) in an EntityStore.
+
+    The NPC's data lives in the store's arrays; the view only holds the store
+    and the NPC's row, so it costs two slots however large the population.
 
     Attributes:
         name (str): The name of the NPC.
         pos (tuple[int, int]): The (x, y) grid position of the NPC.
         color (tuple[int, int, int]): The RGB color of the NPC.
         label (str): The single-character label to display for the NPC.
-        background (str): The background and personality of the NPC.
+        background (str): The background and personality of the NPC, formatted
+            from its prompt template on first access.
+        sprite (str): The name of the NPC's sprite.
+        type_id (int): The NPC's role as a plain integer, for hot paths.
+        role (NPCRole): The NPC's role.
+        flags (int): Bit flags such as FLAG_MET.
+        chat_history (deque[dict[str, str]]): The most recent chat messages,
+            allocated on first use.
     """
 
-    def __init__(
-        self,
-        name: str,
-        pos: tuple[int, int],
-        color: tuple[int, int, int],
-        label: str,
-        background: str,
-    ) -> None:
-        """Initializes the NPC.
+    __slots__ = ("_store", "index")
+
+    def __init__(self, store: "EntityStore", index: int) -> None:
+        """Initializes the NPC view.
 
         Args:
-            name (str): The name of the NPC.
-            pos (tuple[int, int]): The grid position of the NPC.
-            color (tuple[int, int, int]): The color of the NPC.
-            label (str): The label for the NPC.
-            background (str): The background and personality of the NPC.
+            store (EntityStore): The store holding the NPC's data.
+            index (int): The NPC's row in the store.
         """
-        self.name: str = name
-        self.pos: tuple[int, int] = pos
-        self.color: tuple[int, int, int] = color
-        self.label: str = label
-        self.background: str = background
-        self.chat_history: list[dict[str, str]] = []
+        self._store = store
+        self.index: int = index
+
+    def __repr__(self) -> str:
+        return f"NPC({self.name!r}, pos={self.pos})"
+
+    @property
+    def name(self) -> str:
+        return self._store.names[self.index]
+
+    @property
+    def pos(self) -> tuple[int, int]:
+        return self._store.position(self.index)
+
+    @pos.setter
+    def pos(self, pos: tuple[int, int]) -> None:
+        self._store.move(self.index, pos)
+
+    @property
+    def color(self) -> tuple[int, int, int]:
+        return self._store.colors[self.index]
+
+    @property
+    def label(self) -> str:
+        return self._store.labels[self.index]
+
+    @property
+    def background(self) -> str:
+        return self._store.background(self.index)
+
+    @property
+    def sprite(self) -> str:
+        return self._store.sprites[self.index]
+
+    @property
+    def type_id(self) -> int:
+        return int(self._store.type_ids[self.index])
+
+    @property
+    def role(self) -> NPCRole:
+        return NPCRole(self.type_id)
+
+    @property
+    def flags(self) -> int:
+        return int(self._store.flags[self.index])
+
+    @flags.setter
+    def flags(self, flags: int) -> None:
+        self._store.flags[self.index] = flags
+
+    @property
+    def chat_history(self) -> deque:
+        return self._store.chat_history(self.index)
+
+    @chat_history.setter
+    def chat_history(self, messages) -> None:
+        self._store.set_chat_history(self.index, messages)
@@ -0,0 +1,90 @@
+import json
+from functools import lru_cache
+from typing import NamedTuple
+
+from game.actors.npc import NPCRole
+from game.maps.layout import LOCATION_NPC, PASSWORD_NPC
+
+# Layout slots an NPC definition may be placed on.
+_POSITIONS: dict[str, int] = {
+    "location_npc": LOCATION_NPC,
+    "password_npc": PASSWORD_NPC,
+}
+
+
+class NPCDefinition(NamedTuple):
+    """One entry of the NPC roster manifest.
+
+    Attributes:
+        name (str): The name shown above the NPC.
+        role (NPCRole): What the NPC does in the quest.
+        label (str): The single-character label of the NPC.
+        color (tuple[int, int, int]): The RGB color of the NPC.
+        sprite (str): The sprite name, a key of SPRITE_PATHS.
+        prompt (str | None): Path of the persona prompt template, if any.
+        position (int | None): The Layout.positions row the NPC stands on, or
+            None to place it on a random free cell.
+    """
+
+    name: str
+    role: NPCRole
+    label: str
+    color: tuple[int, int, int]
+    sprite: str
+    prompt: str | None
+    position: int | None
+
+
+@lru_cache(maxsize=None)
+def load_roster(path: str) -> tuple[NPCDefinition, ...]:
+    """Loads and validates an NPC roster manifest.
+
+    The manifest is a JSON object with an "npcs" list. Each entry has a "name",
+    a "role" (an NPCRole name in lower case), a "label", a "color", a "sprite",
+    and optionally a "prompt" template path and a "position" ("location_npc"
+    or "password_npc"). The result is cached per path.
+
+    Args:
+        path (str): The manifest path.
+
+    Returns:
+        tuple[NPCDefinition, ...]: The NPC definitions, in manifest order.
+
+    Raises:
+        ValueError: If an entry is malformed or a quest role is missing.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)["npcs"]
+
+    roster = []
+    for entry in entries:
+        try:
+            role = NPCRole[entry["role"].upper()]
+        except KeyError:
+            raise ValueError(f"Unknown NPC role {entry['role']!r} in {path}.") from None
+        position = entry.get("position")
+        if position is not None and position not in _POSITIONS:
+            raise ValueError(f"Unknown NPC position {position!r} in {path}.")
+        roster.append(
+            NPCDefinition(
+                name=entry["name"],
+                role=role,
+                label=entry["label"],
+                color=tuple(entry["color"]),
+                sprite=entry["sprite"],
+                prompt=entry.get("prompt"),
+                position=None if position is None else _POSITIONS[position],
+            )
+        )
+
+    for role in (NPCRole.LOCATION_INFORMANT, NPCRole.PASSWORD_EXPERT):
+        if not any(d.role == role and d.position is not None for d in roster):
+            raise ValueError(f"{path} has no placed NPC with role {role.name.lower()}.")
+    return tuple(roster)
+
+
+@lru_cache(maxsize=None)
+def load_prompt_template(path: str) -> str:
+    """Reads a persona prompt template once per process."""
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
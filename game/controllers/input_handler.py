@@ -1,6 +1,7 @@
 import pygame
 
 from configs import config
+from game.actors.npc import NPCRole
 from game.controllers.interaction_handler import InteractionHandler
 from game.games.game import Game
 from game.games.states import GameState
@@ -26,6 +27,9 @@ class InputHandler:
         self.game: Game = game
         self.interaction_handler: InteractionHandler = interaction_handler
         self.renderer: Renderer = renderer
+        # Latest window size reported while the user is still resizing.
+        self._pending_resize: tuple[int, int] | None = None
+        self._resize_deadline: int = 0
 
     def handle_events(self) -> bool:
         """Processes all pending Pygame events and updates the game state.
@@ -37,8 +41,15 @@ class InputHandler:
             if event.type == pygame.QUIT:
                 return False  # Signal to quit the game
 
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.renderer.profiler.toggle()
+                continue
+
             if event.type == pygame.VIDEORESIZE:
-                self._handle_resize(event)
+                self._pending_resize = (event.w, event.h)
+                self._resize_deadline = (
+                    pygame.time.get_ticks() + config.RESIZE_DEBOUNCE_MS
+                )
 
             # Delegate to the appropriate handler based on game state
             if self.game.state == GameState.TEXT_INPUT:
@@ -49,13 +60,26 @@ class InputHandler:
                 self._handle_game_over_input(event)
             elif self.game.state == GameState.PLAYING:
                 self._handle_playing_input(event)
+
+        # Rescale only once the window size has settled.
+        if (
+            self._pending_resize is not None
+            and pygame.time.get_ticks() >= self._resize_deadline
+        ):
+            self._handle_resize(self._pending_resize)
+            self._pending_resize = None
         return True  # Signal to continue the game
 
-    def _handle_resize(self, event: pygame.event.Event) -> None:
-        """Handles the window resize event."""
-        config.SCREEN_WIDTH, config.SCREEN_HEIGHT = event.w, event.h
-        size_from_w = event.w // config.GRID_WIDTH
-        size_from_h = (event.h - config.INFO_PANEL_HEIGHT) // config.GRID_HEIGHT
+    def _handle_resize(self, size: tuple[int, int]) -> None:
+        """Applies a settled window size to the config and the renderer.
+
+        Args:
+            size (tuple[int, int]): The new window width and height.
+        """
+        width, height = size
+        config.SCREEN_WIDTH, config.SCREEN_HEIGHT = width, height
+        size_from_w = width // config.VIEWPORT_WIDTH
+        size_from_h = (height - config.INFO_PANEL_HEIGHT) // config.VIEWPORT_HEIGHT
         config.GRID_SIZE = min(size_from_w, size_from_h)
         self.renderer.on_resize(
             (config.SCREEN_WIDTH, config.SCREEN_HEIGHT), config.GRID_SIZE
@@ -116,11 +140,11 @@ class InputHandler:
 
         if self.game.menu_selection == 0:  # Get fixed info
             npc = self.game.active_npc
-            if npc.name == "위치 정보원":
+            if npc.type_id == NPCRole.LOCATION_INFORMANT:
                 self.game.knows_location = True
                 self.game.dialogue = f"[{npc.name}]: 보물은 ({self.game.treasure_pos[0]}, {self.game.treasure_pos[1]}) 좌표에 있네."
                 self.game.objective = "목표: 보물상자의 암호 알아내기"
-            elif npc.name == "암호 전문가":
+            elif npc.type_id == NPCRole.PASSWORD_EXPERT:
                 if self.game.knows_location:
                     self.game.knows_password = True
                     self.game.dialogue = (
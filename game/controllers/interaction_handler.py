@@ -2,6 +2,9 @@ import re
 
 import pygame
 
+from configs import config
+from game.actors.entity_store import FLAG_MET
+from game.actors.npc import NPCRole
 from game.games.game import Game
 from game.games.states import GameState
 
@@ -19,14 +22,13 @@ class InteractionHandler:
 
     def handle_interaction(self) -> None:
         """Handles player interaction with NPCs and the treasure chest."""
-        for npc in self.game.npcs:
-            if self.game.is_adjacent(self.game.player_pos, npc.pos):
-                self.game.state = GameState.INTERACTION_MENU
-                self.game.active_npc = npc
-                self.game.menu_selection = 0
-                return
-        
-        
+        adjacent_npcs = self.game.adjacent_npcs()
+        if adjacent_npcs:
+            self.game.state = GameState.INTERACTION_MENU
+            self.game.active_npc = adjacent_npcs[0]
+            self.game.active_npc.flags |= FLAG_MET
+            self.game.menu_selection = 0
+            return
 
         if (
             self.game.treasure_visible
@@ -58,7 +60,7 @@ class InteractionHandler:
         player_msg = {"role": "user", "content": self.game.input_text}
         self.game.active_npc.chat_history.append(player_msg)
 
-        prompt = self.game.active_npc.chat_history
+        prompt = list(self.game.active_npc.chat_history)
 
         response_data = self.game.llm_client.chat(
             prompt, system_prompt=self.game.active_npc.background
@@ -97,14 +99,15 @@ class InteractionHandler:
         else:
             response = "..."  # Default response on error
 
-        self.game.active_npc.chat_history.append(
-            {"role": "assistant", "content": response}
-        )
+        chat_history = self.game.active_npc.chat_history
+        chat_history.append({"role": "assistant", "content": response})
         # --- End of LLM Integration ---
 
-        if len(self.game.active_npc.chat_history) > 6:  # Keep chat history concise
-            self.game.active_npc.chat_history.pop(0)
-            self.game.active_npc.chat_history.pop(0)
+        # Keep chat history concise, dropping a whole exchange at a time so the
+        # prompt keeps its user/assistant alternation.
+        if len(chat_history) > config.CHAT_HISTORY_LIMIT:
+            chat_history.popleft()
+            chat_history.popleft()
 
         self.game.input_text = ""
         self._update_chat_display()
@@ -137,15 +140,13 @@ class InteractionHandler:
         """Checks if the LLM's response reveals critical game information."""
         if not self.game.active_npc:
             return
+        role = self.game.active_npc.type_id
         if (
-            self.game.active_npc.name == "위치 정보원"
+            role == NPCRole.LOCATION_INFORMANT
             and str(self.game.treasure_pos[0]) in response
         ):
             self.game.knows_location = True
-        if (
-            self.game.active_npc.name == "암호 전문가"
-            and self.game.password in response
-        ):
+        if role == NPCRole.PASSWORD_EXPERT and self.game.password in response:
             self.game.knows_password = True
 
     def _update_chat_display(self) -> None:
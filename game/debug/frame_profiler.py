@@ -0,0 +1,188 @@
+import csv
+from collections import deque
+from contextlib import nullcontext
+from time import perf_counter
+
+import pygame
+
+from configs import config
+
+# Phases in the order they appear in a frame.
+PHASES: tuple[str, ...] = (
+    "events",
+    "tiles",
+    "objects",
+    "labels",
+    "info_panel",
+    "overlays",
+    "flip",
+)
+
+PHASE_COLORS: dict[str, tuple[int, int, int]] = {
+    "events": (230, 80, 80),
+    "tiles": (80, 160, 230),
+    "objects": (80, 220, 120),
+    "labels": (240, 200, 60),
+    "info_panel": (200, 120, 240),
+    "overlays": (240, 140, 60),
+    "flip": (170, 170, 170),
+}
+
+# Returned by section() while profiling is off, so the hot path only pays for
+# an attribute check and an empty with-block.
+_NULL_SECTION = nullcontext()
+
+
+class _Section:
+    """Context manager that adds the time spent inside it to one phase."""
+
+    __slots__ = ("_profiler", "_name", "_start")
+
+    def __init__(self, profiler: "FrameProfiler", name: str) -> None:
+        self._profiler = profiler
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        self._start = perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        current = self._profiler._current
+        current[self._name] = current.get(self._name, 0.0) + perf_counter() - self._start
+
+
+class FrameProfiler:
+    """Measures how long each phase of a frame takes.
+
+    Timings are kept for a rolling window of frames, can be drawn as an
+    on-screen graph and can be written to a CSV file with one row per frame.
+
+    Attributes:
+        enabled (bool): Whether frames are currently being timed.
+        history (deque[tuple[float, ...]]): Per-frame phase timings in
+            milliseconds, in PHASES order, for the last ``window`` frames.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        window: int | None = None,
+        csv_path: str | None = None,
+    ) -> None:
+        """Initializes the FrameProfiler.
+
+        Args:
+            enabled (bool): Whether to start timing right away.
+            window (int | None): Number of frames kept for the graph and the
+                averages. Defaults to config.PROFILER_WINDOW.
+            csv_path (str | None): If given, every timed frame is appended to
+                this CSV file.
+        """
+        self.enabled: bool = enabled
+        self.history: deque[tuple[float, ...]] = deque(
+            maxlen=window or config.PROFILER_WINDOW
+        )
+        self._current: dict[str, float] = {}
+        self._frame_start: float = 0.0
+        self._frame_index: int = 0
+        self._sections: dict[str, _Section] = {
+            name: _Section(self, name) for name in PHASES
+        }
+
+        self._csv_file = None
+        self._csv_writer = None
+        if csv_path:
+            self._csv_file = open(csv_path, "w", newline="", encoding="utf-8")
+            self._csv_writer = csv.writer(self._csv_file)
+            self._csv_writer.writerow(["frame", *PHASES, "total"])
+
+    def toggle(self) -> None:
+        """Switches timing (and the on-screen graph) on or off."""
+        self.enabled = not self.enabled
+        self._current = {}
+
+    def section(self, name: str):
+        """Returns a context manager that times one phase of the current frame.
+
+        Args:
+            name (str): The phase name, one of PHASES.
+        """
+        if not self.enabled:
+            return _NULL_SECTION
+        section = self._sections.get(name)
+        if section is None:
+            section = self._sections[name] = _Section(self, name)
+        return section
+
+    def begin_frame(self) -> None:
+        """Marks the start of a frame."""
+        if self.enabled:
+            self._current = {}
+            self._frame_start = perf_counter()
+
+    def end_frame(self) -> None:
+        """Marks the end of a frame and records its phase timings."""
+        if not self.enabled or not self._frame_start:
+            return
+        total = (perf_counter() - self._frame_start) * 1000.0
+        timings = tuple(self._current.get(name, 0.0) * 1000.0 for name in PHASES)
+        self.history.append(timings)
+        if self._csv_writer is not None:
+            self._csv_writer.writerow(
+                [self._frame_index, *(f"{t:.4f}" for t in timings), f"{total:.4f}"]
+            )
+        self._frame_index += 1
+        self._frame_start = 0.0
+
+    def averages(self) -> dict[str, float]:
+        """Returns the mean time of each phase over the window, in milliseconds."""
+        if not self.history:
+            return {name: 0.0 for name in PHASES}
+        count = len(self.history)
+        sums = [sum(column) for column in zip(*self.history)]
+        return {name: total / count for name, total in zip(PHASES, sums)}
+
+    def draw_overlay(self, screen: pygame.Surface, font: pygame.font.Font) -> None:
+        """Draws a stacked bar graph of recent frames and the phase averages.
+
+        Args:
+            screen (pygame.Surface): The surface to draw on.
+            font (pygame.font.Font): The font used for the legend.
+        """
+        if not self.enabled:
+            return
+        graph_h = 80
+        bar_w = 2
+        graph_w = self.history.maxlen * bar_w
+        frame_budget = 1000.0 / config.FPS
+        origin_x, origin_y = 10, 10
+        px_per_ms = graph_h / (2 * frame_budget)
+
+        panel = pygame.Rect(origin_x - 5, origin_y - 5, graph_w + 10, graph_h + 10)
+        pygame.draw.rect(screen, config.UI_BG_COLOR, panel)
+        for i, timings in enumerate(self.history):
+            x = origin_x + i * bar_w
+            y = origin_y + graph_h
+            for name, ms in zip(PHASES, timings):
+                h = min(int(ms * px_per_ms), y - origin_y)
+                if h <= 0:
+                    continue
+                y -= h
+                pygame.draw.rect(screen, PHASE_COLORS[name], (x, y, bar_w, h))
+        budget_y = origin_y + graph_h - int(frame_budget * px_per_ms)
+        pygame.draw.line(
+            screen, config.WHITE, (origin_x, budget_y), (origin_x + graph_w, budget_y)
+        )
+
+        y = panel.bottom + 5
+        for name, ms in self.averages().items():
+            text = font.render(f"{name}: {ms:.2f} ms", True, PHASE_COLORS[name])
+            screen.blit(text, (origin_x, y))
+            y += font.get_linesize()
+
+    def close(self) -> None:
+        """Flushes and closes the CSV file, if any."""
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+            self._csv_writer = None
@@ -1,20 +1,41 @@
-import random
+import numpy as np
 
 from configs import config
-from game.actors.npc import NPC
+from game.actors.entity_index import EntityIndex
+from game.actors.entity_store import EntityStore
+from game.actors.npc import NPC, NPCRole
+from game.actors.roster import load_roster
 from game.games.states import GameState
-from game.maps.map_generator import generate_connected_map
+from game.maps.chunked_world import ChunkedWorld
+from game.maps.distance import distance_field
+from game.maps.layout import (
+    EXIT,
+    LOCATION_NPC,
+    OBJECT_COUNT,
+    PASSWORD_NPC,
+    PLAYER,
+    TREASURE,
+    Layout,
+    generate_layout,
+    quest_length,
+    sample_empty_cells,
+)
+from game.maps.map_pool import MapPool
 
 
 class Game:
     """Manages all game states and core logic.
 
     Attributes:
-        grid (list[list[int]]): The game map represented as a grid.
+        tiles (np.ndarray): The game map as a (height, width) uint8 array, where
+            0 is a path and 1 is a wall. In chunked world mode, the quest chunk.
+        grid (np.ndarray): A read-only view of ``tiles`` that can still be
+            indexed as ``grid[row][col]``.
         player_pos (tuple[int, int]): The player's current position.
         exit_pos (tuple[int, int]): The exit's position.
         treasure_pos (tuple[int, int]): The treasure's position.
-        npcs (list[NPC]): A list of non-player characters in the game.
+        npcs (EntityStore): The non-player characters in the game.
+        npc_index (EntityIndex): The NPCs keyed by the cell they stand on.
         password (str): The password for the treasure chest.
         knows_location (bool): Whether the player knows the treasure's location.
         knows_password (bool): Whether the player knows the treasure's password.
@@ -31,15 +52,66 @@ class Game:
         chat_display_text (str): The formatted text of the current chat history.
         objective (str): The player's current objective.
         ollama_client (OllamaClient): The client for communicating with Ollama.
+        map_pool (MapPool | None): Pre-generated layouts to reset from, if any.
+        map_size (tuple[int, int] | None): The (width, height) of generated
+            maps, or None for the configured size; applies from the next reset.
+        map_index (int | None): The pool index of the current map, if it came
+            from the pool.
+        layout (Layout | None): The layout the current episode started from.
+        rng (np.random.Generator): The game's own random generator. Every
+            random choice (maps, placement, pool sampling) draws from it, so
+            a seeded game replays exactly and games never share state.
+        world_mode (str): "fixed" or "chunked"; see config.WORLD_MODE.
+        world (ChunkedWorld | None): The unbounded world in chunked world mode.
     """
 
-    def __init__(self, llm_client) -> None:
-        """Initializes the game state."""
-        self.grid: list[list[int]] = []
+    def __init__(
+        self,
+        llm_client,
+        map_pool: MapPool | None = None,
+        seed: int | None = None,
+        map_size: tuple[int, int] | None = None,
+        world_mode: str | None = None,
+    ) -> None:
+        """Initializes the game state.
+
+        Args:
+            llm_client: The client used for NPC conversations.
+            map_pool (MapPool | None): Pre-generated layouts to sample on reset
+                instead of generating a new map. Defaults to the pool at
+                config.MAP_POOL_PATH, if set.
+            seed (int | None): Seed of the game's random generator. The first
+                episode is unseeded if None.
+            map_size (tuple[int, int] | None): The (width, height) of generated
+                maps. Defaults to config.GRID_WIDTH and config.GRID_HEIGHT.
+            world_mode (str | None): "fixed" or "chunked". Defaults to
+                config.WORLD_MODE.
+
+        Raises:
+            ValueError: If the world mode is unknown.
+        """
+        world_mode = world_mode or config.WORLD_MODE
+        if world_mode not in ("fixed", "chunked"):
+            raise ValueError(f"Unknown world mode {world_mode!r}.")
+        self.world_mode: str = world_mode
+        if map_pool is None and config.MAP_POOL_PATH:
+            map_pool = MapPool(config.MAP_POOL_PATH)
+        self.map_pool: MapPool | None = map_pool
+        self.map_size: tuple[int, int] | None = map_size
+        self.rng: np.random.Generator = np.random.default_rng(seed)
+        self.map_index: int | None = None
+        self.layout: Layout | None = None
+        self.world: ChunkedWorld | None = None
+        self._target_cells: dict[str, list[tuple[int, int]]] = {}
+        self._distance_fields: dict[str, np.ndarray] = {}
+        self._quest_length: int | None = None
+        self.tiles: np.ndarray = np.ones((0, 0), dtype=np.uint8)
         self.player_pos: tuple[int, int] = (0, 0)
         self.exit_pos: tuple[int, int] = (0, 0)
         self.treasure_pos: tuple[int, int] = (0, 0)
-        self.npcs: list[NPC] = []
+        self.npcs: EntityStore = EntityStore()
+        self.npc_index: EntityIndex = EntityIndex()
+        self._role_npcs: list[NPC | None] = [None] * len(NPCRole)
         self.password: str = ""
         self.knows_location: bool = False
         self.knows_password: bool = False
@@ -59,26 +131,57 @@ class Game:
         self.chat_scroll_offset: int = 0
         self.reset()
 
-    def _get_random_empty_cells(self, count: int) -> list[tuple[int, int]]:
-        """Gets a list of random empty cells from the grid.
+    @property
+    def grid(self) -> np.ndarray:
+        """A read-only view of the map, indexable as ``grid[row][col]``."""
+        view = self.tiles.view()
+        view.flags.writeable = False
+        return view
 
-        Args:
-            count (int): The number of empty cells to return.
+    @grid.setter
+    def grid(self, grid) -> None:
+        self.tiles = np.ascontiguousarray(grid, dtype=np.uint8)
 
-        Returns:
-            list[tuple[int, int]]: A list of (x, y) tuples for empty cells.
+    @property
+    def width(self) -> int:
+        """The map width in cells."""
+        return self.tiles.shape[1]
+
+    @property
+    def height(self) -> int:
+        """The map height in cells."""
+        return self.tiles.shape[0]
+
+    def reset(self, seed: int | None = None) -> None:
+        """Resets the game to its initial state.
+
+        Args:
+            seed (int | None): Reseeds the game's random generator first, so the
+                episode is reproducible. If None, the generator continues from
+                its current state.
         """
-        empty_cells: list[tuple[int, int]] = []
-        for r in range(config.GRID_HEIGHT):
-            for c in range(config.GRID_WIDTH):
-                if self.grid[r][c] == 0:
-                    empty_cells.append((c, r))
-        random.shuffle(empty_cells)
-        return [empty_cells.pop() for _ in range(min(count, len(empty_cells)))]
-
-    def reset(self) -> None:
-        """Resets the game to its initial state."""
-        self.grid = generate_connected_map()
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self.close()
+        if self.world_mode == "chunked":
+            self.map_index, layout = None, self._generate_world_layout()
+        elif self.map_pool is not None:
+            self.map_index, layout = self.map_pool.sample(self.rng)
+        else:
+            width, height = self.map_size or (None, None)
+            self.map_index, layout = None, generate_layout(self.rng, width, height)
+        self.layout = layout
+        self.tiles = layout.tiles
+        pos = [tuple(p) for p in layout.positions.tolist()]
+        # Distance fields are computed on first use and kept for this map.
+        self._target_cells = {
+            "location_npc": [pos[LOCATION_NPC]],
+            "password_npc": [pos[PASSWORD_NPC]],
+            "treasure": [pos[TREASURE]],
+            "exit": [pos[EXIT]],
+        }
+        self._distance_fields = {}
+        self._quest_length = None
 
         self.knows_location = False
         self.knows_password = False
@@ -87,37 +190,15 @@ class Game:
 
         self.state = GameState.PLAYING
 
-        pos = self._get_random_empty_cells(5)
-        self.player_pos = pos[0]
-        self.exit_pos = pos[1]
-        self.treasure_pos = pos[2]
-        self.password = str(random.randint(0, 9))
-
-        with open(config.NPC_LOC_PROMPT_PATH, "r", encoding="utf-8") as f:
-            loc_npc_prompt = f.read()
-
-        with open(config.NPC_PW_PROMPT_PATH, "r", encoding="utf-8") as f:
-            pw_npc_prompt = f.read()
-
-        loc_npc_bg = loc_npc_prompt.format(self.treasure_pos[0], self.treasure_pos[1])
-        pw_npc_bg = pw_npc_prompt.format(self.password)
-
-        self.npcs = [
-            NPC(
-                name="위치 정보원",
-                pos=pos[3],
-                color=config.NPC_LOC_COLOR,
-                label="L",
-                background=loc_npc_bg,
-            ),
-            NPC(
-                name="암호 전문가",
-                pos=pos[4],
-                color=config.NPC_PW_COLOR,
-                label="P",
-                background=pw_npc_bg,
-            ),
-        ]
+        self.player_pos = pos[PLAYER]
+        self.exit_pos = pos[EXIT]
+        self.treasure_pos = pos[TREASURE]
+        self.password = layout.password
+
+        self._spawn_npcs(layout)
+        self.npc_index.clear()
+        for npc in self.npcs:
+            self.npc_index.add(npc, npc.pos)
 
         self.active_npc = None
         self.input_text = ""
@@ -130,6 +211,190 @@ class Game:
         self.objective = "목표: 보물상자의 위치를 알아내기"
         self.chat_scroll_offset = 0
 
+    def _spawn_npcs(self, layout: Layout) -> None:
+        """Creates the NPCs of the roster at config.NPC_ROSTER_PATH.
+
+        NPCs with a layout position stand on it; the others are placed on
+        random free cells. Personas are not read here: each one is formatted
+        the first time its NPC's background is used.
+
+        Args:
+            layout (Layout): The layout being played.
+
+        Raises:
+            ValueError: If the map has no room for every NPC.
+        """
+        roster = load_roster(config.NPC_ROSTER_PATH)
+        prompt_args = {
+            NPCRole.LOCATION_INFORMANT: self.treasure_pos,
+            NPCRole.PASSWORD_EXPERT: (self.password,),
+        }
+        unplaced = sum(d.position is None for d in roster)
+        free_cells = []
+        if unplaced:
+            occupied = np.array(layout.tiles, copy=True)
+            occupied[layout.positions[:, 1], layout.positions[:, 0]] = 1
+            free_cells = sample_empty_cells(occupied, unplaced, self.rng)
+            if len(free_cells) < unplaced:
+                raise ValueError(f"No room on the map for {unplaced} roaming NPCs.")
+            free_cells = [tuple(p) for p in free_cells.tolist()]
+
+        self.npcs.clear()
+        self._role_npcs = [None] * len(NPCRole)
+        for definition in roster:
+            if definition.position is not None:
+                npc_pos = tuple(layout.positions[definition.position].tolist())
+            else:
+                npc_pos = free_cells.pop()
+            npc = self.npcs.add(
+                name=definition.name,
+                pos=npc_pos,
+                color=definition.color,
+                label=definition.label,
+                type_id=definition.role,
+                sprite=definition.sprite,
+                prompt=definition.prompt,
+                prompt_args=prompt_args.get(definition.role, ()),
+            )
+            if self._role_npcs[definition.role] is None:
+                self._role_npcs[definition.role] = npc
+
+    def npc_by_role(self, role: NPCRole) -> NPC | None:
+        """Returns the first NPC of the roster with a role, if any."""
+        return self._role_npcs[role]
+
+    def close(self) -> None:
+        """Closes the chunked world, removing its temporary chunk cache."""
+        if self.world is not None:
+            self.world.close()
+            self.world = None
+
+    def _generate_world_layout(self) -> Layout:
+        """Creates a new chunked world and places the quest in chunk (0, 0).
+
+        Returns:
+            Layout: The quest chunk and the positions placed on it.
+        """
+        seed = config.WORLD_SEED
+        if seed is None:
+            seed = int(self.rng.integers(0, 2**63))
+        self.world = ChunkedWorld(
+            seed,
+            config.CHUNK_SIZE,
+            load_radius=config.CHUNK_LOAD_RADIUS,
+            evict_radius=config.CHUNK_EVICT_RADIUS,
+            cache_dir=config.CHUNK_CACHE_DIR,
+            generator=config.CHUNK_GENERATOR,
+        )
+        tiles = self.world.window(0, 0, config.CHUNK_SIZE, config.CHUNK_SIZE)
+        rng = np.random.default_rng([seed, OBJECT_COUNT])
+        positions = sample_empty_cells(tiles, OBJECT_COUNT, rng)
+        self.world.update(tuple(positions[PLAYER].tolist()))
+        return Layout(tiles, positions, str(int(rng.integers(0, 10))))
+
+    def is_walkable(self, x: int, y: int) -> bool:
+        """Checks whether the player can stand on a cell, in constant time.
+
+        Args:
+            x (int): The column.
+            y (int): The row.
+
+        Returns:
+            bool: True if the cell is a path inside the map.
+        """
+        if self.world is not None:
+            return self.world.is_walkable(x, y)
+        return 0 <= x < self.width and 0 <= y < self.height and self.tiles[y, x] == 0
+
+    def tile_window(self, x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+        """Returns the tiles of a rectangle, end-exclusive.
+
+        Args:
+            x0 (int): The left column.
+            y0 (int): The top row.
+            x1 (int): The right column, exclusive.
+            y1 (int): The bottom row, exclusive.
+
+        Returns:
+            np.ndarray: The (y1 - y0, x1 - x0) uint8 tiles.
+        """
+        if self.world is not None:
+            return self.world.window(x0, y0, x1, y1)
+        return self.tiles[y0:y1, x0:x1]
+
+    def get_distance_field(self, target: str) -> np.ndarray:
+        """Returns the BFS distance field of a quest target on the current map.
+
+        The field is computed once per map, on first use.
+
+        Args:
+            target (str): One of "location_npc", "password_npc", "treasure" or
+                "exit".
+
+        Returns:
+            np.ndarray: A (height, width) int32 array of step counts to the
+                nearest target cell, -1 where unreachable.
+        """
+        field = self._distance_fields.get(target)
+        if field is None:
+            field = distance_field(self.tiles == 0, self._target_cells[target])
+            self._distance_fields[target] = field
+        return field
+
+    def distance_to(self, target: str, pos: tuple[int, int] | None = None) -> int:
+        """Returns the path distance from a cell to a quest target.
+
+        Args:
+            target (str): One of "location_npc", "password_npc", "treasure" or
+                "exit".
+            pos (tuple[int, int] | None): The (x, y) cell to measure from.
+                Defaults to the player's position.
+
+        Returns:
+            int: The number of steps, or -1 if the target cannot be reached
+                (including cells outside the quest chunk in chunked world mode).
+        """
+        x, y = pos if pos is not None else self.player_pos
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return -1
+        return int(self.get_distance_field(target)[y, x])
+
+    def quest_length(self) -> int | None:
+        """Returns the fewest moves that complete the quest from the start.
+
+        Returns:
+            int | None: The optimal number of moves, or None if unsolvable.
+        """
+        if self._quest_length is None and self.layout is not None:
+            self._quest_length = quest_length(self.layout)
+        return self._quest_length
+
+    def move_npc(self, npc: NPC, pos: tuple[int, int]) -> None:
+        """Moves an NPC and keeps the NPC index up to date.
+
+        Args:
+            npc (NPC): The NPC to move.
+            pos (tuple[int, int]): The (x, y) cell it moves to.
+        """
+        npc.pos = pos
+        self.npc_index.move(npc, pos)
+
+    def npc_at(self, pos: tuple[int, int]) -> list[NPC]:
+        """Returns the NPCs standing on a cell."""
+        return self.npc_index.at(pos)
+
+    def adjacent_npcs(self, pos: tuple[int, int] | None = None) -> list[NPC]:
+        """Returns the NPCs on or next to a cell, in constant time.
+
+        Args:
+            pos (tuple[int, int] | None): The (x, y) cell. Defaults to the
+                player's position.
+
+        Returns:
+            list[NPC]: The NPCs that pass is_adjacent for the cell.
+        """
+        return self.npc_index.adjacent(pos if pos is not None else self.player_pos)
+
     def is_adjacent(self, pos1: tuple[int, int], pos2: tuple[int, int]) -> bool:
         """Checks if two positions are adjacent (not diagonally) or overlapping.
 
@@ -162,12 +427,10 @@ class Game:
             px -= 1
         elif action == "right":
             px += 1
-        if (
-            0 <= px < config.GRID_WIDTH
-            and 0 <= py < config.GRID_HEIGHT
-            and self.grid[py][px] == 0
-        ):
+        if self.is_walkable(px, py):
             self.player_pos = (px, py)
+            if self.world is not None:
+                self.world.update(self.player_pos)
 
         # Found Treasure
         if self.knows_location and self.player_pos == self.treasure_pos:
@@ -0,0 +1,248 @@
+from collections.abc import Sequence
+from typing import NamedTuple
+
+import numpy as np
+
+from game.maps.distance import UNREACHABLE, batch_distance_fields
+
+
+class MapAnalysis(NamedTuple):
+    """Per-map statistics for a batch of maps.
+
+    Every field is a (B,) array with one entry per map.
+
+    Attributes:
+        components (np.ndarray): Number of separate walkable regions.
+        objects_reachable (np.ndarray): Whether every object can reach every
+            other object.
+        floor_cells (np.ndarray): Number of walkable cells.
+        dead_ends (np.ndarray): Walkable cells with exactly one walkable
+            neighbour.
+        corridors (np.ndarray): Walkable cells with exactly two walkable
+            neighbours.
+        junctions (np.ndarray): Walkable cells with three or more walkable
+            neighbours.
+        route_length (np.ndarray): Steps needed to walk between the objects in
+            the requested order, UNREACHABLE (-1) if a leg is impossible.
+    """
+
+    components: np.ndarray
+    objects_reachable: np.ndarray
+    floor_cells: np.ndarray
+    dead_ends: np.ndarray
+    corridors: np.ndarray
+    junctions: np.ndarray
+    route_length: np.ndarray
+
+
+def label_components_batch(floors: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Labels the 4-connected regions of walkable cells in a batch of maps.
+
+    Uses a vectorized union-find: every pass hooks the root of each edge's
+    larger end onto the smaller root, then pointer jumping flattens the trees.
+    The number of passes grows with the logarithm of the map size rather than
+    with its diameter, so it stays fast on large mazes. All maps are solved in
+    the same passes, as no edge crosses from one map to another.
+
+    Args:
+        floors (np.ndarray): A (B, H, W) boolean array, True where walkable.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: A (B, H, W) int32 array with 0 for walls
+            and 1..count for each map's regions (ordered by their first cell in
+            row-major order), and the (B,) number of regions per map.
+    """
+    floors = np.asarray(floors, dtype=bool)
+    batch, height, width = floors.shape
+    plane = height * width
+    index = np.arange(batch * plane, dtype=np.int64).reshape(batch, height, width)
+
+    horizontal = floors[:, :, :-1] & floors[:, :, 1:]
+    vertical = floors[:, :-1, :] & floors[:, 1:, :]
+    a = np.concatenate([index[:, :, :-1][horizontal], index[:, :-1, :][vertical]])
+    b = np.concatenate([index[:, :, 1:][horizontal], index[:, 1:, :][vertical]])
+
+    parent = index.ravel().copy()
+    while a.size:
+        ra = parent[a]
+        rb = parent[b]
+        changed = ra != rb
+        if not changed.any():
+            break
+        # Drop edges that are already inside one region.
+        a, b, ra, rb = a[changed], b[changed], ra[changed], rb[changed]
+        low = np.minimum(ra, rb)
+        high = np.maximum(ra, rb)
+        np.minimum.at(parent, high, low)
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+    labels = np.zeros(batch * plane, dtype=np.int32)
+    flat_floor = floors.ravel()
+    roots = parent[flat_floor]
+    # Roots are the smallest flat index of their region, so sorting them keeps
+    # maps contiguous and regions in row-major order within each map.
+    unique_roots, inverse = np.unique(roots, return_inverse=True)
+    counts = np.bincount(unique_roots // plane, minlength=batch)
+    first_label = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    root_map = unique_roots // plane
+    labels[flat_floor] = (inverse - first_label[root_map][inverse] + 1).astype(np.int32)
+    return labels.reshape(batch, height, width), counts
+
+
+def label_components(floor: np.ndarray) -> tuple[np.ndarray, int]:
+    """Labels the 4-connected regions of walkable cells.
+
+    Args:
+        floor (np.ndarray): A (H, W) boolean array, True where a cell is walkable.
+
+    Returns:
+        tuple[np.ndarray, int]: A (H, W) int32 array with 0 for walls and
+            1..count for the regions (ordered by their first cell in row-major
+            order), and the number of regions.
+    """
+    labels, counts = label_components_batch(np.asarray(floor)[None])
+    return labels[0], int(counts[0])
+
+
+def is_connected(floor: np.ndarray) -> bool:
+    """Checks whether all walkable cells form a single region.
+
+    Args:
+        floor (np.ndarray): A (H, W) boolean array, True where a cell is walkable.
+
+    Returns:
+        bool: True if there is exactly one region of walkable cells.
+    """
+    return label_components(floor)[1] == 1
+
+
+def objects_reachable(labels: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """Checks that all objects of each map stand in one walkable region.
+
+    Args:
+        labels (np.ndarray): (B, H, W) region labels from label_components_batch.
+        positions (np.ndarray): A (B, K, 2) array of (x, y) object positions.
+
+    Returns:
+        np.ndarray: A (B,) boolean array, True where every object can reach
+            every other one.
+    """
+    positions = np.asarray(positions, dtype=np.int64)
+    batch = np.arange(labels.shape[0])[:, None]
+    object_labels = labels[batch, positions[:, :, 1], positions[:, :, 0]]
+    return (object_labels[:, :1] != 0).ravel() & np.all(
+        object_labels == object_labels[:, :1], axis=1
+    )
+
+
+def neighbour_counts(floors: np.ndarray) -> np.ndarray:
+    """Counts the walkable 4-neighbours of every cell.
+
+    Args:
+        floors (np.ndarray): A (B, H, W) boolean array, True where walkable.
+
+    Returns:
+        np.ndarray: A (B, H, W) uint8 array of neighbour counts (0 on walls).
+    """
+    floors = np.asarray(floors, dtype=bool)
+    padded = np.pad(floors, ((0, 0), (1, 1), (1, 1))).view(np.uint8)
+    counts = (
+        padded[:, :-2, 1:-1]
+        + padded[:, 2:, 1:-1]
+        + padded[:, 1:-1, :-2]
+        + padded[:, 1:-1, 2:]
+    )
+    return counts * floors
+
+
+def route_lengths(
+    floors: np.ndarray, positions: np.ndarray, order: Sequence[int]
+) -> np.ndarray:
+    """Measures the walk between objects, in a given order, on every map.
+
+    Each leg is one batched breadth-first search over all maps. Legs start and
+    end on the objects' own cells, so for quests that only need adjacency this
+    is an upper bound, off by at most two steps per intermediate object.
+
+    Args:
+        floors (np.ndarray): A (B, H, W) boolean array, True where walkable.
+        positions (np.ndarray): A (B, K, 2) array of (x, y) object positions.
+        order (Sequence[int]): Indices into the K objects, visited in order.
+
+    Returns:
+        np.ndarray: A (B,) int64 array of steps, UNREACHABLE (-1) where some
+            leg cannot be walked.
+    """
+    positions = np.asarray(positions, dtype=np.int64)
+    batch = np.arange(positions.shape[0])
+    total = np.zeros(len(batch), dtype=np.int64)
+    reachable = np.ones(len(batch), dtype=bool)
+    for start, goal in zip(order[:-1], order[1:]):
+        fields = batch_distance_fields(floors, batch, positions[:, start])
+        legs = fields[batch, positions[:, goal, 1], positions[:, goal, 0]]
+        reachable &= legs != UNREACHABLE
+        total += legs
+    return np.where(reachable, total, UNREACHABLE)
+
+
+def analyze_maps(
+    tiles: np.ndarray, positions: np.ndarray, order: Sequence[int] = ()
+) -> MapAnalysis:
+    """Validates and scores a batch of maps at once.
+
+    Args:
+        tiles (np.ndarray): A (B, H, W) array, 0 for paths and 1 for walls.
+        positions (np.ndarray): A (B, K, 2) array of (x, y) object positions.
+        order (Sequence[int]): Object indices whose route length is measured.
+            The route length is 0 when fewer than two are given.
+
+    Returns:
+        MapAnalysis: The per-map statistics.
+    """
+    floors = np.asarray(tiles) == 0
+    labels, components = label_components_batch(floors)
+    neighbours = neighbour_counts(floors)
+    if len(order) > 1:
+        route = route_lengths(floors, positions, order)
+    else:
+        route = np.zeros(floors.shape[0], dtype=np.int64)
+    return MapAnalysis(
+        components=components,
+        objects_reachable=objects_reachable(labels, positions),
+        floor_cells=floors.sum(axis=(1, 2)),
+        dead_ends=(neighbours == 1).sum(axis=(1, 2)),
+        corridors=(neighbours == 2).sum(axis=(1, 2)),
+        junctions=(neighbours >= 3).sum(axis=(1, 2)),
+        route_length=route,
+    )
+
+
+def difficulty_buckets(scores: np.ndarray, bucket_count: int) -> np.ndarray:
+    """Splits maps into equally populated difficulty buckets.
+
+    Maps are ranked by score and the ranks are cut into equal runs, so bucket
+    sizes differ by at most one. Maps with equal scores are ranked in index
+    order and may land in neighbouring buckets.
+
+    Args:
+        scores (np.ndarray): A (B,) array of difficulty scores, such as
+            MapAnalysis.route_length. Negative scores mark invalid maps.
+        bucket_count (int): The number of buckets.
+
+    Returns:
+        np.ndarray: A (B,) int64 array with the bucket of each map, from 0
+            (easiest) to bucket_count - 1, and -1 for invalid maps.
+    """
+    scores = np.asarray(scores)
+    buckets = np.full(scores.shape, -1, dtype=np.int64)
+    valid = scores >= 0
+    n = int(valid.sum())
+    if n:
+        ranks = np.empty(n, dtype=np.int64)
+        ranks[np.argsort(scores[valid], kind="stable")] = np.arange(n)
+        buckets[valid] = ranks * bucket_count // n
+    return buckets
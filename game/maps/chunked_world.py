@@ -0,0 +1,196 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from game.maps.generators import generate
+
+ChunkCoord = tuple[int, int]
+
+
+def _zigzag(value: int) -> int:
+    """Maps a signed integer to a distinct non-negative one (0, -1, 1, ... -> 0, 1, 2, ...)."""
+    return 2 * value if value >= 0 else -2 * value - 1
+
+
+def generate_chunk(
+    world_seed: int, coord: ChunkCoord, chunk_size: int, generator: str = "backtracker"
+) -> np.ndarray:
+    """Generates one chunk of the world.
+
+    A chunk is a maze whose cells sit on odd local coordinates, so its left
+    column and top row are walls shared with the neighbouring chunks. The
+    chunk opens one door in each of those two walls; since every chunk links
+    itself to its left and upper neighbours, the whole world is connected
+    without any chunk having to look at another.
+
+    Args:
+        world_seed (int): The seed of the world.
+        coord (tuple[int, int]): The (cx, cy) chunk coordinate.
+        chunk_size (int): The chunk side length in cells; must be even.
+        generator (str): A maze generator name from GENERATORS.
+
+    Returns:
+        np.ndarray: The (chunk_size, chunk_size) uint8 chunk.
+    """
+    rng = np.random.default_rng([world_seed, _zigzag(coord[0]), _zigzag(coord[1])])
+    # One extra row and column of wall belongs to the next chunk; drop it.
+    chunk = generate(generator, chunk_size + 1, chunk_size + 1, seed=rng)
+    chunk = np.ascontiguousarray(chunk[:chunk_size, :chunk_size])
+    door_row, door_col = 2 * rng.integers(0, chunk_size // 2, size=2) + 1
+    chunk[door_row, 0] = 0
+    chunk[0, door_col] = 0
+    return chunk
+
+
+class ChunkedWorld:
+    """An unbounded map generated lazily, one fixed-size chunk at a time.
+
+    Chunks are generated deterministically from (world seed, chunk coordinate)
+    the first time the player comes within ``load_radius`` chunks of them and
+    are evicted once the player is more than ``evict_radius`` chunks away.
+    Evicted chunks are written bit-packed to a cache directory, so revisiting
+    them is a file read rather than a regeneration. At most
+    ``(2 * evict_radius + 1) ** 2`` chunks are held in memory.
+
+    Attributes:
+        seed (int): The world seed.
+        chunk_size (int): The chunk side length in cells.
+        load_radius (int): Chunks within this Chebyshev distance of the
+            player's chunk are loaded.
+        evict_radius (int): Chunks beyond this distance are evicted.
+        cache_dir (str): Where evicted chunks are stored.
+    """
+
+    def __init__(
+        self,
+        seed: int,
+        chunk_size: int,
+        load_radius: int = 1,
+        evict_radius: int = 2,
+        cache_dir: str | None = None,
+        generator: str = "backtracker",
+    ) -> None:
+        """Initializes the ChunkedWorld.
+
+        Args:
+            seed (int): The world seed.
+            chunk_size (int): The chunk side length in cells; must be even and
+                at least 4.
+            load_radius (int): The load radius in chunks.
+            evict_radius (int): The eviction radius in chunks; must be at least
+                load_radius.
+            cache_dir (str | None): Directory for evicted chunks. A temporary
+                directory, removed on close, is used if None.
+            generator (str): A maze generator name from GENERATORS.
+        """
+        if chunk_size < 4 or chunk_size % 2:
+            raise ValueError(f"chunk_size must be even and >= 4, got {chunk_size}.")
+        if evict_radius < load_radius:
+            raise ValueError("evict_radius must be at least load_radius.")
+        self.seed: int = seed
+        self.chunk_size: int = chunk_size
+        self.load_radius: int = load_radius
+        self.evict_radius: int = evict_radius
+        self.generator: str = generator
+        self._owns_cache: bool = cache_dir is None
+        self.cache_dir: str = cache_dir or tempfile.mkdtemp(prefix="chunks-")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._chunks: dict[ChunkCoord, np.ndarray] = {}
+        self._center: ChunkCoord | None = None
+
+    def __len__(self) -> int:
+        """Returns the number of chunks held in memory."""
+        return len(self._chunks)
+
+    def chunk_of(self, pos: tuple[int, int]) -> ChunkCoord:
+        """Returns the coordinate of the chunk containing an (x, y) cell."""
+        return pos[0] // self.chunk_size, pos[1] // self.chunk_size
+
+    def _cache_path(self, coord: ChunkCoord) -> str:
+        return os.path.join(self.cache_dir, f"{self.seed}_{coord[0]}_{coord[1]}.npy")
+
+    def _chunk(self, coord: ChunkCoord) -> np.ndarray:
+        """Returns a chunk, loading it from the cache or generating it if needed."""
+        chunk = self._chunks.get(coord)
+        if chunk is None:
+            path = self._cache_path(coord)
+            if os.path.exists(path):
+                bits = np.unpackbits(np.load(path), count=self.chunk_size**2)
+                chunk = bits.reshape(self.chunk_size, self.chunk_size)
+            else:
+                chunk = generate_chunk(self.seed, coord, self.chunk_size, self.generator)
+            self._chunks[coord] = chunk
+        return chunk
+
+    def _evict(self, coord: ChunkCoord) -> None:
+        """Writes a chunk to the cache and drops it from memory."""
+        chunk = self._chunks.pop(coord)
+        path = self._cache_path(coord)
+        if not os.path.exists(path):
+            np.save(path, np.packbits(chunk))
+
+    def update(self, pos: tuple[int, int]) -> None:
+        """Loads the chunks around a cell and evicts the far ones.
+
+        Does nothing while the cell stays in the same chunk as last time.
+
+        Args:
+            pos (tuple[int, int]): The player's (x, y) cell.
+        """
+        center = self.chunk_of(pos)
+        if center == self._center:
+            return
+        self._center = center
+        cx, cy = center
+        for coord in list(self._chunks):
+            if max(abs(coord[0] - cx), abs(coord[1] - cy)) > self.evict_radius:
+                self._evict(coord)
+        r = self.load_radius
+        for y in range(cy - r, cy + r + 1):
+            for x in range(cx - r, cx + r + 1):
+                self._chunk((x, y))
+
+    def tile(self, x: int, y: int) -> int:
+        """Returns the tile at a cell, 0 for a path and 1 for a wall."""
+        s = self.chunk_size
+        chunk = self._chunks.get((x // s, y // s))
+        if chunk is None:
+            chunk = self._chunk((x // s, y // s))
+        return int(chunk[y % s, x % s])
+
+    def is_walkable(self, x: int, y: int) -> bool:
+        """Checks whether a cell is a path, in constant time."""
+        return self.tile(x, y) == 0
+
+    def window(self, x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+        """Assembles a rectangle of the world from its chunks.
+
+        Args:
+            x0 (int): The left column.
+            y0 (int): The top row.
+            x1 (int): The right column, exclusive.
+            y1 (int): The bottom row, exclusive.
+
+        Returns:
+            np.ndarray: The (y1 - y0, x1 - x0) uint8 tiles.
+        """
+        s = self.chunk_size
+        out = np.empty((y1 - y0, x1 - x0), dtype=np.uint8)
+        for cy in range(y0 // s, (y1 - 1) // s + 1):
+            for cx in range(x0 // s, (x1 - 1) // s + 1):
+                chunk = self._chunk((cx, cy))
+                gx0, gy0 = max(x0, cx * s), max(y0, cy * s)
+                gx1, gy1 = min(x1, (cx + 1) * s), min(y1, (cy + 1) * s)
+                out[gy0 - y0 : gy1 - y0, gx0 - x0 : gx1 - x0] = chunk[
+                    gy0 - cy * s : gy1 - cy * s, gx0 - cx * s : gx1 - cx * s
+                ]
+        return out
+
+    def close(self) -> None:
+        """Drops all chunks and removes the cache directory if it was temporary."""
+        self._chunks.clear()
+        self._center = None
+        if self._owns_cache:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
@@ -0,0 +1,199 @@
+from collections.abc import Sequence
+
+import numpy as np
+
+UNREACHABLE: int = -1
+
+
+def distance_field(
+    floor: np.ndarray, sources: Sequence[tuple[int, int]] | np.ndarray
+) -> np.ndarray:
+    """Computes shortest path distances from the nearest of several sources.
+
+    A breadth-first search that expands the whole frontier at once with NumPy
+    indexing, one vectorized step per distance level.
+
+    Args:
+        floor (np.ndarray): A (H, W) boolean array, True where a cell is walkable.
+        sources (Sequence[tuple[int, int]] | np.ndarray): (x, y) cells to measure
+            from. Sources on walls are ignored.
+
+    Returns:
+        np.ndarray: A (H, W) int32 array of step counts, UNREACHABLE (-1) for
+            walls and cells that cannot be reached.
+    """
+    sources = np.asarray(sources, dtype=np.int64).reshape(-1, 2)
+    map_ids = np.zeros(len(sources), dtype=np.int64)
+    return batch_distance_fields(np.asarray(floor)[None], map_ids, sources)[0]
+
+
+def batch_distance_fields(
+    floors: np.ndarray, map_ids: np.ndarray, sources: np.ndarray
+) -> np.ndarray:
+    """Computes distance fields for a batch of maps in one breadth-first search.
+
+    The maps are laid out side by side in one flat array, each padded with
+    walls, so a single frontier expansion advances every map at once.
+
+    Args:
+        floors (np.ndarray): A (B, H, W) boolean array, True where walkable.
+        map_ids (np.ndarray): A (S,) array giving the map of each source.
+        sources (np.ndarray): A (S, 2) array of (x, y) source cells. Sources
+            on walls are ignored.
+
+    Returns:
+        np.ndarray: A (B, H, W) int32 array of step counts from the nearest
+            source in the same map, UNREACHABLE (-1) where unreachable.
+    """
+    batch, height, width = floors.shape
+    # Pad with walls so neighbour lookups never leave a map.
+    stride = width + 2
+    plane = (height + 2) * stride
+    walkable = np.zeros(batch * plane, dtype=bool)
+    walkable.reshape(batch, height + 2, stride)[:, 1:-1, 1:-1] = floors
+    dist = np.full(walkable.size, UNREACHABLE, dtype=np.int32)
+    offsets = np.array([-stride, stride, -1, 1], dtype=np.int64)
+
+    sources = np.asarray(sources, dtype=np.int64).reshape(-1, 2)
+    map_ids = np.asarray(map_ids, dtype=np.int64)
+    frontier = np.unique(
+        map_ids * plane + (sources[:, 1] + 1) * stride + sources[:, 0] + 1
+    )
+    frontier = frontier[walkable[frontier]]
+    level = 0
+    while frontier.size:
+        dist[frontier] = level
+        walkable[frontier] = False  # Mark visited
+        neighbours = (frontier[:, None] + offsets).ravel()
+        frontier = np.unique(neighbours[walkable[neighbours]])
+        level += 1
+
+    return dist.reshape(batch, height + 2, stride)[:, 1:-1, 1:-1].copy()
+
+
+def _adjacent_cells(floor: np.ndarray, pos: tuple[int, int]) -> list[tuple[int, int]]:
+    """Returns the walkable cells from which pos counts as adjacent."""
+    height, width = floor.shape
+    x, y = pos
+    cells = []
+    for dx, dy in ((0, 0), (0, -1), (0, 1), (-1, 0), (1, 0)):
+        cx, cy = x + dx, y + dy
+        if 0 <= cx < width and 0 <= cy < height and floor[cy, cx]:
+            cells.append((cx, cy))
+    return cells
+
+
+def path_length_via(
+    floor: np.ndarray,
+    start: tuple[int, int],
+    waypoints: Sequence[tuple[int, int]],
+    goal: tuple[int, int],
+) -> int | None:
+    """Computes the fewest moves to visit waypoints in order and end on a goal.
+
+    A waypoint counts as visited when the walker stands on it or next to it, as
+    interactions only need adjacency. Every leg may therefore end on any of up
+    to five cells, and the best end cell of each leg is chosen by dynamic
+    programming over those candidates.
+
+    Args:
+        floor (np.ndarray): A (H, W) boolean array, True where a cell is walkable.
+        start (tuple[int, int]): The (x, y) start cell.
+        waypoints (Sequence[tuple[int, int]]): (x, y) cells to visit in order.
+        goal (tuple[int, int]): The (x, y) cell to end on.
+
+    Returns:
+        int | None: The number of moves, or None if the route is impossible.
+    """
+    costs: dict[tuple[int, int], int] = {tuple(start): 0}
+    legs = [_adjacent_cells(floor, tuple(waypoint)) for waypoint in waypoints]
+    legs.append([tuple(goal)])
+
+    for candidates in legs:
+        next_costs: dict[tuple[int, int], int] = {}
+        for cell, cost in costs.items():
+            field = distance_field(floor, [cell])
+            for x, y in candidates:
+                d = int(field[y, x])
+                if d != UNREACHABLE and cost + d < next_costs.get((x, y), 1 << 62):
+                    next_costs[(x, y)] = cost + d
+        if not next_costs:
+            return None
+        costs = next_costs
+    return min(costs.values())
+
+
+def batch_path_lengths_via(
+    floors: np.ndarray, starts: np.ndarray, waypoints: np.ndarray, goals: np.ndarray
+) -> np.ndarray:
+    """Computes path_length_via for a batch of maps at once.
+
+    Distances are symmetric, so instead of searching from every end cell of
+    the previous leg, one batched search runs from each candidate cell of
+    each leg (at most five per waypoint, reused for repeated waypoints), and
+    the dynamic programming step is a min over arrays.
+
+    Args:
+        floors (np.ndarray): A (B, H, W) boolean array, True where walkable.
+        starts (np.ndarray): A (B, 2) array of (x, y) start cells.
+        waypoints (np.ndarray): A (B, K, 2) array of (x, y) cells to visit in
+            order.
+        goals (np.ndarray): A (B, 2) array of (x, y) cells to end on.
+
+    Returns:
+        np.ndarray: A (B,) int64 array of move counts, UNREACHABLE (-1) where
+            the route is impossible.
+    """
+    batch, height, width = floors.shape
+    rows = np.arange(batch)[:, None]
+    infinite = np.int64(1) << 40
+    deltas = np.array([(0, 0), (0, -1), (0, 1), (-1, 0), (1, 0)], dtype=np.int64)
+    waypoints = np.asarray(waypoints, dtype=np.int64)
+    legs = [waypoints[:, k, None, :] + deltas for k in range(waypoints.shape[1])]
+    legs.append(np.asarray(goals, dtype=np.int64)[:, None, :])
+
+    cells = np.asarray(starts, dtype=np.int64)[:, None, :]
+    costs = np.zeros((batch, 1), dtype=np.int64)
+    fields_by_leg: dict[bytes, list[np.ndarray]] = {}
+    for candidates in legs:
+        # Candidates off the map land in the walls batch_distance_fields pads
+        # every map with, so their fields are all UNREACHABLE.
+        key = candidates.tobytes()
+        if key not in fields_by_leg:
+            fields_by_leg[key] = [
+                batch_distance_fields(floors, rows[:, 0], candidates[:, c])
+                for c in range(candidates.shape[1])
+            ]
+        x = np.clip(cells[..., 0], 0, width - 1)
+        y = np.clip(cells[..., 1], 0, height - 1)
+        next_costs = np.empty((batch, candidates.shape[1]), dtype=np.int64)
+        for c, field in enumerate(fields_by_leg[key]):
+            d = field[rows, y, x].astype(np.int64)
+            d[d == UNREACHABLE] = infinite
+            next_costs[:, c] = (costs + d).min(axis=1)
+        cells, costs = candidates, np.minimum(next_costs, infinite)
+    lengths = costs.min(axis=1)
+    return np.where(lengths >= infinite, UNREACHABLE, lengths)
+
+
+def min_pairwise_distance(floor: np.ndarray, positions: np.ndarray) -> int:
+    """Returns the shortest path distance between the closest two positions.
+
+    Args:
+        floor (np.ndarray): A (H, W) boolean array, True where a cell is walkable.
+        positions (np.ndarray): A (K, 2) array of (x, y) positions.
+
+    Returns:
+        int: The smallest pairwise distance, or UNREACHABLE if two positions
+            are not connected.
+    """
+    positions = np.asarray(positions)
+    best = None
+    for i in range(len(positions) - 1):
+        field = distance_field(floor, positions[i : i + 1])
+        d = field[positions[i + 1 :, 1], positions[i + 1 :, 0]]
+        if np.any(d == UNREACHABLE):
+            return UNREACHABLE
+        smallest = int(d.min())
+        best = smallest if best is None else min(best, smallest)
+    return 0 if best is None else best
@@ -0,0 +1,405 @@
+"""Bounded-time map generators.
+
+Every generator takes the map size and an explicit seed and returns a (H, W)
+uint8 array where 0 is a path and 1 is a wall. The outer border is always
+wall and all path cells are guaranteed to be connected.
+"""
+
+from collections.abc import Callable
+
+import numpy as np
+
+from game.maps.analysis import label_components
+
+Seed = int | np.random.Generator | None
+
+# (dx, dy) steps between maze cells, which sit on odd coordinates.
+_DIRECTIONS = np.array([(0, -1), (0, 1), (-1, 0), (1, 0)], dtype=np.int64)
+# All 24 orders in which the four directions can be tried.
+_DIRECTION_ORDERS = np.array(
+    [
+        (a, b, c, d)
+        for a in range(4)
+        for b in range(4)
+        for c in range(4)
+        for d in range(4)
+        if len({a, b, c, d}) == 4
+    ],
+    dtype=np.int64,
+)
+
+
+def _maze_cells(width: int, height: int) -> tuple[int, int]:
+    """Returns the number of maze cells per row and column.
+
+    Maze cells sit on odd coordinates, with walls between them.
+    """
+    if width < 3 or height < 3:
+        raise ValueError(f"Map must be at least 3x3, got {width}x{height}.")
+    return (width - 1) // 2, (height - 1) // 2
+
+
+def _carve_maze(
+    width: int, height: int, cols: int, rows: int, edges: np.ndarray
+) -> np.ndarray:
+    """Builds the grid for a maze given as a list of connected cell pairs.
+
+    Args:
+        width (int): Map width.
+        height (int): Map height.
+        cols (int): Maze cells per row.
+        rows (int): Maze cells per column.
+        edges (np.ndarray): A (E, 2) array of connected cell indices.
+
+    Returns:
+        np.ndarray: The (H, W) uint8 grid.
+    """
+    grid = np.ones((height, width), dtype=np.uint8)
+    grid[1 : 2 * rows : 2, 1 : 2 * cols : 2] = 0  # Every maze cell is a path.
+    if edges.size:
+        a, b = edges[:, 0], edges[:, 1]
+        # The wall between two neighbouring cells sits at their midpoint.
+        wall_x = (2 * (a % cols) + 1 + 2 * (b % cols) + 1) // 2
+        wall_y = (2 * (a // cols) + 1 + 2 * (b // cols) + 1) // 2
+        grid[wall_y, wall_x] = 0
+    return grid
+
+
+def recursive_backtracker(width: int, height: int, seed: Seed = None) -> np.ndarray:
+    """Generates a perfect maze with an iterative depth-first search.
+
+    Produces long, winding corridors. Runs in O(W * H).
+
+    Args:
+        width (int): Map width.
+        height (int): Map height.
+        seed (int | np.random.Generator | None): Seed or generator to use.
+
+    Returns:
+        np.ndarray: The (H, W) uint8 grid.
+    """
+    rng = np.random.default_rng(seed)
+    cols, rows = _maze_cells(width, height)
+    count = cols * rows
+    # Every cell tries its neighbours in its own random order.
+    orders = _DIRECTION_ORDERS[rng.integers(0, 24, size=count)].tolist()
+    dxs = _DIRECTIONS[:, 0].tolist()
+    dys = _DIRECTIONS[:, 1].tolist()
+
+    visited = bytearray(count)
+    start = int(rng.integers(0, count))
+    visited[start] = 1
+    stack = [(start, 0)]
+    edges: list[tuple[int, int]] = []
+    while stack:
+        cell, tried = stack[-1]
+        x, y = cell % cols, cell // cols
+        order = orders[cell]
+        while tried < 4:
+            d = order[tried]
+            tried += 1
+            nx, ny = x + dxs[d], y + dys[d]
+            if 0 <= nx < cols and 0 <= ny < rows:
+                neighbour = ny * cols + nx
+                if not visited[neighbour]:
+                    visited[neighbour] = 1
+                    edges.append((cell, neighbour))
+                    stack[-1] = (cell, tried)
+                    stack.append((neighbour, 0))
+                    break
+        else:
+            stack.pop()
+
+    return _carve_maze(
+        width, height, cols, rows, np.array(edges, dtype=np.int64).reshape(-1, 2)
+    )
+
+
+def randomized_prim(width: int, height: int, seed: Seed = None) -> np.ndarray:
+    """Generates a perfect maze with randomized Prim's algorithm.
+
+    Grows the maze from a random cell, attaching a random frontier cell each
+    step. Produces many short dead ends. Runs in O(W * H).
+
+    Args:
+        width (int): Map width.
+        height (int): Map height.
+        seed (int | np.random.Generator | None): Seed or generator to use.
+
+    Returns:
+        np.ndarray: The (H, W) uint8 grid.
+    """
+    rng = np.random.default_rng(seed)
+    cols, rows = _maze_cells(width, height)
+    count = cols * rows
+    dxs = _DIRECTIONS[:, 0].tolist()
+    dys = _DIRECTIONS[:, 1].tolist()
+    # One random number per pick of a frontier cell and one per link choice.
+    picks = rng.random(count).tolist()
+    links = rng.integers(0, 24, size=count).tolist()
+    orders = _DIRECTION_ORDERS.tolist()
+
+    # 0: unvisited, 1: in the frontier, 2: part of the maze.
+    state = bytearray(count)
+    frontier: list[int] = []
+    edges: list[tuple[int, int]] = []
+
+    def add(cell: int) -> None:
+        state[cell] = 2
+        x, y = cell % cols, cell // cols
+        for d in range(4):
+            nx, ny = x + dxs[d], y + dys[d]
+            if 0 <= nx < cols and 0 <= ny < rows:
+                neighbour = ny * cols + nx
+                if state[neighbour] == 0:
+                    state[neighbour] = 1
+                    frontier.append(neighbour)
+
+    add(int(rng.integers(0, count)))
+    step = 0
+    while frontier:
+        i = int(picks[step] * len(frontier))
+        cell = frontier[i]
+        frontier[i] = frontier[-1]
+        frontier.pop()
+
+        x, y = cell % cols, cell // cols
+        for d in orders[links[step]]:
+            nx, ny = x + dxs[d], y + dys[d]
+            if 0 <= nx < cols and 0 <= ny < rows and state[ny * cols + nx] == 2:
+                edges.append((ny * cols + nx, cell))
+                break
+        add(cell)
+        step += 1
+
+    return _carve_maze(
+        width, height, cols, rows, np.array(edges, dtype=np.int64).reshape(-1, 2)
+    )
+
+
+def randomized_kruskal(width: int, height: int, seed: Seed = None) -> np.ndarray:
+    """Generates a perfect maze with randomized Kruskal's algorithm.
+
+    Walls between cells are removed in random order whenever they separate two
+    different regions, tracked with a union-find. Runs in O(W * H * α).
+
+    Args:
+        width (int): Map width.
+        height (int): Map height.
+        seed (int | np.random.Generator | None): Seed or generator to use.
+
+    Returns:
+        np.ndarray: The (H, W) uint8 grid.
+    """
+    rng = np.random.default_rng(seed)
+    cols, rows = _maze_cells(width, height)
+    index = np.arange(cols * rows, dtype=np.int64).reshape(rows, cols)
+    candidates = np.concatenate(
+        [
+            np.stack([index[:, :-1].ravel(), index[:, 1:].ravel()], axis=1),
+            np.stack([index[:-1, :].ravel(), index[1:, :].ravel()], axis=1),
+        ]
+    )
+    candidates = candidates[rng.permutation(len(candidates))]
+
+    parent = list(range(cols * rows))
+
+    def find(cell: int) -> int:
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]]  # Path halving
+            cell = parent[cell]
+        return cell
+
+    keep = bytearray(len(candidates))
+    remaining = cols * rows - 1
+    for i, (a, b) in enumerate(candidates.tolist()):
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[ra] = rb
+            keep[i] = 1
+            remaining -= 1
+            if remaining == 0:
+                break
+
+    edges = candidates[np.frombuffer(bytes(keep), dtype=np.uint8).astype(bool)]
+    return _carve_maze(width, height, cols, rows, edges)
+
+
+def cellular_automata_cave(
+    width: int,
+    height: int,
+    seed: Seed = None,
+    fill_probability: float = 0.45,
+    iterations: int = 4,
+    min_region_size: int = 8,
+) -> np.ndarray:
+    """Generates an organic cave with a cellular automaton, then repairs connectivity.
+
+    Cells start as walls with ``fill_probability`` and are smoothed with the
+    4-5 rule (a cell becomes a wall if five or more of its 3x3 block are
+    walls). Regions smaller than ``min_region_size`` are filled in and every
+    other region is joined to the largest one with an L-shaped tunnel.
+
+    Args:
+        width (int): Map width.
+        height (int): Map height.
+        seed (int | np.random.Generator | None): Seed or generator to use.
+        fill_probability (float): Initial chance for a cell to be a wall.
+        iterations (int): Number of smoothing passes.
+        min_region_size (int): Regions smaller than this are filled in.
+
+    Returns:
+        np.ndarray: The (H, W) uint8 grid.
+    """
+    if width < 3 or height < 3:
+        raise ValueError(f"Map must be at least 3x3, got {width}x{height}.")
+    rng = np.random.default_rng(seed)
+    walls = rng.random((height, width)) < fill_probability
+    walls[0, :] = walls[-1, :] = walls[:, 0] = walls[:, -1] = True
+
+    for _ in range(iterations):
+        padded = np.pad(walls, 1, constant_values=True).astype(np.uint8)
+        block = sum(
+            padded[dy : dy + height, dx : dx + width]
+            for dy in range(3)
+            for dx in range(3)
+        )
+        walls = block >= 5
+        walls[0, :] = walls[-1, :] = walls[:, 0] = walls[:, -1] = True
+
+    grid = walls.astype(np.uint8)
+    _repair_connectivity(grid, rng, min_region_size)
+    return grid
+
+
+def _repair_connectivity(
+    grid: np.ndarray, rng: np.random.Generator, min_region_size: int
+) -> None:
+    """Makes all path cells of a grid connected, in place.
+
+    Small regions are filled in, the others are tunnelled to the largest
+    region. An empty map gets its center cell carved out.
+    """
+    height, width = grid.shape
+    labels, count = label_components(grid == 0)
+    if count == 0:
+        grid[height // 2, width // 2] = 0
+        return
+    if count == 1:
+        return
+
+    sizes = np.bincount(labels.ravel(), minlength=count + 1)
+    sizes[0] = 0
+    main = int(np.argmax(sizes))
+    small = sizes < min_region_size
+    small[main] = False
+    grid[small[labels] & (labels > 0)] = 1
+
+    others = [
+        label for label in range(1, count + 1) if label != main and not small[label]
+    ]
+    if not others:
+        return
+
+    # One representative cell per region to be joined.
+    flat = labels.ravel()
+    _, first_index = np.unique(flat, return_index=True)
+    reps = first_index[others]
+    rep_y, rep_x = reps // width, reps % width
+
+    # Aim every tunnel at the nearest of a sample of cells in the main region.
+    main_cells = np.flatnonzero(flat == main)
+    if main_cells.size > 4096:
+        main_cells = rng.choice(main_cells, size=4096, replace=False)
+    main_y, main_x = main_cells // width, main_cells % width
+    for start in range(0, len(reps), 256):
+        ry = rep_y[start : start + 256, None]
+        rx = rep_x[start : start + 256, None]
+        nearest = np.argmin(np.abs(ry - main_y) + np.abs(rx - main_x), axis=1)
+        for y0, x0, target in zip(ry[:, 0], rx[:, 0], nearest):
+            y1, x1 = main_y[target], main_x[target]
+            grid[y0, min(x0, x1) : max(x0, x1) + 1] = 0
+            grid[min(y0, y1) : max(y0, y1) + 1, x1] = 0
+
+
+def drunkards_walk(
+    width: int, height: int, seed: Seed = None, wall_density: float = 0.0
+) -> np.ndarray:
+    """Carves a connected map with a random walk (the original algorithm).
+
+    The walk stops once ``1 - wall_density`` of the interior is carved or
+    after a fixed step budget, whichever comes first, so the runtime is bounded
+    even when the last few cells are hard to reach. A wall density of zero
+    carves the whole interior directly, which is what the walk converges to.
+
+    Args:
+        width (int): Map width.
+        height (int): Map height.
+        seed (int | np.random.Generator | None): Seed or generator to use.
+        wall_density (float): Fraction of the interior left as walls.
+
+    Returns:
+        np.ndarray: The (H, W) uint8 grid.
+    """
+    if width < 3 or height < 3:
+        raise ValueError(f"Map must be at least 3x3, got {width}x{height}.")
+    rng = np.random.default_rng(seed)
+    grid = np.ones((height, width), dtype=np.uint8)
+    total_internal_cells = (width - 2) * (height - 2)
+    target_floor_count = int(total_internal_cells * (1 - wall_density))
+    if target_floor_count >= total_internal_cells:
+        grid[1:-1, 1:-1] = 0
+        return grid
+
+    cx = int(rng.integers(1, width - 1))
+    cy = int(rng.integers(1, height - 1))
+    grid[cy, cx] = 0
+    floor_count = 1
+    max_steps = 64 * total_internal_cells
+    batch = 4096
+    steps = 0
+    dxs = _DIRECTIONS[:, 0].tolist()
+    dys = _DIRECTIONS[:, 1].tolist()
+    while floor_count < target_floor_count and steps < max_steps:
+        for d in rng.integers(0, 4, size=batch).tolist():
+            nx, ny = cx + dxs[d], cy + dys[d]
+            if 1 <= nx < width - 1 and 1 <= ny < height - 1:
+                cx, cy = nx, ny
+                if grid[cy, cx] == 1:
+                    grid[cy, cx] = 0
+                    floor_count += 1
+                    if floor_count >= target_floor_count:
+                        break
+        steps += batch
+    return grid
+
+
+GENERATORS: dict[str, Callable[..., np.ndarray]] = {
+    "drunkard": drunkards_walk,
+    "backtracker": recursive_backtracker,
+    "prim": randomized_prim,
+    "kruskal": randomized_kruskal,
+    "cave": cellular_automata_cave,
+}
+
+
+def generate(name: str, width: int, height: int, seed: Seed = None, **kwargs) -> np.ndarray:
+    """Generates a map with the named generator.
+
+    Args:
+        name (str): One of the keys of GENERATORS.
+        width (int): Map width.
+        height (int): Map height.
+        seed (int | np.random.Generator | None): Seed or generator to use.
+        **kwargs: Extra options passed to the generator.
+
+    Returns:
+        np.ndarray: The (H, W) uint8 grid.
+    """
+    try:
+        generator = GENERATORS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown map generator '{name}'. Choose from: {', '.join(GENERATORS)}"
+        ) from None
+    return generator(width, height, seed, **kwargs)
@@ -0,0 +1,136 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from configs import config
+from game.maps.distance import (
+    batch_path_lengths_via,
+    min_pairwise_distance,
+    path_length_via,
+)
+from game.maps.generators import Seed
+from game.maps.map_generator import generate_connected_map
+
+# Order of the rows in Layout.positions.
+PLAYER, EXIT, TREASURE, LOCATION_NPC, PASSWORD_NPC = range(5)
+OBJECT_COUNT: int = 5
+
+# Objects the player has to stand next to, in quest order, before the exit.
+QUEST_WAYPOINTS: tuple[int, ...] = (LOCATION_NPC, TREASURE, PASSWORD_NPC, TREASURE)
+# The whole quest route, from the player's start to the exit.
+QUEST_ROUTE: tuple[int, ...] = (PLAYER, *QUEST_WAYPOINTS, EXIT)
+
+# Placement attempts per map, and maps per layout, when MIN_OBJECT_SPREAD
+# cannot be met.
+_PLACEMENT_ATTEMPTS: int = 16
+_MAP_ATTEMPTS: int = 64
+
+
+class Layout(NamedTuple):
+    """A generated map together with everything placed on it.
+
+    Attributes:
+        tiles (np.ndarray): The (H, W) uint8 map, 0 for paths and 1 for walls.
+        positions (np.ndarray): An (OBJECT_COUNT, 2) array of (x, y) positions,
+            indexed by PLAYER, EXIT, TREASURE, LOCATION_NPC and PASSWORD_NPC.
+        password (str): The treasure chest password.
+    """
+
+    tiles: np.ndarray
+    positions: np.ndarray
+    password: str
+
+
+def sample_empty_cells(
+    tiles: np.ndarray, count: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Picks distinct random empty cells.
+
+    Args:
+        tiles (np.ndarray): The (H, W) map.
+        count (int): The number of cells to pick.
+        rng (np.random.Generator): The random generator to use.
+
+    Returns:
+        np.ndarray: A (min(count, empty cells), 2) int64 array of (x, y) positions.
+    """
+    empty_cells = np.flatnonzero(tiles.ravel() == 0)
+    picks = rng.choice(empty_cells, size=min(count, empty_cells.size), replace=False)
+    rows, cols = np.divmod(picks, tiles.shape[1])
+    return np.stack([cols, rows], axis=1)
+
+
+def generate_layout(
+    seed: Seed = None, width: int | None = None, height: int | None = None
+) -> Layout:
+    """Generates a new map and places the player, the objects and the NPCs.
+
+    If config.MIN_OBJECT_SPREAD is positive, objects are re-placed (and, if
+    that keeps failing, the map regenerated) until every pair of them is at
+    least that many steps apart. The same seed always produces the same layout.
+
+    Args:
+        seed (int | np.random.Generator | None): Seed or generator to use.
+        width (int | None): The map width; defaults to config.GRID_WIDTH.
+        height (int | None): The map height; defaults to config.GRID_HEIGHT.
+
+    Returns:
+        Layout: The generated layout.
+
+    Raises:
+        ValueError: If MIN_OBJECT_SPREAD cannot be met on the generated maps.
+    """
+    rng = np.random.default_rng(seed)
+    for _ in range(_MAP_ATTEMPTS):
+        tiles = generate_connected_map(rng, width, height)
+        for _ in range(_PLACEMENT_ATTEMPTS):
+            positions = sample_empty_cells(tiles, OBJECT_COUNT, rng)
+            if config.MIN_OBJECT_SPREAD <= 0 or (
+                min_pairwise_distance(tiles == 0, positions) >= config.MIN_OBJECT_SPREAD
+            ):
+                password = str(int(rng.integers(0, 10)))
+                return Layout(tiles, positions, password)
+    raise ValueError(
+        f"Could not place objects at least {config.MIN_OBJECT_SPREAD} steps apart "
+        f"after {_MAP_ATTEMPTS} maps; lower MIN_OBJECT_SPREAD."
+    )
+
+
+def quest_length(layout: Layout) -> int | None:
+    """Returns the fewest moves that complete the quest on a layout.
+
+    This is the solvability and difficulty score of a layout: None means the
+    quest cannot be finished, larger numbers mean a longer optimal route.
+
+    Args:
+        layout (Layout): The layout to score.
+
+    Returns:
+        int | None: The optimal number of moves, or None if unsolvable.
+    """
+    positions = layout.positions.tolist()
+    return path_length_via(
+        layout.tiles == 0,
+        positions[PLAYER],
+        [positions[i] for i in QUEST_WAYPOINTS],
+        positions[EXIT],
+    )
+
+
+def batch_quest_lengths(tiles: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """Computes quest_length for many layouts at once.
+
+    Args:
+        tiles (np.ndarray): The (N, H, W) maps.
+        positions (np.ndarray): The (N, OBJECT_COUNT, 2) object positions.
+
+    Returns:
+        np.ndarray: An (N,) int64 array of optimal move counts, -1 for
+            unsolvable layouts.
+    """
+    return batch_path_lengths_via(
+        tiles == 0,
+        positions[:, PLAYER],
+        positions[:, list(QUEST_WAYPOINTS)],
+        positions[:, EXIT],
+    )
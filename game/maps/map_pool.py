@@ -0,0 +1,255 @@
+import json
+import os
+from multiprocessing import Pool
+
+import numpy as np
+
+from configs import config
+from game.maps.analysis import analyze_maps, is_connected
+from game.maps.layout import OBJECT_COUNT, QUEST_ROUTE, Layout, generate_layout
+
+# Files that make up a pool directory. Each array is a plain .npy file so it
+# can be memory-mapped; the first axis indexes the maps.
+_TILES_FILE = "tiles.npy"
+_POSITIONS_FILE = "positions.npy"
+_PASSWORDS_FILE = "passwords.npy"
+_SEEDS_FILE = "seeds.npy"
+_DIFFICULTY_FILE = "difficulty.npy"
+_META_FILE = "meta.json"
+
+# Layouts analyzed per batch when scoring a pool.
+_ANALYSIS_BATCH = 4096
+# Seeds tried per pool entry before giving up on the map settings.
+_SEED_ATTEMPTS = 64
+
+
+def validate_layout(layout: Layout) -> bool:
+    """Checks that a layout is playable.
+
+    A layout is valid if its paths are connected and every object sits on its
+    own path cell.
+
+    Args:
+        layout (Layout): The layout to check.
+
+    Returns:
+        bool: True if the layout is valid.
+    """
+    tiles, positions = layout.tiles, layout.positions
+    if positions.shape != (OBJECT_COUNT, 2):
+        return False
+    if np.unique(positions, axis=0).shape[0] != OBJECT_COUNT:
+        return False
+    if np.any(tiles[positions[:, 1], positions[:, 0]] != 0):
+        return False
+    return is_connected(tiles == 0)
+
+
+def _init_worker(settings: dict) -> None:
+    """Applies the parent's map settings in a pool worker process."""
+    for name, value in settings.items():
+        setattr(config, name, value)
+
+
+def _generate_valid(seed: int) -> tuple[int, Layout]:
+    """Generates the layout of a seed, moving to derived seeds until one is valid.
+
+    Raises:
+        ValueError: If no valid layout is found within _SEED_ATTEMPTS seeds.
+    """
+    seed_sequence = np.random.SeedSequence(seed)
+    candidate = seed
+    for _ in range(_SEED_ATTEMPTS):
+        layout = generate_layout(candidate)
+        if validate_layout(layout):
+            return candidate, layout
+        candidate = int(seed_sequence.spawn(1)[0].generate_state(1, np.uint64)[0])
+    raise ValueError(
+        f"No valid layout after {_SEED_ATTEMPTS} seeds derived from {seed}; check "
+        "the map settings (MAP_GENERATOR, WALL_DENSITY, grid size)."
+    )
+
+
+def score_layouts(tiles: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """Scores the difficulty of many layouts at once.
+
+    The score is the length of the quest route walked object to object (see
+    analysis.route_lengths), computed in batches.
+
+    Args:
+        tiles (np.ndarray): The (N, H, W) maps.
+        positions (np.ndarray): The (N, OBJECT_COUNT, 2) object positions.
+
+    Returns:
+        np.ndarray: An (N,) int32 array of scores, -1 for unsolvable layouts.
+    """
+    scores = np.empty(len(tiles), dtype=np.int32)
+    for start in range(0, len(tiles), _ANALYSIS_BATCH):
+        stop = start + _ANALYSIS_BATCH
+        analysis = analyze_maps(tiles[start:stop], positions[start:stop], QUEST_ROUTE)
+        scores[start:stop] = np.where(
+            analysis.objects_reachable, analysis.route_length, -1
+        )
+    return scores
+
+
+def build_map_pool(
+    path: str,
+    count: int,
+    seed: int = 0,
+    workers: int = 1,
+) -> None:
+    """Pre-generates validated layouts into a memory-mappable pool directory.
+
+    Maps are generated with the current config (GRID_WIDTH, GRID_HEIGHT,
+    MAP_GENERATOR, WALL_DENSITY) and written straight to disk, so pools larger
+    than memory can be built. Every layout is then scored with score_layouts
+    so curricula can filter the pool by difficulty.
+
+    Args:
+        path (str): The directory to write the pool to.
+        count (int): The number of layouts to generate.
+        seed (int): Base seed; layout seeds are derived from it.
+        workers (int): Number of processes used for generation.
+
+    Raises:
+        ValueError: If the map settings rarely or never give a valid layout.
+    """
+    os.makedirs(path, exist_ok=True)
+    height, width = config.GRID_HEIGHT, config.GRID_WIDTH
+    seeds = np.random.SeedSequence(seed).generate_state(count, np.uint64)
+
+    tiles_out = np.lib.format.open_memmap(
+        os.path.join(path, _TILES_FILE), mode="w+", dtype=np.uint8,
+        shape=(count, height, width),
+    )
+    positions_out = np.lib.format.open_memmap(
+        os.path.join(path, _POSITIONS_FILE), mode="w+", dtype=np.int32,
+        shape=(count, OBJECT_COUNT, 2),
+    )
+    passwords_out = np.empty(count, dtype="<U8")
+    seeds_out = np.empty(count, dtype=np.uint64)
+
+    seed_list = [int(s) for s in seeds]
+    if workers > 1:
+        settings = {
+            name: getattr(config, name)
+            for name in ("GRID_WIDTH", "GRID_HEIGHT", "MAP_GENERATOR", "WALL_DENSITY")
+        }
+        with Pool(workers, initializer=_init_worker, initargs=(settings,)) as pool:
+            results = pool.imap(_generate_valid, seed_list, chunksize=256)
+            for i, (used_seed, layout) in enumerate(results):
+                tiles_out[i] = layout.tiles
+                positions_out[i] = layout.positions
+                passwords_out[i] = layout.password
+                seeds_out[i] = used_seed
+    else:
+        for i, map_seed in enumerate(seed_list):
+            used_seed, layout = _generate_valid(map_seed)
+            tiles_out[i] = layout.tiles
+            positions_out[i] = layout.positions
+            passwords_out[i] = layout.password
+            seeds_out[i] = used_seed
+
+    tiles_out.flush()
+    positions_out.flush()
+    np.save(os.path.join(path, _DIFFICULTY_FILE), score_layouts(tiles_out, positions_out))
+    del tiles_out, positions_out
+    np.save(os.path.join(path, _PASSWORDS_FILE), passwords_out)
+    np.save(os.path.join(path, _SEEDS_FILE), seeds_out)
+    with open(os.path.join(path, _META_FILE), "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "count": count,
+                "width": width,
+                "height": height,
+                "generator": config.MAP_GENERATOR,
+                "wall_density": config.WALL_DENSITY,
+                "seed": seed,
+            },
+            f,
+            indent=2,
+        )
+
+
+class MapPool:
+    """A read-only, memory-mapped pool of pre-generated layouts.
+
+    The arrays are opened with ``mmap_mode="r"``, so every process that loads
+    the same pool shares its pages through the OS page cache and sampling a
+    layout is a constant-time slice.
+
+    Attributes:
+        path (str): The pool directory.
+        tiles (np.ndarray): The (N, H, W) uint8 maps.
+        positions (np.ndarray): The (N, OBJECT_COUNT, 2) object positions.
+        passwords (np.ndarray): The (N,) treasure passwords.
+        seeds (np.ndarray): The (N,) seeds each layout was generated from.
+        difficulty (np.ndarray | None): The (N,) difficulty scores from
+            score_layouts, or None for pools built before scoring existed.
+        meta (dict): The settings the pool was built with.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Opens a pool directory written by build_map_pool.
+
+        Args:
+            path (str): The pool directory.
+        """
+        self.path: str = path
+        self.tiles: np.ndarray = np.load(os.path.join(path, _TILES_FILE), mmap_mode="r")
+        self.positions: np.ndarray = np.load(
+            os.path.join(path, _POSITIONS_FILE), mmap_mode="r"
+        )
+        self.passwords: np.ndarray = np.load(
+            os.path.join(path, _PASSWORDS_FILE), mmap_mode="r"
+        )
+        self.seeds: np.ndarray = np.load(os.path.join(path, _SEEDS_FILE), mmap_mode="r")
+        difficulty_path = os.path.join(path, _DIFFICULTY_FILE)
+        self.difficulty: np.ndarray | None = (
+            np.load(difficulty_path, mmap_mode="r")
+            if os.path.exists(difficulty_path)
+            else None
+        )
+        with open(os.path.join(path, _META_FILE), "r", encoding="utf-8") as f:
+            self.meta: dict = json.load(f)
+        self._rng: np.random.Generator = np.random.default_rng()
+
+    def __len__(self) -> int:
+        return self.tiles.shape[0]
+
+    @property
+    def map_shape(self) -> tuple[int, int]:
+        """The (height, width) of every map in the pool."""
+        return self.tiles.shape[1], self.tiles.shape[2]
+
+    def get(self, index: int) -> Layout:
+        """Returns the layout at an index; the tiles are a read-only view."""
+        return Layout(
+            self.tiles[index],
+            np.asarray(self.positions[index], dtype=np.int64),
+            str(self.passwords[index]),
+        )
+
+    def sample(
+        self,
+        rng: np.random.Generator | None = None,
+        indices: np.ndarray | None = None,
+    ) -> tuple[int, Layout]:
+        """Picks a random layout from the pool.
+
+        Args:
+            rng (np.random.Generator | None): The random generator to use.
+                Defaults to a generator owned by the pool.
+            indices (np.ndarray | None): Restricts sampling to these layouts,
+                e.g. one difficulty bucket. Defaults to the whole pool.
+
+        Returns:
+            tuple[int, Layout]: The index of the layout and the layout itself.
+        """
+        rng = rng or self._rng
+        if indices is None:
+            index = int(rng.integers(0, len(self)))
+        else:
+            index = int(indices[rng.integers(0, len(indices))])
+        return index, self.get(index)
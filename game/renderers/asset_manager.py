@@ -0,0 +1,115 @@
+import os
+from functools import lru_cache
+
+import pygame
+
+from configs import config
+
+SPRITE_PATHS: dict[str, str] = {
+    "player": "game/sprites/player.png",
+    "wall": "game/sprites/wall.png",
+    "floor": "game/sprites/floor.png",
+    "exit": "game/sprites/exit.png",
+    "treasure": "game/sprites/treasure.png",
+    "treasure_open": "game/sprites/treasure_open.png",
+    "npc_loc": "game/sprites/npc_loc.png",
+    "npc_pw": "game/sprites/npc_pw.png",
+}
+
+
+@lru_cache(maxsize=None)
+def resolve_korean_font_path() -> str | None:
+    """Finds an available Korean font on the system.
+
+    The lookup probes fontconfig, which is slow, so the result is cached for the
+    lifetime of the process.
+
+    Returns:
+        str | None: The path of the font file, or None to use the default font.
+    """
+    font_paths = ["game/fonts/NanumGothic.ttf"]
+    for path in font_paths:
+        if os.path.exists(path):
+            return path
+    fonts = ["nanumgothic", "malgungothic", "gulim", "dotum", "applegothic"]
+    for font_name in fonts:
+        try:
+            font_path = pygame.font.match_font(font_name)
+            if font_path:
+                return font_path
+        except Exception:
+            continue
+    print("\n[경고] 한글 폰트를 찾지 못했습니다. 한글이 깨질 수 있습니다.\n")
+    return None
+
+
+class AssetManager:
+    """Loads sprites and fonts once and caches their size-specific variants.
+
+    Source images are decoded from disk the first time they are requested.
+    Scaled sprites and font objects are cached per size, so going back to a
+    previously used window size costs only dictionary lookups.
+    """
+
+    def __init__(self, sprite_paths: dict[str, str] | None = None) -> None:
+        """Initializes the AssetManager.
+
+        Args:
+            sprite_paths (dict[str, str] | None): Sprite names mapped to image
+                paths. Defaults to the game's sprite set.
+        """
+        self.sprite_paths: dict[str, str] = dict(sprite_paths or SPRITE_PATHS)
+        self._sources: dict[str, pygame.Surface] = {}
+        self._scaled: dict[tuple[str, int], pygame.Surface] = {}
+        self._fonts: dict[int, pygame.font.Font] = {}
+
+    def _source(self, name: str) -> pygame.Surface | None:
+        """Returns the decoded source image of a sprite, or None if it is missing."""
+        if name not in self._sources:
+            path = self.sprite_paths[name]
+            try:
+                image = pygame.image.load(path)
+            except pygame.error:
+                print(f"[경고] 스프라이트 파일을 찾을 수 없습니다: {path}")
+                image = None
+            # Converting to the display format speeds up blits, but needs a
+            # video mode; offscreen rendering uses the loaded format as is.
+            if image is not None and pygame.display.get_surface() is not None:
+                image = image.convert_alpha()
+            self._sources[name] = image
+        return self._sources[name]
+
+    def sprite(self, name: str, size: int) -> pygame.Surface:
+        """Returns a sprite scaled to a square of the given size.
+
+        Args:
+            name (str): The sprite name.
+            size (int): The side length in pixels.
+
+        Returns:
+            pygame.Surface: The scaled sprite, or a gray placeholder if the image
+                could not be loaded.
+        """
+        key = (name, size)
+        scaled = self._scaled.get(key)
+        if scaled is None:
+            source = self._source(name)
+            if source is None:
+                scaled = pygame.Surface((size, size))
+                scaled.fill(config.GRAY)  # Use a visible placeholder color
+            else:
+                scaled = pygame.transform.scale(source, (size, size))
+            self._scaled[key] = scaled
+        return scaled
+
+    def sprites(self, size: int) -> dict[str, pygame.Surface]:
+        """Returns every sprite scaled to the given size."""
+        return {name: self.sprite(name, size) for name in self.sprite_paths}
+
+    def font(self, size: int) -> pygame.font.Font:
+        """Returns the Korean-capable font at the given point size."""
+        font = self._fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(resolve_korean_font_path(), size)
+            self._fonts[size] = font
+        return font
@@ -0,0 +1,70 @@
+class Camera:
+    """A scrolling viewport over the map, measured in grid cells.
+
+    The camera keeps its target centered where possible and is clamped to the
+    map edges, so the renderer only has to draw the cells inside the viewport.
+
+    Attributes:
+        view_width (int): The viewport width in cells.
+        view_height (int): The viewport height in cells.
+        x (int): The map column shown at the left edge of the viewport.
+        y (int): The map row shown at the top edge of the viewport.
+    """
+
+    def __init__(self, view_width: int, view_height: int) -> None:
+        """Initializes the Camera.
+
+        Args:
+            view_width (int): The viewport width in cells.
+            view_height (int): The viewport height in cells.
+        """
+        self.view_width: int = view_width
+        self.view_height: int = view_height
+        self.x: int = 0
+        self.y: int = 0
+
+    def follow(
+        self,
+        target: tuple[int, int],
+        map_width: int | None,
+        map_height: int | None,
+    ) -> None:
+        """Centers the viewport on a cell, clamped to the map bounds.
+
+        Args:
+            target (tuple[int, int]): The (x, y) cell to follow.
+            map_width (int | None): The map width in cells, or None for an
+                unbounded world.
+            map_height (int | None): The map height in cells, or None for an
+                unbounded world.
+        """
+        self.x = target[0] - self.view_width // 2
+        self.y = target[1] - self.view_height // 2
+        if map_width is not None:
+            self.x = min(max(self.x, 0), max(0, map_width - self.view_width))
+        if map_height is not None:
+            self.y = min(max(self.y, 0), max(0, map_height - self.view_height))
+
+    def visible_range(
+        self, map_width: int | None, map_height: int | None
+    ) -> tuple[int, int, int, int]:
+        """Returns the cells inside the viewport as (x0, y0, x1, y1), end-exclusive."""
+        x1 = self.x + self.view_width
+        y1 = self.y + self.view_height
+        return (
+            self.x,
+            self.y,
+            x1 if map_width is None else min(x1, map_width),
+            y1 if map_height is None else min(y1, map_height),
+        )
+
+    def is_visible(self, pos: tuple[int, int]) -> bool:
+        """Checks whether a cell is inside the viewport."""
+        return (
+            self.x <= pos[0] < self.x + self.view_width
+            and self.y <= pos[1] < self.y + self.view_height
+        )
+
+    def to_screen(self, pos: tuple[int, int], cell_size: int) -> tuple[int, int]:
+        """Converts an (x, y) cell to the pixel position of its top-left corner."""
+        return ((pos[0] - self.x) * cell_size, (pos[1] - self.y) * cell_size)
@@ -0,0 +1,84 @@
+import numpy as np
+import pygame
+
+from configs import config
+from game.games.game import Game
+from game.renderers.asset_manager import AssetManager
+
+
+class FrameRenderer:
+    """Draws the game state to an offscreen surface and returns it as an array.
+
+    Unlike Renderer, this needs no window or even a video mode: frames are
+    drawn on plain surfaces, with sprites left in their loaded format. Walls
+    and floor are pre-rendered into a tile layer once per map, so a frame
+    costs one layer blit plus a few entity blits. Text (labels, info panel, overlays) is not drawn.
+
+    Attributes:
+        tile_size (int): The pixel size of one grid cell in the frame.
+    """
+
+    def __init__(self, tile_size: int | None = None) -> None:
+        """Initializes the FrameRenderer.
+
+        Args:
+            tile_size (int | None): The pixel size of one grid cell in the frame.
+                Defaults to config.RGB_ARRAY_TILE_SIZE.
+        """
+        self.tile_size: int = tile_size or config.RGB_ARRAY_TILE_SIZE
+        self.assets: AssetManager = AssetManager()
+        self.sprites: dict[str, pygame.Surface] = self.assets.sprites(self.tile_size)
+        self.surface: pygame.Surface | None = None
+        self._tile_layer: pygame.Surface | None = None
+        self._tile_layer_tiles: np.ndarray | None = None
+
+    def _update_tile_layer(self, tiles: np.ndarray) -> None:
+        """Pre-renders walls and floor of a map into a reusable layer."""
+        height, width = tiles.shape
+        size = (width * self.tile_size, height * self.tile_size)
+        if self.surface is None or self.surface.get_size() != size:
+            self.surface = pygame.Surface(size)
+            self._tile_layer = pygame.Surface(size)
+
+        wall, floor = self.sprites["wall"], self.sprites["floor"]
+        for r, row in enumerate(tiles.tolist()):
+            for c, tile in enumerate(row):
+                sprite = wall if tile == 1 else floor
+                self._tile_layer.blit(sprite, (c * self.tile_size, r * self.tile_size))
+        self._tile_layer_tiles = tiles
+
+    def _blit_cell(self, sprite_name: str, pos: tuple[int, int]) -> None:
+        """Draws a sprite on the cell at the given (x, y) grid position."""
+        self.surface.blit(
+            self.sprites[sprite_name], (pos[0] * self.tile_size, pos[1] * self.tile_size)
+        )
+
+    def render(self, game: Game) -> np.ndarray:
+        """Renders the game state into an RGB frame.
+
+        Args:
+            game (Game): The game to render.
+
+        Returns:
+            np.ndarray: A (height, width, 3) uint8 array owned by the caller.
+        """
+        if game.tiles is not self._tile_layer_tiles:
+            self._update_tile_layer(game.tiles)
+
+        self.surface.blit(self._tile_layer, (0, 0))
+        self._blit_cell("exit", game.exit_pos)
+        if game.treasure_visible:
+            self._blit_cell(
+                "treasure_open" if game.treasure_opened else "treasure",
+                game.treasure_pos,
+            )
+        for npc in game.npcs:
+            self._blit_cell(npc.sprite, npc.pos)
+        self._blit_cell("player", game.player_pos)
+
+        # pixels3d is a (width, height, 3) view on the surface memory; the
+        # transposed copy is the only copy made per frame.
+        pixels = pygame.surfarray.pixels3d(self.surface)
+        frame = pixels.transpose(1, 0, 2).copy()
+        del pixels  # Unlock the surface for the next frame.
+        return frame
@@ -1,19 +1,33 @@
-import os
-
 import pygame
 
 from configs import config
+from game.actors.npc import NPC
 from game.games.game import Game
+from game.debug.frame_profiler import FrameProfiler
 from game.games.states import GameState
+from game.renderers.asset_manager import AssetManager
+from game.renderers.camera import Camera
 from game.ui.manager import UIManager
 
 
 class Renderer:
     """Handles drawing all graphical elements of the game to the screen."""
 
-    def __init__(self, screen: pygame.Surface) -> None:
-        """Initializes the Renderer."""
+    def __init__(
+        self, screen: pygame.Surface, profiler: FrameProfiler | None = None
+    ) -> None:
+        """Initializes the Renderer.
+
+        Args:
+            screen (pygame.Surface): The display surface to draw on.
+            profiler (FrameProfiler | None): Times the drawing phases. A disabled
+                profiler is created if none is given.
+        """
         self.screen: pygame.Surface = screen
+        self.profiler: FrameProfiler = profiler or FrameProfiler()
+        self.assets: AssetManager = AssetManager()
+        self.camera: Camera = Camera(config.VIEWPORT_WIDTH, config.VIEWPORT_HEIGHT)
+        self._visible: list[NPC] = []  # NPCs inside the viewport this frame
         self._update_fonts()
         self._update_sprites()
         self.ui_manager: UIManager = UIManager(self.screen, self.fonts)
@@ -27,27 +41,8 @@ class Renderer:
         self.ui_manager.screen = self.screen
         self.ui_manager.fonts = self.fonts
 
-    def _get_korean_font(self) -> str | None:
-        """Finds an available Korean font on the system."""
-        font_paths = ["game/fonts/NanumGothic.ttf"]
-        for path in font_paths:
-            if os.path.exists(path):
-                return path
-        fonts = ["nanumgothic", "malgungothic", "gulim", "dotum", "applegothic"]
-        for font_name in fonts:
-            try:
-                font_path = pygame.font.match_font(font_name)
-                if font_path:
-                    return font_path
-            except Exception:
-                continue
-        print("\n[경고] 한글 폰트를 찾지 못했습니다. 한글이 깨질 수 있습니다.\n")
-        return None
-
     def _update_fonts(self) -> None:
         """Loads or reloads the fonts required for the game, scaling them based on the final grid size."""
-        font_path = self._get_korean_font()
-
         # --- Font Scaling Logic ---
         # Define a reference grid size that corresponds to the base font sizes.
         REFERENCE_GRID_SIZE = 24
@@ -60,82 +55,104 @@ class Renderer:
         # --- End of Scaling Logic ---
 
         self.fonts = {
-            "main": pygame.font.Font(font_path, main_size),
-            "info": pygame.font.Font(font_path, info_size),
-            "label": pygame.font.Font(font_path, label_size),
+            "main": self.assets.font(main_size),
+            "info": self.assets.font(info_size),
+            "label": self.assets.font(label_size),
         }
 
     def _update_sprites(self) -> None:
-        """Loads or reloads all sprite images and scales them to the grid size."""
-        sprite_paths = {
-            "player": "game/sprites/player.png",
-            "wall": "game/sprites/wall.png",
-            "floor": "game/sprites/floor.png",
-            "exit": "game/sprites/exit.png",
-            "treasure": "game/sprites/treasure.png",
-            "treasure_open": "game/sprites/treasure_open.png",
-            "npc_loc": "game/sprites/npc_loc.png",
-            "npc_pw": "game/sprites/npc_pw.png",
-        }
-        self.sprites = {}
-        for name, path in sprite_paths.items():
-            try:
-                sprite = pygame.image.load(path).convert_alpha()
-                self.sprites[name] = pygame.transform.scale(
-                    sprite, (config.GRID_SIZE, config.GRID_SIZE)
-                )
-            except pygame.error:
-                print(f"[경고] 스프라이트 파일을 찾을 수 없습니다: {path}")
-                temp_surface = pygame.Surface((config.GRID_SIZE, config.GRID_SIZE))
-                temp_surface.fill(config.GRAY)  # Use a visible placeholder color
-                self.sprites[name] = temp_surface
+        """Scales all sprite images to the grid size, reusing cached variants."""
+        self.sprites = self.assets.sprites(config.GRID_SIZE)
 
     def draw(self, game: Game) -> None:
         """Draws the entire game screen using sprites."""
+        profiler = self.profiler
         self.screen.fill(config.BLACK)
 
-        # Draw map (floor and walls)
-        for r in range(config.GRID_HEIGHT):
-            for c in range(config.GRID_WIDTH):
+        self.camera.follow(game.player_pos, *self._map_bounds(game))
+        self._visible = self._visible_npcs(game)
+
+        with profiler.section("tiles"):
+            self._draw_tiles(game)
+        with profiler.section("objects"):
+            self._draw_objects(game)
+        with profiler.section("labels"):
+            self._draw_labels(game)
+        with profiler.section("info_panel"):
+            self._draw_info_panel(game)
+        with profiler.section("overlays"):
+            self._draw_overlays(game)
+
+        profiler.draw_overlay(self.screen, self.fonts["label"])
+        with profiler.section("flip"):
+            pygame.display.flip()
+
+    def _map_bounds(self, game: Game) -> tuple[int | None, int | None]:
+        """Returns the map size the camera is clamped to; None when unbounded."""
+        if game.world is not None:
+            return None, None
+        return game.width, game.height
+
+    def _draw_tiles(self, game: Game) -> None:
+        """Draws the floor and walls inside the viewport."""
+        x0, y0, x1, y1 = self.camera.visible_range(*self._map_bounds(game))
+        window = game.tile_window(x0, y0, x1, y1).tolist()
+        for r, row in enumerate(window):
+            for c, tile in enumerate(row):
                 pos_pixels = (c * config.GRID_SIZE, r * config.GRID_SIZE)
-                sprite_name = "wall" if game.grid[r][c] == 1 else "floor"
+                sprite_name = "wall" if tile == 1 else "floor"
                 self.screen.blit(self.sprites[sprite_name], pos_pixels)
 
-        # Draw objects
-        exit_pos_pixels = (game.exit_pos[0] * config.GRID_SIZE, game.exit_pos[1] * config.GRID_SIZE)
-        self.screen.blit(self.sprites["exit"], exit_pos_pixels)
+    def _visible_npcs(self, game: Game) -> list[NPC]:
+        """Returns the NPCs inside the viewport, culled in one vectorized pass."""
+        camera = self.camera
+        indices = game.npcs.in_rect(
+            camera.x,
+            camera.y,
+            camera.x + camera.view_width,
+            camera.y + camera.view_height,
+        )
+        return [game.npcs[i] for i in indices.tolist()]
+
+    def _draw_objects(self, game: Game) -> None:
+        """Draws the exit, the treasure, the NPCs and the player inside the viewport."""
+        if self.camera.is_visible(game.exit_pos):
+            exit_pos_pixels = self.camera.to_screen(game.exit_pos, config.GRID_SIZE)
+            self.screen.blit(self.sprites["exit"], exit_pos_pixels)
 
-        if game.treasure_visible:
-            treasure_pos_pixels = (
-                game.treasure_pos[0] * config.GRID_SIZE,
-                game.treasure_pos[1] * config.GRID_SIZE,
+        if game.treasure_visible and self.camera.is_visible(game.treasure_pos):
+            treasure_pos_pixels = self.camera.to_screen(
+                game.treasure_pos, config.GRID_SIZE
             )
             sprite_name = "treasure_open" if game.treasure_opened else "treasure"
             self.screen.blit(self.sprites[sprite_name], treasure_pos_pixels)
 
-        # Draw NPCs
-        for npc in game.npcs:
-            npc_pos_pixels = (npc.pos[0] * config.GRID_SIZE, npc.pos[1] * config.GRID_SIZE)
-            sprite_name = "npc_loc" if "위치" in npc.name else "npc_pw"
-            self.screen.blit(self.sprites[sprite_name], npc_pos_pixels)
+        for npc in self._visible:
+            npc_pos_pixels = self.camera.to_screen(npc.pos, config.GRID_SIZE)
+            self.screen.blit(self.sprites[npc.sprite], npc_pos_pixels)
+
+        player_pos_pixels = self.camera.to_screen(game.player_pos, config.GRID_SIZE)
+        self.screen.blit(self.sprites["player"], player_pos_pixels)
+
+    def _draw_labels(self, game: Game) -> None:
+        """Draws the name labels above the NPCs and the player."""
+        for npc in self._visible:
+            npc_pos_pixels = self.camera.to_screen(npc.pos, config.GRID_SIZE)
             label_surf = self.fonts["label"].render(npc.name, True, config.WHITE)
             label_rect = label_surf.get_rect(center=(npc_pos_pixels[0] + config.GRID_SIZE // 2, npc_pos_pixels[1] - 10))
             self.screen.blit(label_surf, label_rect)
 
-        # Draw player
-        player_pos_pixels = (
-            game.player_pos[0] * config.GRID_SIZE,
-            game.player_pos[1] * config.GRID_SIZE,
-        )
-        self.screen.blit(self.sprites["player"], player_pos_pixels)
+        player_pos_pixels = self.camera.to_screen(game.player_pos, config.GRID_SIZE)
         label_surf = self.fonts["label"].render("나", True, config.WHITE)
         label_rect = label_surf.get_rect(center=(player_pos_pixels[0] + config.GRID_SIZE // 2, player_pos_pixels[1] - 10))
         self.screen.blit(label_surf, label_rect)
 
+    def _draw_info_panel(self, game: Game) -> None:
+        """Draws the bottom panel with the objective, dialogue and status."""
         # --- Information Panel (with text wrapping) ---
         info_panel_rect = pygame.Rect(
             0,
-            config.GRID_HEIGHT * config.GRID_SIZE,
+            config.VIEWPORT_HEIGHT * config.GRID_SIZE,
             config.SCREEN_WIDTH,
             config.INFO_PANEL_HEIGHT,
         )
@@ -183,12 +200,11 @@ class Renderer:
             if y_offset + line_height <= info_panel_rect.bottom:
                 self.screen.blit(status_surf, (10, y_offset))
 
-        # UI Overlays (remains the same)
+    def _draw_overlays(self, game: Game) -> None:
+        """Draws the UI overlay for the current game state."""
         if game.state == GameState.INTERACTION_MENU:
             self.ui_manager.draw_interaction_menu(game)
         elif game.state == GameState.TEXT_INPUT:
             self.ui_manager.draw_text_input(game)
         elif game.state == GameState.GAME_OVER:
             self.ui_manager.draw_game_over(game)
-
-        pygame.display.flip()
\ No newline at end of file
@@ -0,0 +1,213 @@
+from bisect import bisect_right
+from collections.abc import Sequence
+
+import pygame
+
+from configs import config
+
+
+class _ChatEntry:
+    """A single chat message laid out into wrapped lines.
+
+    Attributes:
+        message (dict[str, str]): The chat history entry this layout belongs to.
+        content (str): The content the lines were laid out from.
+        color (tuple[int, int, int]): The text color of every line.
+        lines (list[str]): The wrapped lines of the message.
+        serial (int): A number unique to this layout within its ChatLog, used
+            to key cached line surfaces.
+    """
+
+    __slots__ = ("message", "content", "color", "lines", "serial")
+
+    def __init__(
+        self,
+        message: dict[str, str],
+        content: str,
+        color: tuple[int, int, int],
+        lines: list[str],
+        serial: int,
+    ) -> None:
+        self.message = message
+        self.content = content
+        self.color = color
+        self.lines = lines
+        self.serial = serial
+
+
+class ChatLog:
+    """View model for the chat window that lays out each message only once.
+
+    Messages are wrapped when they are appended to the chat history (or when the
+    font or width changes) and a cumulative line-offset index is kept, so
+    mapping a scroll position to message lines is a binary search. Line
+    surfaces are rendered lazily and cached only for the visible range, which
+    keeps the per-frame cost independent of the history length.
+
+    Attributes:
+        font (pygame.font.Font | None): The font the current layout was made with.
+        width (int): The wrap width of the current layout.
+    """
+
+    def __init__(self, wrap_text) -> None:
+        """Initializes the ChatLog.
+
+        Args:
+            wrap_text (Callable[[str, pygame.font.Font, int], list[str]]): The
+                function used to wrap a message into lines.
+        """
+        self._wrap_text = wrap_text
+        self.font: pygame.font.Font | None = None
+        self.width: int = 0
+        self._speaker: str = ""
+        self._entries: list[_ChatEntry] = []
+        # _offsets[i] is the index of the first line of entry i; the last
+        # element is the total line count.
+        self._offsets: list[int] = [0]
+        self._surfaces: dict[tuple[int, int], pygame.Surface] = {}
+        # Serial numbers are never reused, unlike the id() of freed entries, so
+        # a cached surface can never be drawn for a different message.
+        self._next_serial: int = 0
+
+    @property
+    def line_count(self) -> int:
+        """The total number of laid out lines."""
+        return self._offsets[-1]
+
+    def clear(self) -> None:
+        """Drops the whole layout and every cached surface."""
+        self._entries = []
+        self._offsets = [0]
+        self._surfaces = {}
+
+    def sync(
+        self,
+        history: Sequence[dict[str, str]],
+        speaker: str,
+        font: pygame.font.Font,
+        width: int,
+    ) -> None:
+        """Brings the layout up to date with the chat history.
+
+        Only messages that were appended (or whose content changed, as happens
+        while a reply is streamed in) are wrapped. Messages trimmed from the
+        front of the history are dropped without touching the rest.
+
+        Args:
+            history (Sequence[dict[str, str]]): The NPC's chat history.
+            speaker (str): The name shown in front of non-user messages.
+            font (pygame.font.Font): The font used to measure and render lines.
+            width (int): The maximum width of a line in pixels.
+        """
+        if font is not self.font or width != self.width or speaker != self._speaker:
+            self.font = font
+            self.width = width
+            self._speaker = speaker
+            self.clear()
+
+        if not history:
+            if self._entries:
+                self.clear()
+            return
+
+        # Drop entries trimmed from the front of the history.
+        first = history[0]
+        if self._entries and self._entries[0].message is not first:
+            for dropped, entry in enumerate(self._entries):
+                if entry.message is first:
+                    self._drop_front(dropped)
+                    break
+            else:
+                self.clear()
+
+        if len(self._entries) > len(history):
+            self.clear()
+
+        # Re-layout messages whose content changed in place (streamed replies).
+        for index in range(len(self._entries) - 1, -1, -1):
+            entry = self._entries[index]
+            message = history[index]
+            if entry.message is not message:
+                self.clear()
+                break
+            if entry.content is message["content"] or entry.content == message["content"]:
+                break
+            self._relayout(index, message)
+
+        for index in range(len(self._entries), len(history)):
+            self._append(history[index])
+
+    def visible_lines(
+        self, scroll_offset: int, max_lines: int
+    ) -> list[tuple[pygame.Surface, int]]:
+        """Returns rendered surfaces for the lines inside the scroll window.
+
+        Args:
+            scroll_offset (int): Number of lines scrolled up from the bottom.
+            max_lines (int): Number of lines that fit in the chat area.
+
+        Returns:
+            list[tuple[pygame.Surface, int]]: The surface of every visible line
+                together with its line index in the log.
+        """
+        end = self.line_count - scroll_offset
+        start = max(0, end - max_lines)
+        if self.font is None or end <= start:
+            self._surfaces = {}
+            return []
+
+        surfaces: dict[tuple[int, int], pygame.Surface] = {}
+        visible: list[tuple[pygame.Surface, int]] = []
+        entry_index = bisect_right(self._offsets, start) - 1
+        line_index = start
+        while line_index < end:
+            entry = self._entries[entry_index]
+            entry_start = self._offsets[entry_index]
+            for local in range(line_index - entry_start, len(entry.lines)):
+                if line_index >= end:
+                    break
+                key = (entry.serial, local)
+                surf = self._surfaces.get(key)
+                if surf is None:
+                    surf = self.font.render(entry.lines[local], True, entry.color)
+                surfaces[key] = surf
+                visible.append((surf, line_index))
+                line_index += 1
+            entry_index += 1
+
+        # Keep only the surfaces of the current window.
+        self._surfaces = surfaces
+        return visible
+
+    def _layout(self, message: dict[str, str]) -> _ChatEntry:
+        """Wraps a single message into lines."""
+        content = message["content"]
+        if message["role"] == "user":
+            prefix, color = "Player: ", config.PLAYER_COLOR
+        else:
+            prefix, color = f"{self._speaker}: ", config.WHITE
+        lines = self._wrap_text(prefix + content, self.font, self.width)
+        self._next_serial += 1
+        return _ChatEntry(message, content, color, lines, self._next_serial)
+
+    def _append(self, message: dict[str, str]) -> None:
+        """Lays out a new message at the end of the log."""
+        entry = self._layout(message)
+        self._entries.append(entry)
+        self._offsets.append(self._offsets[-1] + len(entry.lines))
+
+    def _relayout(self, index: int, message: dict[str, str]) -> None:
+        """Lays out an existing message again and shifts the following offsets."""
+        old = self._entries[index]
+        entry = self._layout(message)
+        self._entries[index] = entry
+        delta = len(entry.lines) - len(old.lines)
+        if delta:
+            for i in range(index + 1, len(self._offsets)):
+                self._offsets[i] += delta
+
+    def _drop_front(self, count: int) -> None:
+        """Removes the first ``count`` entries from the layout."""
+        removed_lines = self._offsets[count]
+        del self._entries[:count]
+        self._offsets = [offset - removed_lines for offset in self._offsets[count:]]
@@ -2,6 +2,7 @@ import pygame
 
 from configs import config
 from game.games.game import Game
+from game.ui.chat_log import ChatLog
 
 
 class UIManager:
@@ -10,6 +11,7 @@ class UIManager:
     Attributes:
         screen (pygame.Surface): The main screen surface to draw on.
         fonts (dict[str, pygame.font.Font]): A dictionary of pre-loaded fonts.
+        chat_log (ChatLog): The incrementally laid out chat window contents.
     """
 
     def __init__(
@@ -18,6 +20,7 @@ class UIManager:
         """Initializes the UIManager."""
         self.screen: pygame.Surface = screen
         self.fonts: dict[str, pygame.font.Font] = fonts
+        self.chat_log: ChatLog = ChatLog(self._wrap_text)
 
     def _wrap_text(
         self, text: str, font: pygame.font.Font, max_width: int
@@ -114,19 +117,18 @@ class UIManager:
             y_offset = ui_rect.y + 40
             line_height = self.fonts["info"].get_linesize()
 
-            all_lines = []
-            for message in game.active_npc.chat_history:
-                role = message["role"]
-                content = message["content"]
-                prefix = f"{game.active_npc.name}: " if role != 'user' else 'Player: '
-                color = config.WHITE if role != 'user' else config.PLAYER_COLOR
-                wrapped_lines = self._wrap_text(prefix + content, self.fonts["info"], chat_area_width)
-                all_lines.extend([(line, color) for line in wrapped_lines])
+            self.chat_log.sync(
+                game.active_npc.chat_history,
+                game.active_npc.name,
+                self.fonts["info"],
+                chat_area_width,
+            )
+            total_lines = self.chat_log.line_count
 
             chat_box_height = chat_h - 40
             max_visible_lines = chat_box_height // line_height if line_height > 0 else 0
 
-            max_scroll_offset = len(all_lines) - max_visible_lines
+            max_scroll_offset = total_lines - max_visible_lines
             if max_scroll_offset < 0:
                 max_scroll_offset = 0
             if game.chat_scroll_offset > max_scroll_offset:
@@ -134,21 +136,18 @@ class UIManager:
             if game.chat_scroll_offset < 0:
                 game.chat_scroll_offset = 0
 
-            start_index = len(all_lines) - max_visible_lines - game.chat_scroll_offset
-            end_index = len(all_lines) - game.chat_scroll_offset
-            if start_index < 0:
-                start_index = 0
-            visible_lines = all_lines[start_index:end_index]
+            visible_lines = self.chat_log.visible_lines(
+                game.chat_scroll_offset, max_visible_lines
+            )
 
-            for line, color in visible_lines:
+            for line_surf, _ in visible_lines:
                 if y_offset + line_height > ui_rect.y + chat_h:
                     break
-                line_surf = self.fonts["info"].render(line, True, color)
                 self.screen.blit(line_surf, (ui_rect.x + 10, y_offset))
                 y_offset += line_height
 
-            if len(all_lines) > max_visible_lines:
-                if end_index < len(all_lines):
+            if total_lines > max_visible_lines:
+                if game.chat_scroll_offset > 0:
                     scroll_down_surf = self.fonts["info"].render("▼", True, config.WHITE)
                     self.screen.blit(scroll_down_surf, (ui_rect.right - 30, ui_rect.y + chat_h - 25))
                 if game.chat_scroll_offset > 0:
@@ -194,7 +193,7 @@ class UIManager:
             text_surf.get_rect(
                 center=(
                     config.SCREEN_WIDTH / 2,
-                    (config.GRID_HEIGHT * config.GRID_SIZE) / 2,
+                    (config.VIEWPORT_HEIGHT * config.GRID_SIZE) / 2,
                 )
             ),
         )
@@ -206,7 +205,7 @@ class UIManager:
             restart_surf.get_rect(
                 center=(
                     config.SCREEN_WIDTH / 2,
-                    (config.GRID_HEIGHT * config.GRID_SIZE) / 2 + 40,
+                    (config.VIEWPORT_HEIGHT * config.GRID_SIZE) / 2 + 40,
                 )
             ),
         )
\ No newline at end of file
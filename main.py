@@ -6,15 +6,16 @@ from llm.clients.ollama_client import OllamaClient
 from configs import config
 from game.controllers.input_handler import InputHandler
 from game.controllers.interaction_handler import InteractionHandler
+from game.debug.frame_profiler import FrameProfiler
 from game.games.game import Game
 from game.renderers.renderer import Renderer
 
 
 def main() -> None:
     """Initializes and runs the main game loop."""
-    config.SCREEN_WIDTH = config.GRID_WIDTH * config.GRID_SIZE
+    config.SCREEN_WIDTH = config.VIEWPORT_WIDTH * config.GRID_SIZE
     config.SCREEN_HEIGHT = (
-        config.GRID_HEIGHT * config.GRID_SIZE + config.INFO_PANEL_HEIGHT
+        config.VIEWPORT_HEIGHT * config.GRID_SIZE + config.INFO_PANEL_HEIGHT
     )
 
     llm_client = OllamaClient(model="gpt-oss:20b")
@@ -27,25 +28,35 @@ def main() -> None:
 
     # Create core components
     game = Game(llm_client=llm_client)
-    renderer = Renderer(screen)
+    profiler = FrameProfiler(
+        enabled=config.PROFILER_ENABLED or config.PROFILER_CSV_PATH is not None,
+        csv_path=config.PROFILER_CSV_PATH,
+    )
+    renderer = Renderer(screen, profiler)
     interaction_handler = InteractionHandler(game)
     input_handler = InputHandler(game, interaction_handler, renderer)
 
     running = True
     while running:
+        profiler.begin_frame()
+
         # 1. Handle input
         # The loop terminates if handle_events returns False (e.g., closing the window)
-        running = input_handler.handle_events()
+        with profiler.section("events"):
+            running = input_handler.handle_events()
 
         # 2. Update game state (currently only changes on input, so this is empty)
         # e.g., An update() method could be added here for things like enemy movement.
 
         # 3. Draw the screen
         renderer.draw(game)
+        profiler.end_frame()
 
         # 4. Control FPS
         clock.tick(config.FPS)
 
+    profiler.close()
+    game.close()
     pygame.quit()
 
 
@@ -0,0 +1,42 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from configs import config
+from game.maps.map_pool import MapPool, build_map_pool
+
+parser = argparse.ArgumentParser(
+    description="Pre-generate a memory-mapped pool of validated maps for fast resets."
+)
+parser.add_argument("output", help="Directory to write the pool to")
+parser.add_argument("--count", type=int, default=100_000, help="Number of maps")
+parser.add_argument("--seed", type=int, default=0, help="Base seed")
+parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+parser.add_argument("--width", type=int, default=config.GRID_WIDTH)
+parser.add_argument("--height", type=int, default=config.GRID_HEIGHT)
+parser.add_argument("--generator", default=config.MAP_GENERATOR)
+args = parser.parse_args()
+
+config.GRID_WIDTH = args.width
+config.GRID_HEIGHT = args.height
+config.MAP_GENERATOR = args.generator
+
+start = time.perf_counter()
+build_map_pool(args.output, args.count, seed=args.seed, workers=args.workers)
+elapsed = time.perf_counter() - start
+print(f"Built {args.count} maps in {elapsed:.1f}s -> {args.output}")
+
+# Report the sampling cost that resets will pay.
+pool = MapPool(args.output)
+rng = np.random.default_rng(args.seed)
+start = time.perf_counter()
+for _ in range(10_000):
+    pool.sample(rng)
+print(f"Sampling: {(time.perf_counter() - start) / 10_000 * 1e6:.2f} us per reset")
+if pool.difficulty is not None:
+    quartiles = np.percentile(pool.difficulty, [0, 25, 50, 75, 100]).astype(int)
+    print(f"Difficulty (quest route length) min/25/50/75/max: {quartiles.tolist()}")
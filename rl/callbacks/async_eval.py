@@ -0,0 +1,277 @@
+import multiprocessing as mp
+import os
+from typing import Any
+
+import numpy as np
+from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.logger import Logger, TensorBoardOutputFormat
+from stable_baselines3.common.vec_env.base_vec_env import CloudpickleWrapper
+
+from rl.evaluation import EvaluationResult, evaluate, make_eval_env
+
+
+def _unused_schedule(progress_remaining: float) -> float:
+    """The learning rate schedule of the evaluation policy, which never trains."""
+    return 0.0
+
+
+def _worker(
+    remote: mp.connection.Connection,
+    parent_remote: mp.connection.Connection,
+    policy_wrapper: CloudpickleWrapper,
+    env_kwargs: dict[str, Any],
+    n_episodes: int,
+    seed: int,
+    deterministic: bool,
+) -> None:
+    """Evaluates the weight snapshots AsyncEvalCallback sends, one at a time."""
+    import torch
+
+    parent_remote.close()
+    # One thread, so the evaluation competes as little as possible with the
+    # learner and its env workers.
+    torch.set_num_threads(1)
+    policy_class, policy_kwargs = policy_wrapper.var
+    policy = policy_class(**policy_kwargs)
+    policy.set_training_mode(False)
+    env = make_eval_env(**env_kwargs)
+    try:
+        while True:
+            cmd, data = remote.recv()
+            if cmd == "evaluate":
+                timesteps, snapshot = data
+                policy.load_state_dict(
+                    {key: torch.from_numpy(value) for key, value in snapshot.items()}
+                )
+                result = evaluate(
+                    policy, env, n_episodes, seed=seed, deterministic=deterministic
+                )
+                remote.send((timesteps, result))
+            elif cmd == "close":
+                remote.close()
+                break
+            else:
+                raise NotImplementedError(f"`{cmd}` is not implemented in the worker")
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        env.close()
+
+
+class AsyncEvalCallback(BaseCallback):
+    """Evaluates snapshots of the policy in another process while training.
+
+    Every `eval_freq` calls the callback copies the policy weights and sends
+    them to an evaluation process. That process plays the same seeded
+    episodes each time on headless vectorized envs (see rl.evaluation). The
+    callback checks for results without waiting on every step. Results are
+    written to the model's TensorBoard log under "eval/" at the timestep of
+    their snapshot, through a logger of their own. A snapshot whose
+    mean return beats the best so far is saved as the best model.
+
+    The learner never waits for an evaluation. If the previous one is still
+    running when the next is due, the new snapshot is skipped. Only the end of
+    training waits for the evaluation in flight, so its result is not lost.
+
+    Attributes:
+        best_mean_reward (float): The best mean return so far.
+        last_mean_reward (float): The mean return of the latest evaluation.
+        evaluations_timesteps (list[int]): The timestep of every evaluated
+            snapshot.
+        evaluations_results (list[np.ndarray]): Their episode returns.
+        evaluations_length (list[np.ndarray]): Their episode lengths.
+        evaluations_successes (list[np.ndarray]): Their success flags.
+    """
+
+    def __init__(
+        self,
+        eval_freq: int,
+        n_eval_episodes: int = 1000,
+        n_envs: int = 256,
+        env_kwargs: dict[str, Any] | None = None,
+        best_model_save_path: str | None = None,
+        log_path: str | None = None,
+        seed: int = 0,
+        deterministic: bool = True,
+        start_method: str | None = None,
+        verbose: int = 1,
+    ) -> None:
+        """Initializes the AsyncEvalCallback.
+
+        Args:
+            eval_freq (int): Sends a snapshot every this many calls; each call
+                steps every training env.
+            n_eval_episodes (int): The episodes played per snapshot.
+            n_envs (int): The games the evaluation process plays at once.
+            env_kwargs (dict[str, Any] | None): Keyword arguments of
+                rl.evaluation.make_eval_env besides n_envs, e.g.
+                max_episode_steps and obs_encoding.
+            best_model_save_path (str | None): Where to save "best_model.zip".
+            log_path (str | None): Where to save "evaluations.npz".
+            seed (int): The seed of the first evaluation episode.
+            deterministic (bool): Evaluates the most likely actions.
+            start_method (str | None): The multiprocessing start method of the
+                evaluation process. Defaults to forkserver where available.
+            verbose (int): Prints every result if positive, and skipped
+                snapshots too if above 1.
+        """
+        super().__init__(verbose)
+        self.eval_freq: int = eval_freq
+        self.n_eval_episodes: int = n_eval_episodes
+        self.env_kwargs: dict[str, Any] = {
+            "n_envs": min(n_envs, n_eval_episodes),
+            "max_episode_steps": 1024,
+            **(env_kwargs or {}),
+        }
+        self.best_model_save_path: str | None = best_model_save_path
+        self.log_path: str | None = (
+            os.path.join(log_path, "evaluations") if log_path is not None else None
+        )
+        self.seed: int = seed
+        self.deterministic: bool = deterministic
+        self.start_method: str | None = start_method
+        self.best_mean_reward: float = -np.inf
+        self.last_mean_reward: float = -np.inf
+        self.evaluations_timesteps: list[int] = []
+        self.evaluations_results: list[np.ndarray] = []
+        self.evaluations_length: list[np.ndarray] = []
+        self.evaluations_successes: list[np.ndarray] = []
+        self._process: mp.Process | None = None
+        self._remote: mp.connection.Connection | None = None
+        # The timestep and weights of the snapshot being evaluated, if any.
+        self._in_flight: tuple[int, dict[str, np.ndarray]] | None = None
+        self._eval_logger: Logger | None = None
+
+    def _on_training_start(self) -> None:
+        # Results arrive mid-rollout for an older timestep, so dumping the
+        # model's logger would flush its "train/" values early at the wrong
+        # step. They get their own logger on the same TensorBoard writer.
+        self._eval_logger = Logger(
+            folder=None,
+            output_formats=[
+                output_format
+                for output_format in self.logger.output_formats
+                if isinstance(output_format, TensorBoardOutputFormat)
+            ],
+        )
+        if self.best_model_save_path is not None:
+            os.makedirs(self.best_model_save_path, exist_ok=True)
+        if self.log_path is not None:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+        if self._process is not None:
+            return
+        start_method = self.start_method
+        if start_method is None:
+            forkserver_available = "forkserver" in mp.get_all_start_methods()
+            start_method = "forkserver" if forkserver_available else "spawn"
+        ctx = mp.get_context(start_method)
+
+        policy = self.model.policy
+        policy_kwargs = policy._get_constructor_parameters()
+        policy_kwargs["lr_schedule"] = _unused_schedule
+        self._remote, work_remote = ctx.Pipe()
+        args = (
+            work_remote,
+            self._remote,
+            CloudpickleWrapper((type(policy), policy_kwargs)),
+            self.env_kwargs,
+            self.n_eval_episodes,
+            self.seed,
+            self.deterministic,
+        )
+        # daemon=True: if the main process crashes, we should not cause things to hang
+        self._process = ctx.Process(target=_worker, args=args, daemon=True)
+        self._process.start()
+        work_remote.close()
+
+    def _on_step(self) -> bool:
+        self._collect(block=False)
+        if self.eval_freq > 0 and self.n_calls % self.eval_freq == 0:
+            if self._in_flight is None:
+                # A copy: training updates the parameters in place, and the
+                # snapshot is kept until its result arrives.
+                snapshot = {
+                    key: value.detach().to("cpu", copy=True).numpy()
+                    for key, value in self.model.policy.state_dict().items()
+                }
+                # The evaluation process is idle and waiting, so this returns
+                # as soon as the weights are written to the pipe.
+                self._remote.send(("evaluate", (self.num_timesteps, snapshot)))
+                self._in_flight = (self.num_timesteps, snapshot)
+            elif self.verbose >= 2:
+                print(
+                    f"Skipping the evaluation at num_timesteps={self.num_timesteps}; "
+                    f"the one from {self._in_flight[0]} is still running"
+                )
+        return True
+
+    def _on_training_end(self) -> None:
+        self._collect(block=True)
+        if self._process is not None:
+            self._remote.send(("close", None))
+            self._process.join()
+            self._remote.close()
+            self._process, self._remote = None, None
+
+    def _collect(self, block: bool) -> None:
+        """Reports the result of the evaluation in flight, if it is done."""
+        if self._in_flight is None or not (block or self._remote.poll()):
+            return
+        try:
+            timesteps, result = self._remote.recv()
+        except EOFError as error:
+            raise RuntimeError("The evaluation process exited unexpectedly.") from error
+        snapshot = self._in_flight[1]
+        self._in_flight = None
+        self._report(timesteps, result, snapshot)
+
+    def _report(
+        self, timesteps: int, result: EvaluationResult, snapshot: dict[str, np.ndarray]
+    ) -> None:
+        """Logs an evaluation result and saves its snapshot if it is the best."""
+        self.evaluations_timesteps.append(timesteps)
+        self.evaluations_results.append(result.returns)
+        self.evaluations_length.append(result.steps)
+        self.evaluations_successes.append(result.success)
+        if self.log_path is not None:
+            np.savez(
+                self.log_path,
+                timesteps=self.evaluations_timesteps,
+                results=self.evaluations_results,
+                ep_lengths=self.evaluations_length,
+                successes=self.evaluations_successes,
+            )
+
+        mean_reward = float(result.returns.mean())
+        self.last_mean_reward = mean_reward
+        if self.verbose >= 1:
+            print(
+                f"Eval num_timesteps={timesteps}, "
+                f"episode_reward={mean_reward:.2f} +/- {result.returns.std():.2f}, "
+                f"success rate={result.success.mean():.1%}"
+            )
+        self._eval_logger.record("eval/mean_reward", mean_reward)
+        self._eval_logger.record("eval/mean_ep_length", float(result.steps.mean()))
+        self._eval_logger.record("eval/success_rate", float(result.success.mean()))
+        self._eval_logger.dump(timesteps)
+
+        if mean_reward > self.best_mean_reward:
+            self.best_mean_reward = mean_reward
+            if self.best_model_save_path is not None:
+                self._save_snapshot(snapshot)
+            if self.verbose >= 1:
+                print("New best mean reward!")
+
+    def _save_snapshot(self, snapshot: dict[str, np.ndarray]) -> None:
+        """Saves the model with the snapshot's weights as the best model."""
+        import torch
+
+        policy = self.model.policy
+        current = {key: value.clone() for key, value in policy.state_dict().items()}
+        policy.load_state_dict(
+            {key: torch.from_numpy(value) for key, value in snapshot.items()}
+        )
+        try:
+            self.model.save(os.path.join(self.best_model_save_path, "best_model"))
+        finally:
+            policy.load_state_dict(current)
@@ -0,0 +1,65 @@
+from collections import deque
+from collections.abc import Sequence
+
+from stable_baselines3.common.callbacks import BaseCallback
+
+
+class MapSizeCurriculum(BaseCallback):
+    """Grows the training map size as the agent masters each size.
+
+    Training starts on the first size. Once the last `window` finished
+    episodes reach `success_threshold` (an episode succeeds when it ends by
+    completing the quest rather than by the time limit), every env switches
+    to the next size from its next reset. The envs must use the egocentric
+    observation encoding, whose shape does not depend on the map size.
+
+    Attributes:
+        sizes (tuple[int, ...]): The square map sizes, in order.
+        stage (int): The index of the current size.
+    """
+
+    def __init__(
+        self,
+        sizes: Sequence[int],
+        success_threshold: float = 0.8,
+        window: int = 100,
+        verbose: int = 0,
+    ) -> None:
+        """Initializes the MapSizeCurriculum.
+
+        Args:
+            sizes (Sequence[int]): The square map sizes, smallest first.
+            success_threshold (float): The success rate that unlocks the next
+                size.
+            window (int): The number of recent episodes the rate is taken over.
+            verbose (int): Prints a line on every size change if positive.
+        """
+        super().__init__(verbose)
+        self.sizes: tuple[int, ...] = tuple(sizes)
+        self.success_threshold: float = success_threshold
+        self.stage: int = 0
+        self._successes: deque[bool] = deque(maxlen=window)
+
+    def _set_size(self) -> None:
+        size = self.sizes[self.stage]
+        self.training_env.env_method("set_map_size", size, size)
+        self.logger.record("curriculum/map_size", size)
+        if self.verbose > 0:
+            print(f"Curriculum: training on {size}x{size} maps")
+
+    def _on_training_start(self) -> None:
+        self._set_size()
+
+    def _on_step(self) -> bool:
+        for done, info in zip(self.locals["dones"], self.locals["infos"]):
+            if done:
+                self._successes.append(not info.get("TimeLimit.truncated", False))
+        if (
+            self.stage < len(self.sizes) - 1
+            and len(self._successes) == self._successes.maxlen
+            and sum(self._successes) >= self.success_threshold * len(self._successes)
+        ):
+            self.stage += 1
+            self._successes.clear()
+            self._set_size()
+        return True
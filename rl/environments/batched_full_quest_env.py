@@ -0,0 +1,394 @@
+from typing import Any
+
+import numpy as np
+from gymnasium import spaces
+from stable_baselines3.common.vec_env import VecEnv
+
+from configs import config
+from game.maps.distance import UNREACHABLE, batch_distance_fields
+from game.maps.layout import (
+    EXIT,
+    LOCATION_NPC,
+    PASSWORD_NPC,
+    PLAYER,
+    TREASURE,
+    Layout,
+    generate_layout,
+)
+from game.maps.map_pool import MapPool
+
+# (dx, dy) of the move actions 0-3: up, down, left, right.
+_MOVES = np.array([(0, -1), (0, 1), (-1, 0), (1, 0), (0, 0)], dtype=np.int64)
+_INTERACT = 4
+_FIRST_DIGIT = 5
+
+# Rows of the per-env distance fields, and the object each one measures to.
+_FIELD_LOCATION_NPC, _FIELD_PASSWORD_NPC, _FIELD_TREASURE, _FIELD_EXIT = range(4)
+_FIELD_OBJECTS = (LOCATION_NPC, PASSWORD_NPC, TREASURE, EXIT)
+
+# The attributes holding one row per game, which get_attr and set_attr index.
+_PER_GAME_ATTRS = frozenset(
+    {
+        "tiles",
+        "positions",
+        "passwords",
+        "knows_location",
+        "knows_password",
+        "visited_treasure_first",
+        "treasure_opened",
+        "password_input_mode",
+        "episode_steps",
+    }
+)
+
+
+class BatchedFullQuestEnv(VecEnv):
+    """N copies of the password FullQuestEnv stepped together with NumPy.
+
+    Every game lives in stacked arrays: ``[N, H, W]`` maps, ``[N, 2]``
+    positions and ``[N]`` quest flags. A step applies moves, interactions,
+    password entry, rewards and auto-resets to all games with vectorized
+    operations; only resets run per game, to generate the new layout.
+
+    Semantics match ``rl.environments.full_quest_env_pass.FullQuestEnv`` wrapped
+    in SB3's ``DummyVecEnv`` (and ``TimeLimit`` if ``max_episode_steps`` is
+    set), using the default NPC roster: the same seed gives the same maps,
+    observations and rewards. Game ``i`` is seeded with ``seed + i``, as in
+    ``VecEnv.seed``.
+
+    Attributes:
+        tiles (np.ndarray): The (N, H, W) uint8 maps.
+        positions (np.ndarray): The (N, OBJECT_COUNT, 2) object positions,
+            indexed like Layout.positions; row PLAYER moves.
+        passwords (np.ndarray): The (N,) treasure passwords.
+    """
+
+    metadata = {"render_modes": []}
+
+    def __init__(
+        self,
+        num_envs: int,
+        map_pool: MapPool | str | None = None,
+        reward_shaping: bool = False,
+        max_episode_steps: int | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """Initializes the BatchedFullQuestEnv.
+
+        Args:
+            num_envs (int): The number of games stepped together.
+            map_pool (MapPool | str | None): A map pool, or its directory, to
+                sample layouts from instead of generating them. Defaults to
+                config.MAP_POOL_PATH, if set, like Game.
+            reward_shaping (bool): Adds potential-based shaping from BFS
+                distances to the next quest target.
+            max_episode_steps (int | None): Truncates episodes after this many
+                steps, like gymnasium's TimeLimit.
+            seed (int | None): Seeds the games for the first reset.
+        """
+        height, width = config.GRID_HEIGHT, config.GRID_WIDTH
+        if map_pool is None and config.MAP_POOL_PATH:
+            map_pool = config.MAP_POOL_PATH
+        if isinstance(map_pool, str):
+            map_pool = MapPool(map_pool)
+        if map_pool is not None and map_pool.map_shape != (height, width):
+            raise ValueError(
+                f"Map pool has {map_pool.map_shape} maps, but the observation "
+                f"space expects {(height, width)}."
+            )
+        self.map_pool: MapPool | None = map_pool
+        self.reward_shaping: bool = reward_shaping
+        self.max_episode_steps: int | None = max_episode_steps
+        self.render_mode = None
+
+        observation_space = spaces.Dict(
+            {
+                "grid": spaces.Box(
+                    low=0, high=1, shape=(height, width, 6), dtype=np.uint8
+                ),
+                "has_location_info": spaces.Discrete(2),
+                "visited_treasure_first": spaces.Discrete(2),
+                "has_password_info": spaces.Discrete(2),
+                "password_input_mode": spaces.Discrete(2),
+                "treasure_opened": spaces.Discrete(2),
+                "treasure_password": spaces.Discrete(10),
+                "entered_password": spaces.Discrete(10),
+            }
+        )
+        super().__init__(num_envs, observation_space, spaces.Discrete(15))
+
+        n = num_envs
+        self._rngs: list[np.random.Generator] = [np.random.default_rng() for _ in range(n)]
+        self.tiles: np.ndarray = np.ones((n, height, width), dtype=np.uint8)
+        self.positions: np.ndarray = np.zeros((n, 5, 2), dtype=np.int64)
+        self.passwords: np.ndarray = np.zeros(n, dtype=np.int64)
+        self.knows_location: np.ndarray = np.zeros(n, dtype=bool)
+        self.knows_password: np.ndarray = np.zeros(n, dtype=bool)
+        self.visited_treasure_first: np.ndarray = np.zeros(n, dtype=bool)
+        self.treasure_opened: np.ndarray = np.zeros(n, dtype=bool)
+        self.password_input_mode: np.ndarray = np.zeros(n, dtype=bool)
+        self.episode_steps: np.ndarray = np.zeros(n, dtype=np.int64)
+        self._fields: np.ndarray = np.zeros((n, 4, height, width), dtype=np.int32)
+        # The grid observation is kept up to date in place; only the player
+        # channel changes between resets.
+        self._grid: np.ndarray = np.zeros((n, height, width, 6), dtype=np.uint8)
+        self._actions: np.ndarray = np.zeros(n, dtype=np.int64)
+        self._arange: np.ndarray = np.arange(n)
+        if seed is not None:
+            self.seed(seed)
+
+    # --- Layouts -----------------------------------------------------------
+
+    def _next_layout(self, index: int) -> Layout:
+        """Draws the next layout of a game from its own generator."""
+        if self.map_pool is not None:
+            return self.map_pool.sample(self._rngs[index])[1]
+        return generate_layout(self._rngs[index])
+
+    def seed_next_episode(self, index: int, seed: int) -> None:
+        """Seeds the layout of the episode a game starts on its next reset.
+
+        The current episode is unaffected. The next one gets the layout that
+        ``FullQuestEnv.reset(seed=seed)`` would, so it can be replayed alone.
+
+        Args:
+            index (int): The game.
+            seed (int): The seed of its next episode.
+        """
+        self._rngs[index] = np.random.default_rng(seed)
+
+    def _reset_games(self, indices: np.ndarray) -> None:
+        """Loads new layouts into some games and clears their quest state."""
+        for i in indices.tolist():
+            layout = self._next_layout(i)
+            self.tiles[i] = layout.tiles
+            self.positions[i] = layout.positions
+            self.passwords[i] = int(layout.password)
+        for flags in (
+            self.knows_location,
+            self.knows_password,
+            self.visited_treasure_first,
+            self.treasure_opened,
+            self.password_input_mode,
+        ):
+            flags[indices] = False
+        self.episode_steps[indices] = 0
+
+        grid = self._grid[indices]
+        grid[...] = 0
+        grid[..., 0] = self.tiles[indices]
+        rows = np.arange(len(indices))
+        pos = self.positions[indices]
+        for channel, obj in ((1, PLAYER), (2, LOCATION_NPC), (3, PASSWORD_NPC), (4, TREASURE), (5, EXIT)):
+            grid[rows, pos[:, obj, 1], pos[:, obj, 0], channel] = 1
+        self._grid[indices] = grid
+
+        if self.reward_shaping:
+            floors = self.tiles[indices] == 0
+            for field, obj in enumerate(_FIELD_OBJECTS):
+                self._fields[indices, field] = batch_distance_fields(
+                    floors, rows, pos[:, obj]
+                )
+
+    # --- Observations and shaping -------------------------------------------
+
+    def _observations(self) -> dict[str, np.ndarray]:
+        """Returns copies of the current observations of every game."""
+        return {
+            "grid": self._grid.copy(),
+            "has_location_info": self.knows_location.astype(np.int64),
+            "visited_treasure_first": self.visited_treasure_first.astype(np.int64),
+            "has_password_info": self.knows_password.astype(np.int64),
+            "treasure_opened": self.treasure_opened.astype(np.int64),
+            "password_input_mode": self.password_input_mode.astype(np.int64),
+            "treasure_password": np.where(self.knows_password, self.passwords, 0),
+            # A one-digit password is checked and cleared on the step it is
+            # typed, so no partial entry is ever observed.
+            "entered_password": np.zeros(self.num_envs, dtype=np.int64),
+        }
+
+    def _potentials(self) -> np.ndarray:
+        """Vectorized reward_shaping.quest_potential for every game."""
+        target = np.where(
+            ~self.knows_location,
+            _FIELD_LOCATION_NPC,
+            np.where(
+                ~self.visited_treasure_first,
+                _FIELD_TREASURE,
+                np.where(
+                    ~self.knows_password,
+                    _FIELD_PASSWORD_NPC,
+                    np.where(~self.treasure_opened, _FIELD_TREASURE, _FIELD_EXIT),
+                ),
+            ),
+        )
+        player = self.positions[:, PLAYER]
+        distance = self._fields[self._arange, target, player[:, 1], player[:, 0]]
+        area = self.tiles.shape[1] * self.tiles.shape[2]
+        return np.where(
+            distance == UNREACHABLE, 0.0, -config.SHAPING_SCALE * distance / area
+        )
+
+    # --- VecEnv interface ---------------------------------------------------
+
+    def reset(self) -> dict[str, np.ndarray]:
+        for i, seed in enumerate(self._seeds):
+            if seed is not None:
+                self._rngs[i] = np.random.default_rng(seed)
+        self._reset_seeds()
+        self._reset_options()
+        self._reset_games(self._arange)
+        self.reset_infos = [{} for _ in range(self.num_envs)]
+        return self._observations()
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self._actions = np.asarray(actions, dtype=np.int64).reshape(self.num_envs)
+
+    def step_wait(self):
+        actions = self._actions
+        n = self._arange
+        if self.reward_shaping:
+            potential = self._potentials()
+
+        reward = np.full(self.num_envs, -0.1)  # Time penalty
+
+        # --- Password input mode ---
+        password_mode = self.password_input_mode.copy()
+        digit = actions >= _FIRST_DIGIT
+        typed = password_mode & digit
+        reward[typed] += 0.05
+        correct = typed & (actions - _FIRST_DIGIT == self.passwords)
+        self.treasure_opened |= correct
+        reward[correct] += 50
+        reward[password_mode & ~digit] -= 0.1
+        self.password_input_mode[password_mode] = False
+
+        # --- Normal mode: moves ---
+        normal = ~password_mode
+        player = self.positions[:, PLAYER]
+        old_player = player.copy()
+        move = normal & (actions < _INTERACT)
+        target = player + _MOVES[np.where(move, actions, 4)]
+        height, width = self.tiles.shape[1:]
+        inside = (
+            (target[:, 0] >= 0)
+            & (target[:, 0] < width)
+            & (target[:, 1] >= 0)
+            & (target[:, 1] < height)
+        )
+        cx = np.clip(target[:, 0], 0, width - 1)
+        cy = np.clip(target[:, 1], 0, height - 1)
+        moved = move & inside & (self.tiles[n, cy, cx] == 0)
+        player[moved] = target[moved]
+        reward[normal & ~moved] -= 0.01  # Wall penalty or Not Moving
+
+        self._grid[n, old_player[:, 1], old_player[:, 0], 1] = 0
+        self._grid[n, player[:, 1], player[:, 0], 1] = 1
+
+        # --- Normal mode: interactions, first matching rule wins ---
+        def adjacent(obj: int) -> np.ndarray:
+            return np.abs(player - self.positions[:, obj]).sum(axis=1) <= 1
+
+        near_location = adjacent(LOCATION_NPC)
+        near_password = adjacent(PASSWORD_NPC)
+        near_treasure = adjacent(TREASURE)
+        pending = normal & (actions == _INTERACT)
+
+        location = pending & ~self.knows_location & near_location
+        pending &= ~location
+        treasure_first = (
+            pending
+            & self.knows_location
+            & ~self.visited_treasure_first
+            & ~self.knows_password
+            & near_treasure
+        )
+        pending &= ~treasure_first
+        password = (
+            pending & self.visited_treasure_first & ~self.knows_password & near_password
+        )
+        pending &= ~password
+        open_chest = pending & self.knows_password & ~self.treasure_opened & near_treasure
+        pending &= ~open_chest
+        out_of_order = pending & (near_location | near_password | near_treasure)
+
+        self.knows_location |= location
+        reward[location] += 50
+        self.visited_treasure_first |= treasure_first
+        reward[treasure_first] += 50
+        self.knows_password |= password
+        reward[password] += 50
+        self.password_input_mode |= open_chest
+        reward[out_of_order] -= 0.05
+
+        # --- Normal mode: exit ---
+        at_exit = normal & np.all(player == self.positions[:, EXIT], axis=1)
+        terminated = at_exit & self.treasure_opened
+        reward[terminated] += 100
+        reward[at_exit & ~self.treasure_opened] -= 0.05
+
+        if self.reward_shaping:
+            after = np.where(terminated, 0.0, self._potentials())
+            reward += config.SHAPING_GAMMA * after - potential
+
+        self.episode_steps += 1
+        truncated = np.zeros(self.num_envs, dtype=bool)
+        if self.max_episode_steps is not None:
+            truncated = ~terminated & (self.episode_steps >= self.max_episode_steps)
+        dones = terminated | truncated
+
+        observations = self._observations()
+        infos: list[dict[str, Any]] = [{} for _ in range(self.num_envs)]
+        done_indices = np.flatnonzero(dones)
+        if done_indices.size:
+            for i in done_indices.tolist():
+                infos[i]["TimeLimit.truncated"] = bool(truncated[i])
+                infos[i]["terminal_observation"] = {
+                    key: value[i].copy() for key, value in observations.items()
+                }
+            self._reset_games(done_indices)
+            reset_observations = self._observations()
+            for key, value in observations.items():
+                value[done_indices] = reset_observations[key][done_indices]
+        return observations, reward.astype(np.float32), dones, infos
+
+    def close(self) -> None:
+        pass
+
+    def _indices(self, indices) -> list[int]:
+        if indices is None:
+            return list(range(self.num_envs))
+        if isinstance(indices, int):
+            return [indices]
+        return list(indices)
+
+    def get_attr(self, attr_name: str, indices=None) -> list[Any]:
+        value = getattr(self, attr_name)
+        if attr_name in _PER_GAME_ATTRS:
+            return [value[i] for i in self._indices(indices)]
+        return [value for _ in self._indices(indices)]
+
+    def set_attr(self, attr_name: str, value: Any, indices=None) -> None:
+        if attr_name in _PER_GAME_ATTRS:
+            getattr(self, attr_name)[self._indices(indices)] = value
+            return
+        self._check_whole_batch(indices, f"attribute {attr_name!r}")
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name: str, *method_args, indices=None, **method_kwargs) -> list[Any]:
+        # Every method acts on the whole batch, so it runs once and its
+        # result stands for every game.
+        self._check_whole_batch(indices, f"method {method_name!r}")
+        result = getattr(self, method_name)(*method_args, **method_kwargs)
+        return [result for _ in range(self.num_envs)]
+
+    def _check_whole_batch(self, indices, what: str) -> None:
+        """Raises if `indices` select only some of the games."""
+        if sorted(set(self._indices(indices))) != list(range(self.num_envs)):
+            raise ValueError(
+                f"BatchedFullQuestEnv applies {what} to every game at once; it "
+                f"cannot be applied to indices {indices!r} alone."
+            )
+
+    def env_is_wrapped(self, wrapper_class, indices=None) -> list[bool]:
+        return [False for _ in self._indices(indices)]
@@ -1,22 +1,54 @@
 import gymnasium as gym
 import numpy as np
-import pygame
 from gymnasium import spaces
 
 from configs import config
+from game.actors.npc import NPCRole
 from game.games.game import Game
-from game.renderers.renderer import Renderer
+from game.maps.map_pool import MapPool
+from rl.environments.observation_builder import ObservationBuilder
+from rl.environments.reward_shaping import quest_potential, shaping_reward
 
 
 class FullQuestEnv(gym.Env):
     """An environment for the full quest: NPC1 -> Treasure -> NPC2 -> Treasure -> Exit."""
 
-    metadata = {"render_modes": ["human"], "render_fps": 30}
-
-    def __init__(self, render_mode=None):
+    metadata = {"render_modes": ["human", "rgb_array"], "render_fps": 30}
+
+    def __init__(
+        self,
+        render_mode=None,
+        map_pool=None,
+        reward_shaping=False,
+        obs_views=False,
+        obs_encoding="dict",
+        map_size=None,
+    ):
         super().__init__()
-        self.game = Game(llm_client=None)
+        # map_size is the (width, height) of generated maps; it defaults to
+        # the configured size. Only the egocentric encoding accepts maps of
+        # other sizes later on (see set_map_size).
+        width, height = map_size or (config.GRID_WIDTH, config.GRID_HEIGHT)
+        # A pool directory (or an opened MapPool) makes resets sample
+        # pre-generated maps instead of generating new ones.
+        if isinstance(map_pool, str):
+            map_pool = MapPool(map_pool)
+        if (
+            map_pool is not None
+            and obs_encoding != "egocentric"
+            and map_pool.map_shape != (height, width)
+        ):
+            raise ValueError(
+                f"Map pool has {map_pool.map_shape} maps, but the observation "
+                f"space expects {(height, width)}."
+            )
+        # The observations assume one bounded map, whatever config.WORLD_MODE says.
+        self.game = Game(
+            llm_client=None, map_pool=map_pool, map_size=map_size, world_mode="fixed"
+        )
         self.render_mode = render_mode
+        # Adds potential-based shaping from BFS distances to the next target.
+        self.reward_shaping = reward_shaping
 
         # Custom state for the quest progression
         self.visited_treasure_first = False
@@ -24,8 +56,20 @@ class FullQuestEnv(gym.Env):
         self.screen = None
         self.clock = None
         self.renderer = None
+        self.frame_renderer = None
+
+        # Rendering (and pygame) is only imported when a render mode asks for
+        # it, so headless workers start fast and stay small.
+        if self.render_mode == "rgb_array":
+            from game.renderers.frame_renderer import FrameRenderer
+
+            # Offscreen rendering; works on headless machines.
+            self.frame_renderer = FrameRenderer()
+        elif self.render_mode == "human":
+            import pygame
+
+            from game.renderers.renderer import Renderer
 
-        if self.render_mode == "human":
             pygame.init()
             self.screen = pygame.display.set_mode(
                 (config.SCREEN_WIDTH, config.SCREEN_HEIGHT)
@@ -42,53 +86,73 @@ class FullQuestEnv(gym.Env):
                 "grid": spaces.Box(
                     low=0,
                     high=1,
-                    shape=(config.GRID_HEIGHT, config.GRID_WIDTH, 6),
+                    shape=(height, width, 6),
                     dtype=np.uint8,
                 ),
                 "has_location_info": spaces.Discrete(2),
                 "visited_treasure_first": spaces.Discrete(2),
                 "has_password_info": spaces.Discrete(2),
                 "treasure_opened": spaces.Discrete(2),
-                "password": spaces.Discrete(10000)
             }
         )
+        # Static channels are written once per reset and only the player's
+        # cells change per step. With obs_views, observations are read-only
+        # views of the builder's buffers. obs_encoding picks the Dict above or
+        # a single flat or bit-packed uint8 Box (see OBS_ENCODINGS).
+        self.observation_builder = ObservationBuilder(
+            height,
+            width,
+            (
+                "has_location_info",
+                "visited_treasure_first",
+                "has_password_info",
+                "treasure_opened",
+            ),
+            views=obs_views,
+            encoding=obs_encoding,
+        )
+        self.observation_space = self.observation_builder.observation_space(
+            self.observation_space
+        )
 
-    def _get_obs(self):
-        grid_obs = np.zeros((config.GRID_HEIGHT, config.GRID_WIDTH, 6), dtype=np.uint8)
-        grid_np = np.array(self.game.grid)
-
-        grid_obs[:, :, 0] = grid_np == 1  # Walls
-        px, py = self.game.player_pos
-        grid_obs[py, px, 1] = 1  # Player
-
-        loc_npc_pos = self.game.npcs[0].pos
-        grid_obs[loc_npc_pos[1], loc_npc_pos[0], 2] = 1  # Location NPC
-
-        pw_npc_pos = self.game.npcs[1].pos
-        grid_obs[pw_npc_pos[1], pw_npc_pos[0], 3] = 1  # Password NPC
-
-        tx, ty = self.game.treasure_pos
-        grid_obs[ty, tx, 4] = 1  # Treasure
-
-        ex, ey = self.game.exit_pos
-        grid_obs[ey, ex, 5] = 1  # Exit
+    def set_map_size(self, width, height):
+        """Generates (width, height) maps from the next reset on.
+
+        Raises:
+            ValueError: If the observation encoding depends on the map size,
+                or the game resets from a map pool, whose maps have one size.
+        """
+        if self.game.map_pool is not None:
+            raise ValueError("The map size cannot change while resetting from a map pool.")
+        if self.observation_builder.encoding != "egocentric" and (
+            self.game.tiles.shape != (height, width)
+        ):
+            raise ValueError(
+                "Only the egocentric observation encoding supports changing the "
+                "map size."
+            )
+        self.game.map_size = (width, height)
 
-        return {
-            "grid": grid_obs,
-            "has_location_info": int(self.game.knows_location),
-            "visited_treasure_first": int(self.visited_treasure_first),
-            "has_password_info": int(self.game.knows_password),
-            "treasure_opened": int(self.game.treasure_opened),
-        }
+    def _get_obs(self):
+        builder = self.observation_builder
+        builder.move_player(self.game.player_pos)
+        builder.set_scalars(
+            self.game.knows_location,
+            self.visited_treasure_first,
+            self.game.knows_password,
+            self.game.treasure_opened,
+        )
+        return builder.build()
 
     def reset(self, seed=None, options=None):
         super().reset(seed=seed)
-        self.game.reset()
+        self.game.reset(seed=seed)
         self.game.knows_location = False
         self.game.knows_password = False
         self.game.treasure_opened = False
         self.visited_treasure_first = False
 
+        self.observation_builder.reset(self.game)
         observation = self._get_obs()
         info = {}
         if self.render_mode == "human":
@@ -99,6 +163,9 @@ class FullQuestEnv(gym.Env):
         if isinstance(action, np.ndarray):
             action = action.item()
 
+        if self.reward_shaping:
+            potential = quest_potential(self.game, self.visited_treasure_first)
+
         self.prev_pos = self.game.player_pos
         action_name = self.action_map[action]
         self.game.step(action_name)
@@ -113,7 +180,9 @@ class FullQuestEnv(gym.Env):
         # 1. Visit Location NPC
         if (
             not self.game.knows_location
-            and self.game.is_adjacent(player_pos, self.game.npcs[0].pos)
+            and self.game.is_adjacent(
+                player_pos, self.game.npc_by_role(NPCRole.LOCATION_INFORMANT).pos
+            )
             and action == 4
         ):
             self.game.knows_location = True
@@ -134,7 +203,9 @@ class FullQuestEnv(gym.Env):
         elif (
             self.visited_treasure_first
             and not self.game.knows_password
-            and self.game.is_adjacent(player_pos, self.game.npcs[1].pos)
+            and self.game.is_adjacent(
+                player_pos, self.game.npc_by_role(NPCRole.PASSWORD_EXPERT).pos
+            )
             and action == 4
         ):
             self.game.knows_password = True
@@ -152,8 +223,12 @@ class FullQuestEnv(gym.Env):
 
         # Penalty for out-of-order actions
         elif (
-            self.game.is_adjacent(player_pos, self.game.npcs[0].pos)
-            or self.game.is_adjacent(player_pos, self.game.npcs[1].pos)
+            self.game.is_adjacent(
+                player_pos, self.game.npc_by_role(NPCRole.LOCATION_INFORMANT).pos
+            )
+            or self.game.is_adjacent(
+                player_pos, self.game.npc_by_role(NPCRole.PASSWORD_EXPERT).pos
+            )
             or self.game.is_adjacent(player_pos, self.game.treasure_pos)
         ) and action == 4:
             reward -= 0.5
@@ -167,6 +242,13 @@ class FullQuestEnv(gym.Env):
             else:
                 reward -= 1  # Penalty for reaching exit without opening treasure
 
+        if self.reward_shaping:
+            reward += shaping_reward(
+                potential,
+                quest_potential(self.game, self.visited_treasure_first),
+                terminated,
+            )
+
         observation = self._get_obs()
         info = {}
 
@@ -176,9 +258,13 @@ class FullQuestEnv(gym.Env):
         return observation, reward, terminated, False, info
 
     def render(self):
+        if self.render_mode == "rgb_array":
+            return self.frame_renderer.render(self.game)
         if self.render_mode == "human":
             if self.renderer is None:
                 return
+            import pygame
+
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     pass
@@ -188,6 +274,10 @@ class FullQuestEnv(gym.Env):
                 self.clock.tick(self.metadata["render_fps"])
 
     def close(self):
+        self.game.close()
+        self.frame_renderer = None
         if self.screen is not None:
+            import pygame
+
             pygame.display.quit()
             pygame.quit()
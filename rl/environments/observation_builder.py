@@ -0,0 +1,285 @@
+from collections.abc import Sequence
+
+import numpy as np
+from gymnasium import spaces
+
+from configs import config
+from game.actors.npc import NPCRole
+from game.games.game import Game
+
+# Channels of the grid observation.
+WALL_CHANNEL, PLAYER_CHANNEL, LOCATION_NPC_CHANNEL = 0, 1, 2
+TREASURE_CHANNEL, EXIT_CHANNEL = 4, 5
+GRID_CHANNELS: int = 6
+
+# "dict": the grid Box plus one Discrete per scalar.
+# "flat": one uint8 Box, the flattened grid followed by the scalars.
+# "packed": one uint8 Box, the grid bit-packed (np.packbits order) followed by
+#   the scalars; decode it with rl.policies.feature_extractors.PackedGridExtractor.
+# "egocentric": a Dict of a fixed-size crop centred on the player ("local"), a
+#   coarse summary of the whole map ("global") and the scalars. Its shape does
+#   not depend on the map size.
+OBS_ENCODINGS: tuple[str, ...] = ("dict", "flat", "packed", "egocentric")
+
+
+def packed_grid_bytes(height: int, width: int) -> int:
+    """Returns the bytes taken by a bit-packed (H, W, 6) grid."""
+    return -(-height * width * GRID_CHANNELS // 8)
+
+
+class ObservationBuilder:
+    """Builds FullQuestEnv observations into preallocated buffers.
+
+    Walls, NPCs, the treasure and the exit do not move during an episode, so
+    their channels are written once per reset; each step only clears the
+    player's old cell and sets the new one, and scalar entries are updated in
+    place. With the "flat" and "packed" encodings (see OBS_ENCODINGS) the
+    whole observation is one uint8 vector that is updated the same way.
+
+    The "egocentric" encoding keeps the grid inside a wall-padded buffer, so
+    the local crop is a plain slice however close the player is to the edge.
+    The global summary pools the map into config.EGO_SUMMARY_SIZE squared
+    cells once per reset (wall fraction, and presence for the other
+    channels); each step only moves the player's summary cell. The map may
+    change size between resets, so one policy can play any map size at a
+    constant cost per step.
+
+    By default ``build`` returns a fresh copy. With ``views=True`` it returns
+    read-only views of the buffers instead, which change on the next step or
+    reset: use them only when the consumer copies every observation before
+    stepping again (e.g. SharedMemoryVecEnv). Wrappers that keep the terminal
+    observation across the auto-reset, such as DummyVecEnv and SubprocVecEnv,
+    need the copies.
+
+    Attributes:
+        grid (np.ndarray): The (H, W, 6) uint8 grid buffer.
+        encoding (str): The observation encoding.
+    """
+
+    def __init__(
+        self,
+        height: int,
+        width: int,
+        scalar_keys: Sequence[str],
+        views: bool = False,
+        encoding: str = "dict",
+    ) -> None:
+        """Initializes the ObservationBuilder.
+
+        Args:
+            height (int): The grid height.
+            width (int): The grid width.
+            scalar_keys (Sequence[str]): The integer entries of the observation,
+                in order.
+            views (bool): Returns read-only views instead of copies.
+            encoding (str): One of OBS_ENCODINGS.
+
+        Raises:
+            ValueError: If the encoding is unknown.
+        """
+        if encoding not in OBS_ENCODINGS:
+            raise ValueError(
+                f"Unknown observation encoding {encoding!r}; expected one of {OBS_ENCODINGS}."
+            )
+        self.encoding: str = encoding
+        self._scalar_keys: tuple[str, ...] = tuple(scalar_keys)
+        self._views: bool = views
+        self._player: tuple[int, int] | None = None
+        grid_size = height * width * GRID_CHANNELS
+        self._width: int = width
+
+        self._vector: np.ndarray | None = None
+        if encoding == "egocentric":
+            radius, size = config.EGO_VIEW_RADIUS, config.EGO_SUMMARY_SIZE
+            self._radius: int = radius
+            self._local: np.ndarray = np.zeros(
+                (2 * radius + 1, 2 * radius + 1, GRID_CHANNELS), dtype=np.uint8
+            )
+            self._summary: np.ndarray = np.zeros(
+                (size, size, GRID_CHANNELS), dtype=np.float32
+            )
+            self._scalars = np.zeros(len(self._scalar_keys), dtype=np.int64)
+            self._allocate_padded(height, width)
+        elif encoding == "flat":
+            # The grid and the scalars are views into the vector itself.
+            self._vector = np.zeros(grid_size + len(self._scalar_keys), dtype=np.uint8)
+            self.grid: np.ndarray = self._vector[:grid_size].reshape(
+                height, width, GRID_CHANNELS
+            )
+            self._scalars: np.ndarray = self._vector[grid_size:]
+        else:
+            self.grid = np.zeros((height, width, GRID_CHANNELS), dtype=np.uint8)
+            self._scalars = np.zeros(len(self._scalar_keys), dtype=np.int64)
+        if encoding == "packed":
+            packed_size = packed_grid_bytes(height, width)
+            self._vector = np.zeros(packed_size + len(self._scalar_keys), dtype=np.uint8)
+            self._packed: np.ndarray = self._vector[:packed_size]
+            self._scalars = self._vector[packed_size:]
+
+        if views:
+            if self._vector is not None:
+                vector = self._vector.view()
+                vector.flags.writeable = False
+                self._observation = vector
+            else:
+                if encoding == "egocentric":
+                    arrays = {"local": self._local, "global": self._summary}
+                else:
+                    arrays = {"grid": self.grid}
+                self._observation = {}
+                for key, array in arrays.items():
+                    view = array.view()
+                    view.flags.writeable = False
+                    self._observation[key] = view
+                for i, key in enumerate(self._scalar_keys):
+                    scalar = self._scalars[i, ...]  # A 0-d view
+                    scalar.flags.writeable = False
+                    self._observation[key] = scalar
+
+    def observation_space(self, dict_space: spaces.Dict) -> spaces.Space:
+        """Returns the observation space of this builder's encoding.
+
+        Args:
+            dict_space (spaces.Dict): The env's "dict" encoding space, with
+                the grid Box and one Discrete per scalar key.
+
+        Returns:
+            spaces.Space: `dict_space` itself, or the space of the encoding.
+        """
+        if self.encoding == "dict":
+            return dict_space
+        if self.encoding == "egocentric":
+            return spaces.Dict(
+                {
+                    "local": spaces.Box(0, 1, self._local.shape, dtype=np.uint8),
+                    "global": spaces.Box(0, 1, self._summary.shape, dtype=np.float32),
+                    **{key: dict_space[key] for key in self._scalar_keys},
+                }
+            )
+        scalar_high = [dict_space[key].n - 1 for key in self._scalar_keys]
+        if self.encoding == "flat":
+            grid_high = [1] * self.grid.size
+        else:
+            grid_high = [255] * len(self._packed)
+        high = np.array(grid_high + scalar_high, dtype=np.uint8)
+        return spaces.Box(low=0, high=high, dtype=np.uint8)
+
+    def reset(self, game: Game) -> None:
+        """Writes the static channels and the player for a new episode.
+
+        Args:
+            game (Game): The game, just reset.
+        """
+        if self.encoding == "egocentric" and game.tiles.shape != self.grid.shape[:2]:
+            self._allocate_padded(*game.tiles.shape)
+        grid = self.grid
+        grid.fill(0)
+        grid[:, :, WALL_CHANNEL] = game.tiles  # Tiles are 1 for walls, 0 for paths
+
+        # Location NPC (channel 2) and password NPC (channel 3)
+        npc_pos = game.npcs.positions
+        roles = game.npcs.type_ids
+        quest = roles <= NPCRole.PASSWORD_EXPERT
+        grid[npc_pos[quest, 1], npc_pos[quest, 0], LOCATION_NPC_CHANNEL + roles[quest]] = 1
+
+        tx, ty = game.treasure_pos
+        grid[ty, tx, TREASURE_CHANNEL] = 1
+        ex, ey = game.exit_pos
+        grid[ey, ex, EXIT_CHANNEL] = 1
+
+        self._player = None
+        if self.encoding == "packed":
+            # The player bit is set below, like on any other step.
+            self._packed[:] = np.packbits(grid)
+        elif self.encoding == "egocentric":
+            self._summarize()
+        self.move_player(game.player_pos)
+
+    def _allocate_padded(self, height: int, width: int) -> None:
+        """Allocates the wall-padded grid of the egocentric encoding."""
+        radius = self._radius
+        self._padded: np.ndarray = np.zeros(
+            (height + 2 * radius, width + 2 * radius, GRID_CHANNELS), dtype=np.uint8
+        )
+        self._padded[:, :, WALL_CHANNEL] = 1  # Everything off the map is wall
+        self.grid = self._padded[radius : radius + height, radius : radius + width]
+        self._width = width
+        size = self._summary.shape[0]
+        # The summary cell of every map row and column.
+        self._row_bins: np.ndarray = np.arange(height) * size // height
+        self._col_bins: np.ndarray = np.arange(width) * size // width
+
+    def _summarize(self) -> None:
+        """Pools the static channels of the grid into the global summary."""
+        size = self._summary.shape[0]
+        cells = (self._row_bins[:, None] * size + self._col_bins[None, :]).ravel()
+        counts = np.maximum(np.bincount(cells, minlength=size * size), 1)
+        summary = self._summary.reshape(size * size, GRID_CHANNELS)
+        for channel in range(GRID_CHANNELS):
+            if channel == PLAYER_CHANNEL:
+                summary[:, channel] = 0  # Set by move_player
+                continue
+            sums = np.bincount(
+                cells, weights=self.grid[:, :, channel].ravel(), minlength=size * size
+            )
+            summary[:, channel] = sums / counts if channel == WALL_CHANNEL else sums > 0
+
+    def move_player(self, pos: tuple[int, int]) -> None:
+        """Moves the player marker, touching only the old and new cells."""
+        if pos == self._player:
+            return
+        if self._player is not None:
+            self.grid[self._player[1], self._player[0], PLAYER_CHANNEL] = 0
+            if self.encoding == "packed":
+                self._set_packed_bit(self._player, 0)
+            elif self.encoding == "egocentric":
+                self._set_summary_player(self._player, 0)
+        self.grid[pos[1], pos[0], PLAYER_CHANNEL] = 1
+        if self.encoding == "packed":
+            self._set_packed_bit(pos, 1)
+        elif self.encoding == "egocentric":
+            self._set_summary_player(pos, 1)
+        self._player = pos
+
+    def _set_summary_player(self, pos: tuple[int, int], value: int) -> None:
+        """Marks or clears the player in its global summary cell."""
+        self._summary[self._row_bins[pos[1]], self._col_bins[pos[0]], PLAYER_CHANNEL] = value
+
+    def _set_packed_bit(self, pos: tuple[int, int], value: int) -> None:
+        """Sets the player bit of a cell in the packed grid."""
+        bit = (pos[1] * self._width + pos[0]) * GRID_CHANNELS + PLAYER_CHANNEL
+        mask = 0x80 >> (bit & 7)  # np.packbits is big-endian within a byte
+        if value:
+            self._packed[bit >> 3] |= mask
+        else:
+            self._packed[bit >> 3] &= ~mask & 0xFF
+
+    def set_scalars(self, *values: int) -> None:
+        """Sets the scalar entries, in the order of `scalar_keys`."""
+        self._scalars[:] = values
+
+    def build(self) -> dict[str, np.ndarray | int] | np.ndarray:
+        """Returns the observation.
+
+        Returns:
+            dict[str, np.ndarray | int] | np.ndarray: For "dict" and
+                "egocentric", copies of the arrays and plain ints; otherwise a
+                copy of the uint8 vector. With
+                ``views=True``, the same read-only views every call.
+        """
+        if self.encoding == "egocentric":
+            # The player sits at padded cell (y + r, x + r), so its crop starts at (y, x).
+            x, y = self._player
+            size = self._local.shape[0]
+            self._local[:] = self._padded[y : y + size, x : x + size]
+        if self._views:
+            return self._observation
+        if self._vector is not None:
+            return self._vector.copy()
+        if self.encoding == "egocentric":
+            observation = {"local": self._local.copy(), "global": self._summary.copy()}
+        else:
+            observation = {"grid": self.grid.copy()}
+        for key, value in zip(self._scalar_keys, self._scalars.tolist()):
+            observation[key] = value
+        return observation
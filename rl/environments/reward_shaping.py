@@ -0,0 +1,62 @@
+from configs import config
+from game.games.game import Game
+
+
+def quest_target(game: Game, visited_treasure_first: bool) -> str:
+    """Returns the quest target the agent should head for next.
+
+    Args:
+        game (Game): The game being played.
+        visited_treasure_first (bool): Whether the treasure was already found.
+
+    Returns:
+        str: A target name accepted by Game.distance_to.
+    """
+    if not game.knows_location:
+        return "location_npc"
+    if not visited_treasure_first:
+        return "treasure"
+    if not game.knows_password:
+        return "password_npc"
+    if not game.treasure_opened:
+        return "treasure"
+    return "exit"
+
+
+def quest_potential(game: Game, visited_treasure_first: bool) -> float:
+    """Returns the shaping potential of the current state.
+
+    The potential is the negative path distance to the next quest target,
+    normalized by the map area. Adding ``gamma * potential(s') - potential(s)``
+    to the reward (potential-based shaping) leaves the optimal policy unchanged.
+
+    Args:
+        game (Game): The game being played.
+        visited_treasure_first (bool): Whether the treasure was already found.
+
+    Returns:
+        float: The potential, at most 0.
+    """
+    distance = game.distance_to(quest_target(game, visited_treasure_first))
+    if distance < 0:
+        return 0.0
+    return -config.SHAPING_SCALE * distance / (game.width * game.height)
+
+
+def shaping_reward(
+    potential_before: float, potential_after: float, terminated: bool
+) -> float:
+    """Returns the potential-based shaping term for one transition.
+
+    Args:
+        potential_before (float): The potential before the step.
+        potential_after (float): The potential after the step.
+        terminated (bool): Whether the episode ended; terminal states have a
+            potential of zero.
+
+    Returns:
+        float: The reward to add.
+    """
+    if terminated:
+        potential_after = 0.0
+    return config.SHAPING_GAMMA * potential_after - potential_before
@@ -0,0 +1,299 @@
+import multiprocessing as mp
+from collections.abc import Callable
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+
+import gymnasium as gym
+import numpy as np
+from stable_baselines3.common.vec_env.base_vec_env import CloudpickleWrapper, VecEnv
+from stable_baselines3.common.vec_env.util import dict_to_obs, obs_space_info
+
+# Arrays in the shared block start on cache-line boundaries.
+_ALIGNMENT = 64
+
+
+def _buffer_specs(
+    num_envs: int, observation_space: gym.spaces.Space
+) -> list[tuple[Any, tuple[int, ...], np.dtype]]:
+    """Lists the (name, shape, dtype) of every array in the shared block.
+
+    Observations are double-buffered ("obs0" and "obs1") so the arrays handed
+    to the learner survive one more step; "terminal" holds the last
+    observation of the episodes that ended on the latest step.
+    """
+    keys, shapes, dtypes = obs_space_info(observation_space)
+    specs = []
+    for buffer in ("obs0", "obs1", "terminal"):
+        for key in keys:
+            specs.append(((buffer, key), (num_envs, *shapes[key]), np.dtype(dtypes[key])))
+    specs.append((("reward", None), (num_envs,), np.dtype(np.float32)))
+    specs.append((("done", None), (num_envs,), np.dtype(bool)))
+    return specs
+
+
+def _map_buffers(
+    shm: SharedMemory, specs: list[tuple[Any, tuple[int, ...], np.dtype]]
+) -> dict[Any, np.ndarray]:
+    """Returns NumPy views of the arrays laid out in a shared block."""
+    views, offset = {}, 0
+    for name, shape, dtype in specs:
+        offset = -(-offset // _ALIGNMENT) * _ALIGNMENT
+        views[name] = np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+        offset += int(np.prod(shape)) * dtype.itemsize
+    return views
+
+
+def _block_size(specs: list[tuple[Any, tuple[int, ...], np.dtype]]) -> int:
+    """Returns the bytes needed to lay out `specs` with _map_buffers."""
+    offset = 0
+    for _, shape, dtype in specs:
+        offset = -(-offset // _ALIGNMENT) * _ALIGNMENT
+        offset += int(np.prod(shape)) * dtype.itemsize
+    return max(offset, 1)
+
+
+def _write_obs(views: dict[Any, np.ndarray], buffer: str, keys: list, index: int, obs: Any) -> None:
+    """Copies one env's observation into its slot of a shared buffer."""
+    for key in keys:
+        views[buffer, key][index] = obs if key is None else obs[key]
+
+
+def _worker(
+    remote: mp.connection.Connection,
+    parent_remote: mp.connection.Connection,
+    env_fn_wrapper: CloudpickleWrapper,
+    index: int,
+) -> None:
+    """Runs one env; answers the commands of SharedMemoryVecEnv."""
+    from stable_baselines3.common.env_util import is_wrapped
+
+    parent_remote.close()
+    env = env_fn_wrapper.var()
+    shm, views, keys = None, {}, []
+    try:
+        while True:
+            cmd, data = remote.recv()
+            if cmd == "step":
+                action, buffer = data
+                observation, reward, terminated, truncated, info = env.step(action)
+                done = terminated or truncated
+                info["TimeLimit.truncated"] = truncated and not terminated
+                reset_info = {}
+                if done:
+                    _write_obs(views, "terminal", keys, index, observation)
+                    observation, reset_info = env.reset()
+                _write_obs(views, buffer, keys, index, observation)
+                views["reward", None][index] = reward
+                views["done", None][index] = done
+                # Only the (usually empty) info dicts go through the pipe.
+                remote.send((info, reset_info))
+            elif cmd == "reset":
+                seed, options, buffer = data
+                maybe_options = {"options": options} if options else {}
+                observation, reset_info = env.reset(seed=seed, **maybe_options)
+                _write_obs(views, buffer, keys, index, observation)
+                remote.send(reset_info)
+            elif cmd == "attach":
+                name, specs = data
+                shm = SharedMemory(name=name)
+                views = _map_buffers(shm, specs)
+                keys = obs_space_info(env.observation_space)[0]
+                remote.send(None)
+            elif cmd == "render":
+                remote.send(env.render())
+            elif cmd == "close":
+                env.close()
+                remote.close()
+                break
+            elif cmd == "get_spaces":
+                remote.send((env.observation_space, env.action_space))
+            elif cmd == "env_method":
+                method = env.get_wrapper_attr(data[0])
+                remote.send(method(*data[1], **data[2]))
+            elif cmd == "get_attr":
+                remote.send(env.get_wrapper_attr(data))
+            elif cmd == "has_attr":
+                try:
+                    env.get_wrapper_attr(data)
+                    remote.send(True)
+                except AttributeError:
+                    remote.send(False)
+            elif cmd == "set_attr":
+                remote.send(setattr(env, data[0], data[1]))
+            elif cmd == "is_wrapped":
+                remote.send(is_wrapped(env, data))
+            else:
+                raise NotImplementedError(f"`{cmd}` is not implemented in the worker")
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        views.clear()
+        if shm is not None:
+            shm.close()
+
+
+class SharedMemoryVecEnv(VecEnv):
+    """A subprocess VecEnv that passes observations through shared memory.
+
+    Like SB3's SubprocVecEnv, each env runs in its own process. Instead of
+    pickling observations through a pipe, workers write them straight into
+    their slot of a preallocated ``multiprocessing.shared_memory`` block, and
+    the learner reads them as zero-copy NumPy views. The pipes carry only
+    actions, info dicts and control messages.
+
+    Observations are double-buffered: the arrays returned by ``reset`` or
+    ``step`` stay valid until the next-but-one call, which is what SB3's
+    on-policy algorithms need (they store the previous observation after
+    stepping). Copy them to keep them longer. Terminal observations in infos
+    are copies.
+
+    Attributes:
+        processes (list[mp.Process]): The worker processes.
+    """
+
+    def __init__(
+        self, env_fns: list[Callable[[], gym.Env]], start_method: str | None = None
+    ) -> None:
+        """Initializes the SharedMemoryVecEnv.
+
+        Args:
+            env_fns (list[Callable[[], gym.Env]]): Functions that build the envs;
+                each runs in its worker.
+            start_method (str | None): The multiprocessing start method ("fork",
+                "forkserver" or "spawn"). Defaults to forkserver where
+                available, like SubprocVecEnv.
+        """
+        self.waiting = False
+        self.closed = False
+        if start_method is None:
+            forkserver_available = "forkserver" in mp.get_all_start_methods()
+            start_method = "forkserver" if forkserver_available else "spawn"
+        ctx = mp.get_context(start_method)
+        # Workers must share this process's resource tracker; one started
+        # later inside a worker would unlink the block when the worker exits.
+        resource_tracker.ensure_running()
+
+        self.remotes, work_remotes = zip(*[ctx.Pipe() for _ in env_fns])
+        self.processes = []
+        for index, (work_remote, remote, env_fn) in enumerate(
+            zip(work_remotes, self.remotes, env_fns)
+        ):
+            args = (work_remote, remote, CloudpickleWrapper(env_fn), index)
+            # daemon=True: if the main process crashes, we should not cause things to hang
+            process = ctx.Process(target=_worker, args=args, daemon=True)
+            process.start()
+            self.processes.append(process)
+            work_remote.close()
+
+        self.remotes[0].send(("get_spaces", None))
+        observation_space, action_space = self.remotes[0].recv()
+        super().__init__(len(env_fns), observation_space, action_space)
+
+        specs = _buffer_specs(self.num_envs, observation_space)
+        self._shm = SharedMemory(create=True, size=_block_size(specs))
+        self._views = _map_buffers(self._shm, specs)
+        self._keys = obs_space_info(observation_space)[0]
+        for remote in self.remotes:
+            remote.send(("attach", (self._shm.name, specs)))
+        for remote in self.remotes:
+            remote.recv()
+        self._buffer = 0
+        self._step_buffer = "obs0"
+
+    def _flip(self) -> str:
+        """Switches to the other observation buffer and returns its name."""
+        self._buffer ^= 1
+        return f"obs{self._buffer}"
+
+    def _obs(self, buffer: str) -> Any:
+        return dict_to_obs(
+            self.observation_space, {key: self._views[buffer, key] for key in self._keys}
+        )
+
+    def reset(self) -> Any:
+        buffer = self._flip()
+        for index, remote in enumerate(self.remotes):
+            remote.send(("reset", (self._seeds[index], self._options[index], buffer)))
+        self.reset_infos = [remote.recv() for remote in self.remotes]
+        # Seeds and options are only used once
+        self._reset_seeds()
+        self._reset_options()
+        return self._obs(buffer)
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self._step_buffer = self._flip()
+        for remote, action in zip(self.remotes, actions):
+            remote.send(("step", (action, self._step_buffer)))
+        self.waiting = True
+
+    def step_wait(self):
+        results = [remote.recv() for remote in self.remotes]
+        self.waiting = False
+        infos = [info for info, _ in results]
+        self.reset_infos = [reset_info for _, reset_info in results]
+        dones = self._views["done", None].copy()
+        for index in np.flatnonzero(dones):
+            terminal = {key: self._views["terminal", key][index].copy() for key in self._keys}
+            infos[index]["terminal_observation"] = dict_to_obs(
+                self.observation_space, terminal
+            )
+        return (
+            self._obs(self._step_buffer),
+            self._views["reward", None].copy(),
+            dones,
+            infos,
+        )
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        if self.waiting:
+            for remote in self.remotes:
+                remote.recv()
+        for remote in self.remotes:
+            remote.send(("close", None))
+        for process in self.processes:
+            process.join()
+        self._views = {}
+        try:
+            self._shm.close()
+        except BufferError:
+            pass  # Observations handed out are still alive; unlinking is enough.
+        self._shm.unlink()
+        self.closed = True
+
+    def get_images(self) -> list[np.ndarray | None]:
+        for remote in self.remotes:
+            remote.send(("render", None))
+        return [remote.recv() for remote in self.remotes]
+
+    def has_attr(self, attr_name: str) -> bool:
+        for remote in self.remotes:
+            remote.send(("has_attr", attr_name))
+        return all([remote.recv() for remote in self.remotes])
+
+    def get_attr(self, attr_name: str, indices=None) -> list[Any]:
+        remotes = [self.remotes[i] for i in self._get_indices(indices)]
+        for remote in remotes:
+            remote.send(("get_attr", attr_name))
+        return [remote.recv() for remote in remotes]
+
+    def set_attr(self, attr_name: str, value: Any, indices=None) -> None:
+        remotes = [self.remotes[i] for i in self._get_indices(indices)]
+        for remote in remotes:
+            remote.send(("set_attr", (attr_name, value)))
+        for remote in remotes:
+            remote.recv()
+
+    def env_method(self, method_name: str, *method_args, indices=None, **method_kwargs) -> list[Any]:
+        remotes = [self.remotes[i] for i in self._get_indices(indices)]
+        for remote in remotes:
+            remote.send(("env_method", (method_name, method_args, method_kwargs)))
+        return [remote.recv() for remote in remotes]
+
+    def env_is_wrapped(self, wrapper_class: type[gym.Wrapper], indices=None) -> list[bool]:
+        remotes = [self.remotes[i] for i in self._get_indices(indices)]
+        for remote in remotes:
+            remote.send(("is_wrapped", wrapper_class))
+        return [remote.recv() for remote in remotes]
@@ -0,0 +1,291 @@
+from typing import NamedTuple
+
+import numpy as np
+from gymnasium.wrappers import TimeLimit
+from stable_baselines3.common.base_class import BaseAlgorithm
+from stable_baselines3.common.policies import BasePolicy
+from stable_baselines3.common.vec_env import DummyVecEnv, VecEnv
+
+from configs import config
+from game.maps.layout import PLAYER, batch_quest_lengths
+from rl.environments.batched_full_quest_env import BatchedFullQuestEnv
+from rl.environments.full_quest_env_pass import FullQuestEnv
+from rl.trajectories import env_checksum, save_trajectories, state_checksum
+
+# Besides moving, the optimal quest takes four interactions (location NPC,
+# treasure, password NPC, treasure) and one password digit.
+QUEST_ACTIONS: int = 5
+# Which finished episodes `evaluate` keeps the actions and rewards of.
+RECORD_MODES: tuple[str, ...] = ("failures", "successes", "all")
+# Optimal quest lengths are computed in batches of this many layouts.
+_QUEST_LENGTH_BATCH: int = 1024
+
+
+class EvaluationResult(NamedTuple):
+    """Per-episode outcomes of an evaluation, indexed by episode.
+
+    Episode k is played on the layout of ``FullQuestEnv.reset(seed=seeds[k])``,
+    so any episode can be replayed alone from its seed and actions.
+
+    Attributes:
+        seeds (np.ndarray): The (E,) episode seeds.
+        success (np.ndarray): The (E,) flags of episodes that finished the
+            quest rather than hit the time limit.
+        steps (np.ndarray): The (E,) episode lengths.
+        returns (np.ndarray): The (E,) undiscounted episode returns.
+        optimal_steps (np.ndarray): The (E,) fewest steps that finish each
+            quest, or -1 where the quest cannot be finished.
+        recorded (dict[int, tuple[np.ndarray, np.ndarray, np.ndarray]]): The
+            (actions, rewards, state checksums) of the recorded episodes, by
+            episode index. Checksums are taken every
+            config.TRAJECTORY_CHECKSUM_INTERVAL steps.
+    """
+
+    seeds: np.ndarray
+    success: np.ndarray
+    steps: np.ndarray
+    returns: np.ndarray
+    optimal_steps: np.ndarray
+    recorded: dict[int, tuple[np.ndarray, np.ndarray, np.ndarray]]
+
+    def summary(self) -> str:
+        """Returns the success rate, step efficiency and return distribution."""
+        lines = [f"Episodes: {len(self.seeds)}"]
+        lines.append(f"Success rate: {self.success.mean():.1%}")
+        solved = self.success & (self.optimal_steps > 0)
+        if solved.any():
+            steps, optimal = self.steps[solved], self.optimal_steps[solved]
+            lines.append(
+                f"Steps (successes): mean {steps.mean():.1f}, median "
+                f"{np.median(steps):.0f}; optimal mean {optimal.mean():.1f}; "
+                f"steps / optimal mean {(steps / optimal).mean():.2f}"
+            )
+        percentiles = np.percentile(self.returns, [0, 5, 25, 50, 75, 95, 100])
+        lines.append(
+            f"Return: mean {self.returns.mean():.2f}, std {self.returns.std():.2f}; "
+            "min/p5/p25/p50/p75/p95/max "
+            + "/".join(f"{value:.1f}" for value in percentiles)
+        )
+        return "\n".join(lines)
+
+
+def make_eval_env(
+    n_envs: int,
+    max_episode_steps: int,
+    obs_encoding: str = "dict",
+    map_size: int | None = None,
+    map_pool: str | None = None,
+) -> VecEnv:
+    """Builds headless envs for `evaluate`.
+
+    The "dict" encoding on the configured map size uses BatchedFullQuestEnv,
+    which steps every game at once; anything else uses a DummyVecEnv of
+    FullQuestEnv.
+
+    Args:
+        n_envs (int): The number of games played at once.
+        max_episode_steps (int): Episodes fail after this many steps.
+        obs_encoding (str): The observation encoding the model was trained on.
+        map_size (int | None): The side of the square maps to generate;
+            defaults to the configured grid size.
+        map_pool (str | None): A map pool directory to sample layouts from.
+
+    Returns:
+        VecEnv: The environment.
+    """
+    if obs_encoding == "dict" and map_size is None:
+        return BatchedFullQuestEnv(
+            n_envs, map_pool=map_pool, max_episode_steps=max_episode_steps
+        )
+
+    def _init() -> FullQuestEnv:
+        env = FullQuestEnv(
+            map_pool=map_pool,
+            obs_encoding=obs_encoding,
+            map_size=(map_size, map_size) if map_size else None,
+        )
+        return TimeLimit(env, max_episode_steps=max_episode_steps)
+
+    return DummyVecEnv([_init] * n_envs)
+
+
+def _seed_next_episode(env: VecEnv, index: int, seed: int) -> None:
+    """Seeds the layout of the episode env `index` auto-resets into next."""
+    if isinstance(env, BatchedFullQuestEnv):
+        env.seed_next_episode(index, seed)
+    else:
+        env.envs[index].unwrapped.game.rng = np.random.default_rng(seed)
+
+
+def _checksum(env: VecEnv, index: int) -> int:
+    """Returns the state checksum of env `index` (see rl.trajectories)."""
+    if isinstance(env, BatchedFullQuestEnv):
+        return state_checksum(
+            env.positions[index, PLAYER].tolist(),
+            env.knows_location[index],
+            env.visited_treasure_first[index],
+            env.knows_password[index],
+            env.treasure_opened[index],
+            env.password_input_mode[index],
+        )
+    return env_checksum(env.envs[index])
+
+
+def _current_layout(env: VecEnv, index: int) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the tiles and object positions env `index` started its episode on."""
+    if isinstance(env, BatchedFullQuestEnv):
+        return env.tiles[index].copy(), env.positions[index].copy()
+    layout = env.envs[index].unwrapped.game.layout
+    return layout.tiles, layout.positions
+
+
+class _OptimalSteps:
+    """Fills in the optimal steps of episodes, a batch of layouts at a time."""
+
+    def __init__(self, optimal_steps: np.ndarray) -> None:
+        self._optimal_steps = optimal_steps
+        self._pending: list[tuple[int, np.ndarray, np.ndarray]] = []
+
+    def add(self, episode: int, tiles: np.ndarray, positions: np.ndarray) -> None:
+        self._pending.append((episode, tiles, positions))
+        if len(self._pending) >= _QUEST_LENGTH_BATCH:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        episodes, tiles, positions = zip(*self._pending)
+        moves = batch_quest_lengths(np.stack(tiles), np.stack(positions))
+        self._optimal_steps[list(episodes)] = np.where(
+            moves < 0, -1, moves + QUEST_ACTIONS
+        )
+        self._pending.clear()
+
+
+def evaluate(
+    model: BaseAlgorithm | BasePolicy,
+    env: VecEnv,
+    n_episodes: int,
+    seed: int = 0,
+    deterministic: bool = True,
+    record: str | None = None,
+) -> EvaluationResult:
+    """Plays episodes on every env at once, with one batched predict per step.
+
+    Episode k is seeded with seed + k, and env i plays episodes i, i + N,
+    i + 2N, ... So the evaluated layouts do not depend on the policy or the
+    number of envs, and envs that run out of episodes keep stepping
+    unrecorded until the others finish.
+
+    Args:
+        model (BaseAlgorithm | BasePolicy): The agent; anything with SB3's
+            ``predict``.
+        env (VecEnv): Envs from `make_eval_env`.
+        n_episodes (int): The number of episodes to play.
+        seed (int): The seed of the first episode.
+        deterministic (bool): Takes the most likely actions.
+        record (str | None): Keeps the actions, rewards and state checksums
+            of the "failures", the "successes" or "all" episodes.
+
+    Returns:
+        EvaluationResult: The outcome of every episode.
+
+    Raises:
+        ValueError: If the record mode is unknown.
+    """
+    if record is not None and record not in RECORD_MODES:
+        raise ValueError(f"Unknown record mode {record!r}; expected one of {RECORD_MODES}.")
+    n = env.num_envs
+    seeds = seed + np.arange(n_episodes)
+    success = np.zeros(n_episodes, dtype=bool)
+    steps = np.zeros(n_episodes, dtype=np.int64)
+    returns = np.zeros(n_episodes, dtype=np.float64)
+    optimal = np.full(n_episodes, -1, dtype=np.int64)
+    recorded: dict[int, tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+    interval = config.TRAJECTORY_CHECKSUM_INTERVAL
+
+    env.seed(seed)
+    observations = env.reset()
+    episodes = np.arange(n)  # The episode each env is playing
+    optimal_steps = _OptimalSteps(optimal)
+    for i in range(min(n, n_episodes)):
+        optimal_steps.add(i, *_current_layout(env, i))
+        _seed_next_episode(env, i, seed + i + n)
+    episode_steps = np.zeros(n, dtype=np.int64)
+    episode_returns = np.zeros(n, dtype=np.float64)
+    # The actions, rewards and checksums of each env's current episode, when
+    # recording.
+    actions_log: list[list[int]] = [[] for _ in range(n)]
+    rewards_log: list[list[float]] = [[] for _ in range(n)]
+    checksums_log: list[list[int]] = [[] for _ in range(n)]
+
+    while (episodes < n_episodes).any():
+        actions, _ = model.predict(observations, deterministic=deterministic)
+        observations, rewards, dones, infos = env.step(actions)
+        if record is not None:
+            for log, action in zip(actions_log, actions.tolist()):
+                log.append(action)
+            for log, reward in zip(rewards_log, rewards.tolist()):
+                log.append(reward)
+        episode_steps += 1
+        if record is not None and interval > 0:
+            # A done env already holds its next episode, so the last step of
+            # an episode never gets a checksum.
+            for i in np.flatnonzero((episode_steps % interval == 0) & ~dones).tolist():
+                checksums_log[i].append(_checksum(env, i))
+        episode_returns += rewards
+        for i in np.flatnonzero(dones).tolist():
+            k = episodes[i]
+            if k < n_episodes:
+                success[k] = not infos[i].get("TimeLimit.truncated", False)
+                steps[k], returns[k] = episode_steps[i], episode_returns[i]
+                if record == "all" or (
+                    record is not None and (record == "successes") == success[k]
+                ):
+                    recorded[k] = (
+                        np.array(actions_log[i], dtype=np.uint8),
+                        np.array(rewards_log[i], dtype=np.float32),
+                        np.array(checksums_log[i], dtype=np.uint32),
+                    )
+            episodes[i] = k = k + n
+            if k < n_episodes:
+                optimal_steps.add(k, *_current_layout(env, i))
+                _seed_next_episode(env, i, seed + k + n)
+            episode_steps[i], episode_returns[i] = 0, 0.0
+            actions_log[i].clear()
+            rewards_log[i].clear()
+            checksums_log[i].clear()
+    optimal_steps.flush()
+    return EvaluationResult(seeds, success, steps, returns, optimal, recorded)
+
+
+def save_recording(
+    path: str,
+    result: EvaluationResult,
+    map_size: int | None = None,
+    map_pool: str | None = None,
+) -> None:
+    """Saves the recorded episodes with rl.trajectories.save_trajectories.
+
+    Besides the built-in columns, the file gets "optimal_steps". Replay or
+    render the episodes with rl/replay_trajectories.py.
+
+    Args:
+        path (str): The output file.
+        result (EvaluationResult): An evaluation run with `record` set.
+        map_size (int | None): The map size the envs were made with.
+        map_pool (str | None): The map pool the envs were made with.
+    """
+    indices = sorted(result.recorded)
+    episodes = [result.recorded[k] for k in indices]
+    save_trajectories(
+        path,
+        result.seeds[indices],
+        result.success[indices],
+        [actions for actions, _, _ in episodes],
+        [rewards for _, rewards, _ in episodes],
+        [checksums for _, _, checksums in episodes],
+        map_size=map_size,
+        map_pool=map_pool,
+        optimal_steps=result.optimal_steps[indices],
+    )
@@ -0,0 +1,44 @@
+import torch
+from gymnasium import spaces
+from stable_baselines3.common.torch_layers import BaseFeaturesExtractor
+
+from configs import config
+from rl.environments.observation_builder import GRID_CHANNELS, packed_grid_bytes
+
+
+class PackedGridExtractor(BaseFeaturesExtractor):
+    """Unpacks the "packed" FullQuestEnv observation encoding.
+
+    The observation is a bit-packed (H, W, 6) grid followed by the scalar
+    entries. The features are the unpacked grid bits followed by the
+    scalars, the same values the "flat" encoding holds, so the policy sees
+    identical inputs while rollout buffers store an eighth of the grid.
+
+    Use it with MlpPolicy:
+    ``PPO("MlpPolicy", env, policy_kwargs={"features_extractor_class": PackedGridExtractor})``.
+    """
+
+    def __init__(
+        self,
+        observation_space: spaces.Box,
+        height: int = config.GRID_HEIGHT,
+        width: int = config.GRID_WIDTH,
+    ) -> None:
+        """Initializes the PackedGridExtractor.
+
+        Args:
+            observation_space (spaces.Box): The packed observation space.
+            height (int): The grid height.
+            width (int): The grid width.
+        """
+        self._grid_bits = height * width * GRID_CHANNELS
+        self._packed_bytes = packed_grid_bytes(height, width)
+        scalars = observation_space.shape[0] - self._packed_bytes
+        super().__init__(observation_space, features_dim=self._grid_bits + scalars)
+        self.register_buffer("_shifts", torch.arange(7, -1, -1, dtype=torch.uint8))
+
+    def forward(self, observations: torch.Tensor) -> torch.Tensor:
+        packed = observations[:, : self._packed_bytes].to(torch.uint8)
+        bits = (packed.unsqueeze(-1) >> self._shifts) & 1
+        grid = bits.flatten(1)[:, : self._grid_bits].float()
+        return torch.cat([grid, observations[:, self._packed_bytes :]], dim=1)
@@ -0,0 +1,139 @@
+"""Replays recorded episodes and renders them headlessly.
+
+Episodes saved by rl/run_full_quest.py --record (see rl/trajectories.py) are
+replayed through FullQuestEnv from their seed and actions, and every reward
+and state checksum is checked against the recording. Filters pick episodes by
+outcome, length and return. The matches can be listed, only verified, or
+rendered at full speed to PNG frames or to one MP4 video per episode.
+
+Usage:
+    python rl/replay_trajectories.py rl/logs/eval_episodes.npz --list [--failures] [--min-steps 100]
+    python rl/replay_trajectories.py rl/logs/eval_episodes.npz --failures --limit 5 --frames rl/replays
+    python rl/replay_trajectories.py rl/logs/eval_episodes.npz --video rl/replays [--fps 10]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from rl.environments.full_quest_env_pass import FullQuestEnv
+from rl.trajectories import Trajectories, Trajectory, replay
+
+
+def _save_frames(directory: str, frames: list[np.ndarray]) -> None:
+    """Writes the frames of an episode as numbered PNG files."""
+    import pygame
+
+    os.makedirs(directory, exist_ok=True)
+    for step, frame in enumerate(frames):
+        surface = pygame.surfarray.make_surface(frame.transpose(1, 0, 2))
+        pygame.image.save(surface, os.path.join(directory, f"{step:05d}.png"))
+
+
+def _save_video(path: str, frames: list[np.ndarray], fps: int) -> None:
+    """Writes the frames of an episode as an MP4 video."""
+    try:
+        import cv2
+    except ImportError as error:
+        raise SystemExit(
+            "Writing videos needs OpenCV (opencv-python, installed with "
+            "stable-baselines3[extra]); use --frames instead."
+        ) from error
+
+    height, width = frames[0].shape[:2]
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    for frame in frames:
+        writer.write(cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
+    writer.release()
+
+
+def _replay(env: FullQuestEnv, trajectory: Trajectory, interval: int, render: bool) -> list:
+    """Replays an episode and returns its frames, if rendering."""
+    frames = []
+    for _ in replay(env, trajectory, interval):
+        if render:
+            frames.append(env.render())
+    return frames
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="A trajectory file.")
+    outcome = parser.add_mutually_exclusive_group()
+    outcome.add_argument("--successes", action="store_true")
+    outcome.add_argument("--failures", action="store_true")
+    parser.add_argument("--min-steps", type=int, default=None)
+    parser.add_argument("--max-steps", type=int, default=None)
+    parser.add_argument("--min-return", type=float, default=None)
+    parser.add_argument("--max-return", type=float, default=None)
+    parser.add_argument("--limit", type=int, default=None, help="Use the first N matches.")
+    parser.add_argument("--list", action="store_true", help="Print the matches and stop.")
+    parser.add_argument("--frames", default=None, help="Write PNG frames under this directory.")
+    parser.add_argument("--video", default=None, help="Write MP4 videos to this directory.")
+    parser.add_argument("--fps", type=int, default=10)
+    args = parser.parse_args()
+    logging.basicConfig(
+        format="%(asctime)s - %(levelname)s - %(message)s", level=logging.WARNING
+    )
+
+    trajectories = Trajectories(args.path)
+    indices = trajectories.select(
+        success=True if args.successes else False if args.failures else None,
+        min_length=args.min_steps,
+        max_length=args.max_steps,
+        min_return=args.min_return,
+        max_return=args.max_return,
+    )[: args.limit]
+    print(f"{len(indices)} of {len(trajectories)} episodes match")
+    if args.list:
+        seeds, lengths = trajectories.column("seeds"), trajectories.column("lengths")
+        success, returns = trajectories.column("success"), trajectories.column("returns")
+        print(f"{'index':>8}{'seed':>12}{'steps':>7}{'success':>9}{'return':>10}")
+        for i in indices.tolist():
+            print(
+                f"{i:>8}{seeds[i]:>12}{lengths[i]:>7}{str(success[i]):>9}{returns[i]:>10.2f}"
+            )
+        return
+
+    render = args.frames is not None or args.video is not None
+    map_size = trajectories.map_size
+    env = FullQuestEnv(
+        render_mode="rgb_array" if render else None,
+        map_pool=trajectories.map_pool,
+        map_size=(map_size, map_size) if map_size else None,
+    )
+    if args.video is not None:
+        os.makedirs(args.video, exist_ok=True)
+    mismatches, steps = 0, 0
+    start = time.perf_counter()
+    for i in indices.tolist():
+        trajectory = trajectories[i]
+        try:
+            frames = _replay(env, trajectory, trajectories.checksum_interval, render)
+        except RuntimeError as error:
+            mismatches += 1
+            print(f"Episode {i}: {error}")
+            continue
+        steps += len(trajectory.actions)
+        name = f"episode_{i}_seed_{trajectory.seed}"
+        if args.frames is not None:
+            _save_frames(os.path.join(args.frames, name), frames)
+        if args.video is not None:
+            _save_video(os.path.join(args.video, f"{name}.mp4"), frames, args.fps)
+    elapsed = time.perf_counter() - start
+    env.close()
+
+    print(
+        f"Replayed {len(indices)} episodes, {steps} steps, "
+        f"{steps / max(elapsed, 1e-9):.0f} steps/s, {mismatches} mismatches"
+    )
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,134 @@
+"""Evaluates a trained PPO agent on the password FullQuestEnv.
+
+By default thousands of episodes run headless on vectorized envs, with one
+batched deterministic predict per step, and the script reports the success
+rate, the steps taken against the BFS-optimal quest length, and the return
+distribution. Episode k is seeded with --seed + k, so the results do not
+depend on --n-envs. --record keeps the failed (or successful, or all)
+episodes in a compressed trajectory file (see rl/trajectories.py), which
+rl/replay_trajectories.py replays and renders offline. --watch
+plays a few episodes in real time in a window instead.
+
+Usage:
+    python rl/run_full_quest.py [--episodes 10000] [--n-envs 256] [--record failures]
+    python rl/run_full_quest.py --watch [--episodes 10]
+"""
+
+import argparse
+import logging
 import os
 import sys
 import time
 
 from gymnasium.wrappers import TimeLimit
 from stable_baselines3 import PPO
+from stable_baselines3.common.utils import check_for_correct_spaces
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from rl.environments.full_quest_env_pass import FullQuestEnv
+from rl.environments.observation_builder import OBS_ENCODINGS
+from rl.evaluation import RECORD_MODES, evaluate, make_eval_env, save_recording
+
+MODEL_PATH = "rl/ppo_full_quest.zip"
+
+
+def watch(model: PPO, args: argparse.Namespace) -> None:
+    """Plays episodes one step at a time in a window."""
+    map_size = (args.map_size, args.map_size) if args.map_size else None
+    # Create the environment with human render mode
+    env = FullQuestEnv(
+        render_mode="human", obs_encoding=args.obs_encoding, map_size=map_size
+    )
+    env = TimeLimit(env, max_episode_steps=args.max_steps or 50)
+
+    # Run the agent for a few episodes
+    for episode in range(args.episodes or 10):
+        obs, info = env.reset()
+        done = False
+        total_reward = 0
+        step = 0
+        while not done:
+            action, _states = model.predict(obs, deterministic=True)
+            obs, reward, done, truncated, info = env.step(action)
+            time.sleep(args.delay)
+            total_reward += reward
+            step += 1
+            if truncated:
+                print("Episode truncated")
+                break
+        print(f"Episode {episode + 1}: Total Reward = {total_reward}, Steps = {step}")
+
+    env.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument(
+        "--episodes", type=int, default=None, help="Defaults to 10000, or 10 with --watch."
+    )
+    parser.add_argument("--n-envs", type=int, default=256, help="Games played at once.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first episode.")
+    parser.add_argument(
+        "--max-steps",
+        type=int,
+        default=None,
+        help="Episode time limit; defaults to 256, or 50 with --watch. With "
+        "deterministic actions, episodes that run this long are almost always loops.",
+    )
+    parser.add_argument("--obs-encoding", choices=OBS_ENCODINGS, default="dict")
+    parser.add_argument("--map-size", type=int, default=None)
+    parser.add_argument("--map-pool", default=None, help="Map pool directory.")
+    parser.add_argument(
+        "--record", choices=RECORD_MODES, default=None, help="Episodes to save."
+    )
+    parser.add_argument("--record-path", default="rl/logs/eval_episodes.npz")
+    parser.add_argument("--watch", action="store_true", help="Render episodes in real time.")
+    parser.add_argument("--delay", type=float, default=0.5, help="Seconds per step with --watch.")
+    args = parser.parse_args()
+    logging.basicConfig(
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        # Per-step quest messages would flood a headless sweep.
+        level=logging.INFO if args.watch else logging.WARNING,
+    )
+
+    # Load the trained PPO agent
+    if not os.path.exists(args.model):
+        print(f"Error: Model not found at {args.model}")
+        print("Please train the agent first by running train_full_quest.py")
+        sys.exit(1)
+    model = PPO.load(args.model, device="cpu")
+
+    if args.watch:
+        watch(model, args)
+        return
+
+    n_episodes = args.episodes or 10000
+    env = make_eval_env(
+        min(args.n_envs, n_episodes),
+        max_episode_steps=args.max_steps or 256,
+        obs_encoding=args.obs_encoding,
+        map_size=args.map_size,
+        map_pool=args.map_pool,
+    )
+    check_for_correct_spaces(env, model.observation_space, model.action_space)
+    start = time.perf_counter()
+    result = evaluate(model, env, n_episodes, seed=args.seed, record=args.record)
+    elapsed = time.perf_counter() - start
+    env.close()
+
+    print(result.summary())
+    print(
+        f"Evaluated in {elapsed:.1f} s ({n_episodes / elapsed:.0f} episodes/s, "
+        f"{result.steps.sum() / elapsed:.0f} steps/s)"
+    )
+    if args.record:
+        os.makedirs(os.path.dirname(args.record_path) or ".", exist_ok=True)
+        save_recording(
+            args.record_path, result, map_size=args.map_size, map_pool=args.map_pool
+        )
+        print(f"Saved {len(result.recorded)} {args.record} episodes to {args.record_path}")
+
 
-# Create the environment with human render mode
-env = FullQuestEnv(render_mode="human")
-env = TimeLimit(env, max_episode_steps=50)
-
-# Load the trained PPO agent
-model_path = "rl/ppo_full_quest.zip"
-if not os.path.exists(model_path):
-    print(f"Error: Model not found at {model_path}")
-    print("Please train the agent first by running train_full_quest.py")
-    sys.exit(1)
-
-model = PPO.load(model_path)
-
-# Run the agent for a few episodes
-for episode in range(10):
-    obs, info = env.reset()
-    done = False
-    total_reward = 0
-    step = 0
-    while not done:
-        action, _states = model.predict(obs, deterministic=True)
-        obs, reward, done, truncated, info = env.step(action)
-        time.sleep(0.5)
-        total_reward += reward
-        step += 1
-        if truncated:
-            print("Episode truncated")
-            break
-    print(f"Episode {episode + 1}: Total Reward = {total_reward}, Steps = {step}")
-
-env.close()
+if __name__ == "__main__":
+    main()
@@ -1,58 +1,207 @@
+"""Trains a PPO agent on the password FullQuestEnv.
+
+Rollouts can be collected by several environment workers at once: in
+subprocesses (SubprocVecEnv, or SharedMemoryVecEnv, which passes observations
+through shared memory instead of pickling them), in this process
+(DummyVecEnv), or with the NumPy-batched BatchedFullQuestEnv. Worker i is seeded with seed + i and, with
+--pin-cpus, pinned to one CPU. Every worker writes its own Monitor file,
+"<log dir>/<i>.monitor.csv", so episode statistics stay per episode.
+Evaluation runs in its own process on snapshots of the policy, so rollout
+collection never pauses for it.
+
+With --obs-encoding egocentric the observation shape does not depend on the
+map size, so --curriculum 7 15 31 can train one policy on growing mazes.
+
+Usage:
+    python rl/train_full_quest.py [--n-envs 8] [--vec-env subproc] [--start-method forkserver] [--pin-cpus]
+"""
+
+import argparse
+import logging
 import os
 import sys
+from collections.abc import Callable
 
+import gymnasium as gym
 from gymnasium.wrappers import TimeLimit
 from stable_baselines3 import PPO
-from stable_baselines3.common.callbacks import EvalCallback
 from stable_baselines3.common.monitor import Monitor
+from stable_baselines3.common.vec_env import (
+    DummyVecEnv,
+    SubprocVecEnv,
+    VecEnv,
+    VecMonitor,
+)
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from configs import config
+from rl.callbacks.async_eval import AsyncEvalCallback
+from rl.callbacks.curriculum import MapSizeCurriculum
+from rl.environments.batched_full_quest_env import BatchedFullQuestEnv
 from rl.environments.full_quest_env_pass import FullQuestEnv
+from rl.environments.observation_builder import OBS_ENCODINGS
+from rl.environments.shared_memory_vec_env import SharedMemoryVecEnv
+from rl.policies.feature_extractors import PackedGridExtractor
 
-# Create log dir
-log_dir = "rl/logs/"
-os.makedirs(log_dir, exist_ok=True)
-best_model_save_path = os.path.join(log_dir, "best_model")
-
-# Create and wrap the environment
-env = FullQuestEnv()
-env = TimeLimit(env, max_episode_steps=1024)  # 에피소드 최대 스텝 수 제한
-env = Monitor(env, log_dir)
-
-# Create a separate evaluation environment
-eval_env = FullQuestEnv()
-eval_env = TimeLimit(eval_env, max_episode_steps=1024)
-eval_env = Monitor(eval_env, os.path.join(log_dir, "eval"))
-
-# Setup callback for model checkpointing and early stopping
-eval_callback = EvalCallback(
-    eval_env,
-    best_model_save_path=best_model_save_path,
-    log_path=log_dir,
-    eval_freq=10240,  # Evaluate every 10240 steps (1024 * 10)
-    n_eval_episodes=5,
-    deterministic=True,
-    render=False,
-)
+LOG_DIR = "rl/logs/"
+MODEL_PATH = "/Users/kangnam/projects/simulator/rl/ppo_full_quest.zip"
+MAX_EPISODE_STEPS = 1024  # 에피소드 최대 스텝 수 제한
+VEC_ENVS = ("dummy", "subproc", "shared", "batched")
 
-model_path = "/Users/kangnam/projects/simulator/rl/ppo_full_quest.zip"
-
-model = PPO(
-    "MultiInputPolicy",
-    env,
-    verbose=1,
-    tensorboard_log=log_dir,
-    learning_rate=0.0001,
-    n_steps=512,
-    batch_size=64,
-    n_epochs=20,
-    gamma=0.99,
-    gae_lambda=0.95,
-    ent_coef=0.1,
-)
 
-if os.path.exists(model_path):
+def available_cpus() -> list[int]:
+    """Returns the CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def make_env(
+    rank: int,
+    seed: int | None = None,
+    log_dir: str | None = None,
+    cpu: int | None = None,
+    map_pool: str | None = None,
+    reward_shaping: bool = False,
+    obs_views: bool = False,
+    obs_encoding: str = "dict",
+    map_size: int | None = None,
+) -> Callable[[], gym.Env]:
+    """Returns a function that builds the environment of one worker.
+
+    The function runs inside the worker, so CPU pinning applies to the worker
+    process itself.
+
+    Args:
+        rank (int): The worker index; its Monitor file is named after it.
+        seed (int | None): The base seed; the worker's action space is seeded
+            with seed + rank (VecEnv.seed does the same for the env).
+        log_dir (str | None): Where to write the Monitor file, if anywhere.
+        cpu (int | None): The CPU to pin the worker to, if any (Linux only).
+        map_pool (str | None): A map pool directory to sample layouts from.
+        reward_shaping (bool): Enables potential-based reward shaping.
+        obs_views (bool): Makes the env return read-only views of its
+            observation buffers; only for VecEnvs that copy them right away.
+        obs_encoding (str): The observation encoding, one of OBS_ENCODINGS.
+        map_size (int | None): The side of the square maps to generate;
+            defaults to the configured grid size.
+
+    Returns:
+        Callable[[], gym.Env]: The environment factory.
+    """
+
+    def _init() -> gym.Env:
+        if cpu is not None and hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, {cpu})
+        env = FullQuestEnv(
+            map_pool=map_pool,
+            reward_shaping=reward_shaping,
+            obs_views=obs_views,
+            obs_encoding=obs_encoding,
+            map_size=(map_size, map_size) if map_size else None,
+        )
+        env = TimeLimit(env, max_episode_steps=MAX_EPISODE_STEPS)
+        # Monitor sits inside the worker, below the VecEnv's auto-reset, so it
+        # sees every episode end exactly once.
+        env = Monitor(env, os.path.join(log_dir, str(rank)) if log_dir else None)
+        if seed is not None:
+            env.action_space.seed(seed + rank)
+        return env
+
+    return _init
+
+
+def make_training_env(
+    n_envs: int,
+    vec_env: str = "subproc",
+    start_method: str | None = None,
+    seed: int | None = None,
+    log_dir: str | None = None,
+    pin_cpus: bool = False,
+    map_pool: str | None = None,
+    reward_shaping: bool = False,
+    obs_encoding: str = "dict",
+    map_size: int | None = None,
+) -> VecEnv:
+    """Builds the vectorized training environment.
+
+    Args:
+        n_envs (int): The number of environment workers.
+        vec_env (str): "subproc", "shared", "dummy" or "batched".
+        start_method (str | None): The multiprocessing start method of the
+            subprocess envs ("fork", "forkserver" or "spawn"). Defaults to
+            forkserver where available.
+        seed (int | None): The base seed; worker i uses seed + i.
+        log_dir (str | None): Where to write the Monitor files, if anywhere.
+        pin_cpus (bool): Pins worker i to the i-th available CPU, wrapping
+            around when there are more workers than CPUs.
+        map_pool (str | None): A map pool directory to sample layouts from.
+        reward_shaping (bool): Enables potential-based reward shaping.
+        obs_encoding (str): The observation encoding, one of OBS_ENCODINGS.
+            The batched env only produces the "dict" encoding.
+        map_size (int | None): The side of the square maps to generate;
+            defaults to the configured grid size. Not supported by the
+            batched env.
+
+    Returns:
+        VecEnv: The environment, seeded if a seed was given.
+
+    Raises:
+        ValueError: If the batched env is asked for another encoding or map
+            size.
+    """
+    if vec_env == "batched":
+        if obs_encoding != "dict":
+            raise ValueError("The batched env only supports the dict encoding.")
+        if map_size is not None:
+            raise ValueError("The batched env only supports the configured map size.")
+        # One process steps every game, so there is nothing to pin.
+        env = BatchedFullQuestEnv(
+            n_envs,
+            map_pool=map_pool,
+            reward_shaping=reward_shaping,
+            max_episode_steps=MAX_EPISODE_STEPS,
+        )
+        env = VecMonitor(env, os.path.join(log_dir, "batched") if log_dir else None)
+    else:
+        cpus = available_cpus() if pin_cpus else None
+        env_fns = [
+            make_env(
+                rank,
+                seed=seed,
+                log_dir=log_dir,
+                cpu=cpus[rank % len(cpus)] if cpus else None,
+                map_pool=map_pool,
+                reward_shaping=reward_shaping,
+                # SharedMemoryVecEnv copies every observation (including the
+                # terminal one) into shared memory before the next step.
+                obs_views=vec_env == "shared",
+                obs_encoding=obs_encoding,
+                map_size=map_size,
+            )
+            for rank in range(n_envs)
+        ]
+        if vec_env == "subproc":
+            env = SubprocVecEnv(env_fns, start_method=start_method)
+        elif vec_env == "shared":
+            env = SharedMemoryVecEnv(env_fns, start_method=start_method)
+        else:
+            env = DummyVecEnv(env_fns)
+    if seed is not None:
+        env.seed(seed)
+    return env
+
+
+def load_compatible_weights(model: PPO, model_path: str) -> None:
+    """Copies the policy weights of a saved model whose shapes still match."""
     print(f"Loading compatible weights from {model_path} and continuing training.")
+    # 관측 공간이 같으면(예: 맵 크기와 무관한 egocentric 인코딩) 전체 파라미터를 그대로 불러옵니다.
+    try:
+        model.set_parameters(model_path, device=model.device)
+        print("Successfully loaded all weights.")
+        return
+    except Exception:
+        pass
     # 그리드 크기 변경으로 인해 observation space가 달라져 전체 모델 로딩이 불가한 경우,
     # zip 파일을 열어 policy 가중치만 직접 로드하고, 현재 모델과 호환되는 부분만 적용합니다.
     # 이렇게 하면 신경망 구조가 다른 부분(주로 CNN 및 첫 번째 MLP 레이어)을 제외하고
@@ -84,16 +233,162 @@ if os.path.exists(model_path):
         print("Starting training from scratch.")
 
 
-# Train the agent
-# This is a very complex task and may require many more timesteps.
-model.learn(
-    total_timesteps=20000000,
-    progress_bar=True,
-    callback=eval_callback,
-    reset_num_timesteps=False,  # 이어서 학습할 때 타임스텝을 초기화하지 않음
-)
+def build_model(
+    env: VecEnv,
+    seed: int | None = None,
+    log_dir: str | None = LOG_DIR,
+    verbose: int = 1,
+    obs_encoding: str = "dict",
+) -> PPO:
+    """Creates the PPO model with the training hyperparameters.
+
+    n_steps is per worker, so a rollout holds 512 * n_envs transitions. The
+    policy matches the observation encoding: MultiInputPolicy for "dict",
+    MlpPolicy for "flat", and MlpPolicy with PackedGridExtractor for "packed".
+    The "egocentric" Dict also uses MultiInputPolicy; its shapes do not depend
+    on the map size, so the same model trains on every curriculum stage.
+    """
+    policy, policy_kwargs = "MultiInputPolicy", None
+    if obs_encoding == "flat":
+        policy = "MlpPolicy"
+    elif obs_encoding == "packed":
+        policy = "MlpPolicy"
+        policy_kwargs = {"features_extractor_class": PackedGridExtractor}
+    return PPO(
+        policy,
+        env,
+        policy_kwargs=policy_kwargs,
+        verbose=verbose,
+        tensorboard_log=log_dir,
+        learning_rate=0.0001,
+        n_steps=512,
+        batch_size=64,
+        n_epochs=20,
+        gamma=0.99,
+        gae_lambda=0.95,
+        ent_coef=0.1,
+        seed=seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-envs", type=int, default=1, help="Environment workers.")
+    parser.add_argument(
+        "--vec-env",
+        choices=VEC_ENVS,
+        default=None,
+        help="Defaults to subproc with several workers, dummy with one.",
+    )
+    parser.add_argument(
+        "--start-method",
+        choices=("fork", "forkserver", "spawn"),
+        default=None,
+        help="Subprocess start method; defaults to forkserver where available.",
+    )
+    parser.add_argument("--pin-cpus", action="store_true", help="Pin each worker to a CPU.")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--timesteps", type=int, default=20000000)
+    parser.add_argument("--map-pool", default=None, help="Map pool directory.")
+    parser.add_argument("--reward-shaping", action="store_true")
+    parser.add_argument(
+        "--obs-encoding",
+        choices=OBS_ENCODINGS,
+        default="dict",
+        help="flat and packed are single uint8 vectors with smaller rollout buffers.",
+    )
+    parser.add_argument(
+        "--map-size", type=int, default=None, help="Side of the square training maps."
+    )
+    parser.add_argument(
+        "--curriculum",
+        type=int,
+        nargs="+",
+        default=None,
+        metavar="SIZE",
+        help="Map sizes to train on in turn, moving on at 80%% success; "
+        "needs --obs-encoding egocentric.",
+    )
+    parser.add_argument(
+        "--eval-episodes",
+        type=int,
+        default=1000,
+        help="Episodes per evaluation, played in a separate process.",
+    )
+    parser.add_argument("--log-dir", default=LOG_DIR)
+    parser.add_argument("--weights", default=MODEL_PATH, help="Model to warm-start from.")
+    parser.add_argument("--save-path", default="rl/ppo_full_quest")
+    args = parser.parse_args()
+    if args.obs_encoding != "egocentric" and (args.curriculum or args.map_size):
+        parser.error("--map-size and --curriculum need --obs-encoding egocentric.")
+    if (args.map_pool or config.MAP_POOL_PATH) and (args.curriculum or args.map_size):
+        parser.error("--map-size and --curriculum cannot be combined with a map pool.")
+    logging.basicConfig(
+        format="%(asctime)s - %(levelname)s - %(message)s", level=logging.INFO
+    )
+    vec_env = args.vec_env or ("subproc" if args.n_envs > 1 else "dummy")
+
+    # Create log dir
+    os.makedirs(args.log_dir, exist_ok=True)
+    best_model_save_path = os.path.join(args.log_dir, "best_model")
+
+    # Create and wrap the environment
+    env = make_training_env(
+        args.n_envs,
+        vec_env=vec_env,
+        start_method=args.start_method,
+        seed=args.seed,
+        log_dir=args.log_dir,
+        pin_cpus=args.pin_cpus,
+        map_pool=args.map_pool,
+        reward_shaping=args.reward_shaping,
+        obs_encoding=args.obs_encoding,
+        map_size=args.curriculum[0] if args.curriculum else args.map_size,
+    )
+
+    # Setup callback for model checkpointing. Snapshots are evaluated in a
+    # separate process, on the largest map size the agent will train on.
+    eval_callback = AsyncEvalCallback(
+        # Evaluate every 10240 steps (1024 * 10); the callback counts calls,
+        # and each call steps every worker.
+        eval_freq=max(10240 // args.n_envs, 1),
+        n_eval_episodes=args.eval_episodes,
+        env_kwargs={
+            "max_episode_steps": MAX_EPISODE_STEPS,
+            "obs_encoding": args.obs_encoding,
+            "map_size": args.curriculum[-1] if args.curriculum else args.map_size,
+            "map_pool": args.map_pool,
+        },
+        best_model_save_path=best_model_save_path,
+        log_path=args.log_dir,
+        start_method=args.start_method,
+    )
+
+    callbacks = [eval_callback]
+    if args.curriculum:
+        callbacks.append(MapSizeCurriculum(args.curriculum, verbose=1))
+
+    model = build_model(
+        env, seed=args.seed, log_dir=args.log_dir, obs_encoding=args.obs_encoding
+    )
+    if os.path.exists(args.weights):
+        load_compatible_weights(model, args.weights)
+
+    # Train the agent
+    # This is a very complex task and may require many more timesteps.
+    model.learn(
+        total_timesteps=args.timesteps,
+        progress_bar=True,
+        callback=callbacks,
+        reset_num_timesteps=False,  # 이어서 학습할 때 타임스텝을 초기화하지 않음
+    )
+
+    # Save the agent
+    model.save(args.save_path)
+    env.close()
+
+    print(f"Training finished and model saved as {args.save_path}.zip")
 
-# Save the agent
-model.save("rl/ppo_full_quest")
 
-print("Training finished and model saved as rl/ppo_full_quest.zip")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+import zlib
+from collections.abc import Iterator, Sequence
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from configs import config
+
+# The built-in columns with one value per episode. "actions" and "rewards"
+# hold one value per step and "checksums" a few per episode, all episodes
+# concatenated in order.
+_EPISODE_COLUMNS: tuple[str, ...] = ("seeds", "lengths", "success", "returns")
+
+
+def state_checksum(
+    player_pos: Sequence[int],
+    knows_location: bool,
+    visited_treasure_first: bool,
+    knows_password: bool,
+    treasure_opened: bool,
+    password_input_mode: bool,
+) -> int:
+    """Returns the CRC32 of the quest state: the player's cell and quest flags.
+
+    Args:
+        player_pos (Sequence[int]): The player's (x, y) cell.
+        knows_location (bool): Whether the location NPC was visited.
+        visited_treasure_first (bool): Whether the treasure was found.
+        knows_password (bool): Whether the password NPC was visited.
+        treasure_opened (bool): Whether the treasure was opened.
+        password_input_mode (bool): Whether a digit is expected next.
+
+    Returns:
+        int: The checksum.
+    """
+    state = np.array(
+        [
+            player_pos[0],
+            player_pos[1],
+            knows_location,
+            visited_treasure_first,
+            knows_password,
+            treasure_opened,
+            password_input_mode,
+        ],
+        dtype=np.int64,
+    )
+    return zlib.crc32(state.tobytes())
+
+
+def env_checksum(env) -> int:
+    """Returns the state_checksum of a password FullQuestEnv.
+
+    Args:
+        env (FullQuestEnv): The env, possibly wrapped.
+
+    Returns:
+        int: The checksum.
+    """
+    env = env.unwrapped
+    game = env.game
+    return state_checksum(
+        game.player_pos,
+        game.knows_location,
+        env.visited_treasure_first,
+        game.knows_password,
+        game.treasure_opened,
+        env.password_input_mode,
+    )
+
+
+class Trajectory(NamedTuple):
+    """One recorded episode.
+
+    Attributes:
+        seed (int): The seed of ``FullQuestEnv.reset`` that starts the episode.
+        actions (np.ndarray): The (T,) uint8 actions.
+        rewards (np.ndarray): The (T,) float32 rewards.
+        checksums (np.ndarray): The uint32 state checksums taken after steps
+            interval, 2 * interval, ... up to the step before the last; a
+            vectorized env has already reset when the last step returns.
+        success (bool): Whether the episode finished the quest.
+    """
+
+    seed: int
+    actions: np.ndarray
+    rewards: np.ndarray
+    checksums: np.ndarray
+    success: bool
+
+
+def save_trajectories(
+    path: str,
+    seeds: Sequence[int] | np.ndarray,
+    success: Sequence[bool] | np.ndarray,
+    actions: Sequence[np.ndarray],
+    rewards: Sequence[np.ndarray],
+    checksums: Sequence[np.ndarray] | None = None,
+    checksum_interval: int = config.TRAJECTORY_CHECKSUM_INTERVAL,
+    map_size: int | None = None,
+    map_pool: str | None = None,
+    **columns: np.ndarray,
+) -> None:
+    """Saves episodes as one compressed columnar .npz file.
+
+    Only what replaying needs is stored: the seed and actions of every
+    episode, plus its rewards and sparse checksums to verify the replay.
+    Per-episode columns ("seeds", "lengths", "success", "returns" and any
+    extra `columns`) can be filtered without touching the per-step ones.
+
+    Args:
+        path (str): The output file.
+        seeds (Sequence[int] | np.ndarray): The episode seeds.
+        success (Sequence[bool] | np.ndarray): Whether each episode finished
+            the quest.
+        actions (Sequence[np.ndarray]): The actions of each episode.
+        rewards (Sequence[np.ndarray]): The rewards of each episode.
+        checksums (Sequence[np.ndarray] | None): The state checksums of each
+            episode (see Trajectory), if taken.
+        checksum_interval (int): The steps between checksums.
+        map_size (int | None): The side of the square maps the episodes were
+            played on, if not the configured size.
+        map_pool (str | None): The map pool the episodes were played on, if
+            any.
+        **columns (np.ndarray): Extra per-episode columns, such as
+            "optimal_steps".
+    """
+    lengths = np.array([len(a) for a in actions], dtype=np.int32)
+    rewards = [np.asarray(r, dtype=np.float32) for r in rewards]
+    if checksums is None:
+        checksum_interval, checksums = 0, []
+    np.savez_compressed(
+        path,
+        seeds=np.asarray(seeds, dtype=np.int64),
+        lengths=lengths,
+        success=np.asarray(success, dtype=bool),
+        returns=np.array([r.sum() for r in rewards], dtype=np.float32),
+        actions=np.concatenate([np.zeros(0, dtype=np.uint8), *actions]).astype(np.uint8),
+        rewards=np.concatenate([np.zeros(0, dtype=np.float32), *rewards]),
+        checksums=np.concatenate([np.zeros(0, dtype=np.uint32), *checksums]).astype(
+            np.uint32
+        ),
+        checksum_interval=checksum_interval,
+        map_size=map_size or 0,
+        map_pool=map_pool or "",
+        **{f"column_{name}": np.asarray(values) for name, values in columns.items()},
+    )
+
+
+class Trajectories:
+    """A file of episodes saved by save_trajectories.
+
+    Per-episode columns are loaded on first use; the per-step columns only
+    when an episode is first read. Use `select` to find episodes.
+
+    Attributes:
+        checksum_interval (int): The steps between checksums, 0 if none.
+        map_size (int | None): The side of the maps, if not the configured one.
+        map_pool (str | None): The map pool the episodes were played on.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Opens a trajectory file.
+
+        Args:
+            path (str): The .npz file.
+        """
+        self._file = np.load(path)
+        self._arrays: dict[str, np.ndarray] = {}
+        self._offsets: np.ndarray | None = None
+        self._checksum_offsets: np.ndarray | None = None
+        self.checksum_interval: int = int(self._file["checksum_interval"])
+        self.map_size: int | None = int(self._file["map_size"]) or None
+        self.map_pool: str | None = str(self._file["map_pool"]) or None
+
+    def __len__(self) -> int:
+        return len(self.column("seeds"))
+
+    def _array(self, key: str) -> np.ndarray:
+        """Returns an array of the file, decompressing it on first use."""
+        if key not in self._arrays:
+            self._arrays[key] = self._file[key]
+        return self._arrays[key]
+
+    def column(self, name: str) -> np.ndarray:
+        """Returns a per-episode column.
+
+        Args:
+            name (str): "seeds", "lengths", "success", "returns" or the name
+                of an extra column.
+
+        Returns:
+            np.ndarray: One value per episode.
+
+        Raises:
+            KeyError: If the file has no such column.
+        """
+        key = name if name in _EPISODE_COLUMNS else f"column_{name}"
+        if key not in self._file:
+            raise KeyError(f"No column {name!r} in the trajectory file.")
+        return self._array(key)
+
+    def select(
+        self,
+        success: bool | None = None,
+        min_length: int | None = None,
+        max_length: int | None = None,
+        min_return: float | None = None,
+        max_return: float | None = None,
+        where: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """Returns the indices of the episodes matching every given filter.
+
+        Args:
+            success (bool | None): Keeps only successes (True) or failures
+                (False).
+            min_length (int | None): The fewest steps.
+            max_length (int | None): The most steps.
+            min_return (float | None): The lowest return.
+            max_return (float | None): The highest return.
+            where (np.ndarray | None): An extra boolean mask over episodes,
+                e.g. built from `column`.
+
+        Returns:
+            np.ndarray: The matching episode indices, in file order.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if success is not None:
+            mask &= self.column("success") == success
+        lengths, returns = self.column("lengths"), self.column("returns")
+        if min_length is not None:
+            mask &= lengths >= min_length
+        if max_length is not None:
+            mask &= lengths <= max_length
+        if min_return is not None:
+            mask &= returns >= min_return
+        if max_return is not None:
+            mask &= returns <= max_return
+        if where is not None:
+            mask &= where
+        return np.flatnonzero(mask)
+
+    def __getitem__(self, index: int) -> Trajectory:
+        if self._offsets is None:
+            lengths = self.column("lengths").astype(np.int64)
+            self._offsets = np.concatenate(([0], np.cumsum(lengths)))
+            counts = np.zeros_like(lengths)
+            if self.checksum_interval > 0:
+                counts = np.maximum(lengths - 1, 0) // self.checksum_interval
+            self._checksum_offsets = np.concatenate(([0], np.cumsum(counts)))
+        index = range(len(self))[index]  # Supports negative indices, raises IndexError
+        start, stop = self._offsets[index : index + 2]
+        checksums_start, checksums_stop = self._checksum_offsets[index : index + 2]
+        return Trajectory(
+            seed=int(self.column("seeds")[index]),
+            actions=self._array("actions")[start:stop],
+            rewards=self._array("rewards")[start:stop],
+            checksums=self._array("checksums")[checksums_start:checksums_stop],
+            success=bool(self.column("success")[index]),
+        )
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def replay(env: Any, trajectory: Trajectory, checksum_interval: int) -> Iterator[int]:
+    """Replays an episode on a password FullQuestEnv, step by step.
+
+    The env is reset with the episode's seed and stepped with its actions.
+    Every reward and checksum is compared with the recording.
+
+    Args:
+        env (FullQuestEnv): The env to replay on; render it between steps to
+            get frames.
+        trajectory (Trajectory): The episode.
+        checksum_interval (int): The steps between the episode's checksums.
+
+    Yields:
+        int: 0 after the reset, then the number of steps taken.
+
+    Raises:
+        RuntimeError: If the replay diverges from the recording.
+    """
+    env.reset(seed=trajectory.seed)
+    yield 0
+    for step, action in enumerate(trajectory.actions.tolist(), start=1):
+        _, reward, _, _, _ = env.step(action)
+        if np.float32(reward) != trajectory.rewards[step - 1]:
+            raise RuntimeError(
+                f"Episode seed={trajectory.seed} diverged at step {step}: reward "
+                f"{reward} was recorded as {trajectory.rewards[step - 1]}."
+            )
+        if checksum_interval > 0 and step % checksum_interval == 0:
+            n = step // checksum_interval - 1
+            if n < len(trajectory.checksums) and env_checksum(env) != trajectory.checksums[n]:
+                raise RuntimeError(
+                    f"Episode seed={trajectory.seed} diverged at step {step}: the "
+                    "state checksum does not match."
+                )
+        yield step